@@ -129,10 +129,68 @@ const StudentList = ({ students, onDelete, assessmentType = 'standard' }) => {
         });
     }, [students, selectedGrade, minScore, viewMode, searchTerm, selectedDate]);
 
-    const handleView = (student) => {
+    // The admin list carries report stats only; history and report bodies are loaded on demand
+    const fetchReportBody = async (reportId) => {
+        if (!reportId) return null;
+        try {
+            const response = await fetch(`/api/reports/${reportId}`);
+            if (!response.ok) return null;
+            const { data } = await response.json();
+            return typeof data.report_json === 'string' ? JSON.parse(data.report_json) : data.report_json;
+        } catch (error) {
+            console.error("Error loading report:", error);
+            return null;
+        }
+    };
+
+    const withReportBody = (entry, body) => {
+        if (!body) return entry;
+        return {
+            ...entry,
+            summary: body.summary || {},
+            perQuestionReport: body.perQuestionReport || [],
+            topicFeedback: body.topicFeedback || {},
+            learningPlan: body.learningPlan || [],
+            rapidMath: entry.type === 'rapid' ? {
+                marks: entry.marks,
+                date: entry.date,
+                timeTaken: entry.timeTaken || 0,
+                totalQuestions: entry.totalQuestions,
+                report: body
+            } : null
+        };
+    };
+
+    const handleView = async (student) => {
         setSelectedStudent(student);
         setDisplayedReport(student);
         setOpen(true);
+
+        const [history, standardBody, rapidBody] = await Promise.all([
+            fetch(`/api/dashboard/admin/students/${student.childId}/history`)
+                .then(response => response.ok ? response.json() : [])
+                .catch(() => []),
+            fetchReportBody(student.reportId),
+            fetchReportBody(student.rapidMath?.reportId)
+        ]);
+
+        const detailed = {
+            ...student,
+            history,
+            summary: standardBody?.summary,
+            perQuestionReport: standardBody?.perQuestionReport,
+            topicFeedback: standardBody?.topicFeedback,
+            learningPlan: standardBody?.learningPlan,
+            rapidMath: student.rapidMath ? { ...student.rapidMath, report: rapidBody } : null
+        };
+        setSelectedStudent(current => current === student ? detailed : current);
+        setDisplayedReport(current => current === student ? detailed : current);
+    };
+
+    const handleSelectHistory = async (hist) => {
+        setDisplayedReport(hist);
+        const body = await fetchReportBody(hist.reportId);
+        setDisplayedReport(current => current === hist ? withReportBody(hist, body) : current);
     };
 
     const handleClose = () => {
@@ -877,7 +935,7 @@ const StudentList = ({ students, onDelete, assessmentType = 'standard' }) => {
                                                                     key={idx}
                                                                     hover
                                                                     selected={displayedReport?.date === hist.date}
-                                                                    onClick={() => setDisplayedReport(hist)}
+                                                                    onClick={() => handleSelectHistory(hist)}
                                                                     sx={{
                                                                         cursor: 'pointer',
                                                                         '&.Mui-selected': { bgcolor: '#e0f2fe !important' } // Highlight selected
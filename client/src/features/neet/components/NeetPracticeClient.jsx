@@ -14,6 +14,91 @@ const NeetPracticeClient = () => {
     const { user, userData, activeChildId } = useAuth();
     const [status, setStatus] = useState("Initializing...");
     const location = useLocation();
+    // Pages fetched so far; nextCursor is set while the API has more pages to offer
+    const [questions, setQuestions] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+
+    const startQuiz = (filtered, duration) => {
+        setStatus("Generating paper...");
+
+        // Sort and Shuffle Logic: Group by type, shuffle inside group, then concat groups in order
+        const typeOrder = ['MCQ', 'Statement', 'Assertion', 'Previous', 'General'];
+        const normalizeType = (t) => {
+            const l = (t || 'general').toLowerCase();
+            if (l.includes('mcq')) return 'MCQ';
+            if (l.includes('statement')) return 'Statement';
+            if (l.includes('assertion')) return 'Assertion';
+            if (l.includes('previous') || l.includes('pyq')) return 'Previous';
+            return 'General';
+        };
+
+        // Helper to shuffle array
+        const shuffleArray = (array) => [...array].sort(() => Math.random() - 0.5);
+
+        // Group by normalized type
+        const grouped = filtered.reduce((acc, q) => {
+            const type = normalizeType(q.questionType);
+            if (!acc[type]) acc[type] = [];
+            acc[type].push(q);
+            return acc;
+        }, {});
+
+        // Combine in specific order
+        let finalQuestions = [];
+        typeOrder.forEach(type => {
+            if (grouped[type]) {
+                // Shuffle questions strictly within their type group
+                const shuffledGroup = shuffleArray(grouped[type]);
+                finalQuestions = [...finalQuestions, ...shuffledGroup];
+            }
+        });
+
+        // Handle any remaining types not in order (e.g. typos, unknowns) - append to end
+        Object.keys(grouped).forEach(key => {
+            if (!typeOrder.includes(key)) {
+                finalQuestions = [...finalQuestions, ...shuffleArray(grouped[key])];
+            }
+        });
+
+        const generatedPaper = finalQuestions.map(q => ({
+            id: q.id,
+            type: q.questionType || "mcq", // Keep original string for rendering logic
+            question: q.question || (q.question_content ? q.question_content.question : ""), // Handle potential structure diffs
+            options: (q.options || (q.question_content ? [q.question_content.option_a, q.question_content.option_b, q.question_content.option_c, q.question_content.option_d] : [])).map(opt => ({ label: opt, value: opt })),
+            answer: q.correctAnswer || q.correct_answer || (q.question_content ? q.question_content.correct_answer : ""),
+            solution: q.explanation || (q.question_content ? q.question_content.explanation : ""),
+            topic: q.topic || subject,
+            questionId: q.id,
+            hint: ""
+        }));
+
+        const userKey = getUserDatabaseKey(user);
+        const childId = activeChildId || "default";
+        const activeChild = userData?.children?.[childId];
+        const studentName = activeChild?.name || userData?.name || user?.displayName || "Student";
+
+        const userDetails = {
+            name: studentName,
+            grade: `NEET ${subject}`,
+            userKey: userKey,
+            childId: childId,
+            activeChildId: childId,
+            testType: 'NEET',
+            activeChild: activeChild,
+            attemptCount: 1
+        };
+
+        const sessionData = {
+            userDetails,
+            questionPaper: generatedPaper,
+            activeQuestionIndex: 0,
+            remainingTime: duration
+        };
+
+        localStorage.setItem("quizSession", JSON.stringify(sessionData));
+        navigate('/quiz');
+    };
 
     useEffect(() => {
         const startSession = async () => {
@@ -27,107 +112,33 @@ const NeetPracticeClient = () => {
             setStatus("Preparing session...");
 
             try {
-                let filtered = [];
-                let duration = 1800; // Default 30 mins
-
                 // Check for custom assessment payload
                 if (location.state && location.state.mode === 'assessment' && location.state.questions) {
-                    filtered = location.state.questions;
-                    if (location.state.duration) {
-                        duration = location.state.duration * 60; // Convert mins to seconds
-                    }
                     setStatus("Loading assessment...");
-                } else {
-                    // Standard fetch
-                    setStatus("Fetching questions...");
-                    filtered = await getNeetQuestions(subject, topic, subTopic);
+                    const duration = location.state.duration ? location.state.duration * 60 : 1800; // mins to seconds
+                    if (location.state.questions.length === 0) {
+                        alert(`No questions found.`);
+                        navigate(`/neet/topics/${subject}`);
+                        return;
+                    }
+                    startQuiz(location.state.questions, duration);
+                    return;
                 }
 
-                if (!filtered || filtered.length === 0) {
+                // Standard fetch: the first page only; further pages are loaded on request
+                setStatus("Fetching questions...");
+                const page = await getNeetQuestions(subject, topic, subTopic);
+                if (page.questions.length === 0) {
                     alert(`No questions found.`);
                     navigate(`/neet/topics/${subject}`);
                     return;
                 }
-
-                setStatus("Generating paper...");
-
-                // Sort and Shuffle Logic: Group by type, shuffle inside group, then concat groups in order
-                const typeOrder = ['MCQ', 'Statement', 'Assertion', 'Previous', 'General'];
-                const normalizeType = (t) => {
-                    const l = (t || 'general').toLowerCase();
-                    if (l.includes('mcq')) return 'MCQ';
-                    if (l.includes('statement')) return 'Statement';
-                    if (l.includes('assertion')) return 'Assertion';
-                    if (l.includes('previous') || l.includes('pyq')) return 'Previous';
-                    return 'General';
-                };
-
-                // Helper to shuffle array
-                const shuffleArray = (array) => [...array].sort(() => Math.random() - 0.5);
-
-                // Group by normalized type
-                const grouped = filtered.reduce((acc, q) => {
-                    const type = normalizeType(q.questionType);
-                    if (!acc[type]) acc[type] = [];
-                    acc[type].push(q);
-                    return acc;
-                }, {});
-
-                // Combine in specific order
-                let finalQuestions = [];
-                typeOrder.forEach(type => {
-                    if (grouped[type]) {
-                        // Shuffle questions strictly within their type group
-                        const shuffledGroup = shuffleArray(grouped[type]);
-                        finalQuestions = [...finalQuestions, ...shuffledGroup];
-                    }
-                });
-
-                // Handle any remaining types not in order (e.g. typos, unknowns) - append to end
-                Object.keys(grouped).forEach(key => {
-                    if (!typeOrder.includes(key)) {
-                        finalQuestions = [...finalQuestions, ...shuffleArray(grouped[key])];
-                    }
-                });
-
-                const generatedPaper = finalQuestions.map(q => ({
-                    id: q.id,
-                    type: q.questionType || "mcq", // Keep original string for rendering logic
-                    question: q.question || (q.question_content ? q.question_content.question : ""), // Handle potential structure diffs
-                    options: (q.options || (q.question_content ? [q.question_content.option_a, q.question_content.option_b, q.question_content.option_c, q.question_content.option_d] : [])).map(opt => ({ label: opt, value: opt })),
-                    answer: q.correctAnswer || q.correct_answer || (q.question_content ? q.question_content.correct_answer : ""),
-                    solution: q.explanation || (q.question_content ? q.question_content.explanation : ""),
-                    topic: q.topic || subject,
-                    questionId: q.id,
-                    hint: ""
-                }));
-
-                const userKey = getUserDatabaseKey(user);
-                const childId = activeChildId || "default";
-                const activeChild = userData?.children?.[childId];
-                const studentName = activeChild?.name || userData?.name || user?.displayName || "Student";
-
-                const userDetails = {
-                    name: studentName,
-                    grade: `NEET ${subject}`,
-                    userKey: userKey,
-                    childId: childId,
-                    activeChildId: childId,
-                    testType: 'NEET',
-                    activeChild: activeChild,
-                    attemptCount: 1
-                };
-
-                const sessionData = {
-                    userDetails,
-                    questionPaper: generatedPaper,
-                    activeQuestionIndex: 0,
-                    remainingTime: duration
-                };
-
-                localStorage.setItem("quizSession", JSON.stringify(sessionData));
-                navigate('/quiz');
-
+                if (!page.nextCursor) {
+                    startQuiz(page.questions, 1800); // Default 30 mins
+                    return;
+                }
+                setQuestions(page.questions);
+                setNextCursor(page.nextCursor);
             } catch (err) {
                 console.error(err);
                 setStatus("Error starting session");
@@ -138,6 +149,47 @@ const NeetPracticeClient = () => {
         startSession();
     }, [subject, topic, subTopic, user, location]);
 
+    const loadMore = async () => {
+        setLoadingMore(true);
+        try {
+            const page = await getNeetQuestions(subject, topic, subTopic, nextCursor);
+            setQuestions(prev => [...prev, ...page.questions]);
+            setNextCursor(page.nextCursor);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
+    if (questions.length > 0) {
+        return (
+            <div className="flex items-center justify-center min-h-screen bg-slate-50">
+                <div className="text-center">
+                    <h2 className="text-xl font-semibold text-slate-700 mb-4">
+                        {questions.length} questions loaded{nextCursor ? ", more available" : ""}
+                    </h2>
+                    <div className="flex gap-3 justify-center">
+                        {nextCursor && (
+                            <button
+                                onClick={loadMore}
+                                disabled={loadingMore}
+                                className="px-4 py-2 rounded-lg border border-indigo-600 text-indigo-600 disabled:opacity-50"
+                            >
+                                {loadingMore ? "Loading..." : "Load more"}
+                            </button>
+                        )}
+                        <button
+                            onClick={() => startQuiz(questions, 1800)}
+                            disabled={loadingMore}
+                            className="px-4 py-2 rounded-lg bg-indigo-600 text-white disabled:opacity-50"
+                        >
+                            Start practice
+                        </button>
+                    </div>
+                </div>
+            </div>
+        );
+    }
+
     return (
         <div className="flex items-center justify-center min-h-screen bg-slate-50">
             <div className="text-center">
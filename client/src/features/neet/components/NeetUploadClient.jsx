@@ -414,6 +414,9 @@ const ManageContent = ({ subject, initialTopics, onRefresh, onUploadMore }) => {
     const [selectedSubTopic, setSelectedSubTopic] = useState(null);
     const [questions, setQuestions] = useState([]);
     const [loading, setLoading] = useState(false);
+    // Set while the API has more pages of the selected topic; loaded with "Load more"
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     // Rename State
     const [editingItem, setEditingItem] = useState(null); // { type: 'topic'|'sub', oldName: '', subOf: '' }
@@ -436,7 +439,8 @@ const ManageContent = ({ subject, initialTopics, onRefresh, onUploadMore }) => {
         setLoading(true);
         try {
             const data = await import('@/services/neetQuestionService').then(m => m.getNeetQuestions(subject, t, st));
-            setQuestions(data);
+            setQuestions(data.questions);
+            setNextCursor(data.nextCursor);
             setSelectedTopic(t);
             setSelectedSubTopic(st);
             setView('questions');
@@ -447,6 +451,19 @@ const ManageContent = ({ subject, initialTopics, onRefresh, onUploadMore }) => {
         }
     };
 
+    const loadMoreQuestions = async () => {
+        setLoadingMore(true);
+        try {
+            const data = await import('@/services/neetQuestionService').then(m => m.getNeetQuestions(subject, selectedTopic, selectedSubTopic, nextCursor));
+            setQuestions(prev => [...prev, ...data.questions]);
+            setNextCursor(data.nextCursor);
+        } catch (e) {
+            toast.error("Failed to load questions");
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const handleDeleteQuestion = async (id) => {
         if (!confirm("Delete this question?")) return;
         try {
@@ -543,7 +560,7 @@ const ManageContent = ({ subject, initialTopics, onRefresh, onUploadMore }) => {
                             </>
                         )}
                         <span className="ml-4 px-2 py-0.5 bg-slate-100 rounded text-xs text-slate-500 font-mono">
-                            {questions.length} questions
+                            {questions.length}{nextCursor ? '+' : ''} questions
                         </span>
                     </div>
                     <button
@@ -614,6 +631,15 @@ const ManageContent = ({ subject, initialTopics, onRefresh, onUploadMore }) => {
                                     </div>
                                 </div>
                             ))}
+                            {nextCursor && (
+                                <button
+                                    onClick={loadMoreQuestions}
+                                    disabled={loadingMore}
+                                    className="mx-auto px-4 py-2 border border-indigo-600 text-indigo-600 text-sm font-medium rounded hover:bg-indigo-50 transition disabled:opacity-50"
+                                >
+                                    {loadingMore ? 'Loading...' : 'Load more'}
+                                </button>
+                            )}
                         </div>
                     )}
                 </div>
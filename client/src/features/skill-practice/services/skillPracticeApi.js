@@ -81,6 +81,28 @@ export const logPracticeSession = async (uid, data) => {
     }
 };
 
+/**
+ * Log several practice sessions in one request (e.g. sessions queued while offline)
+ * @param {string} uid - Firebase user ID
+ * @param {object[]} sessions - Practice session data, oldest first
+ */
+export const logPracticeSessions = async (uid, sessions) => {
+    try {
+        const response = await fetch('/api/skill-practice/log-practice/batch', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ uid, sessions })
+        });
+        if (response.ok) {
+            return await response.json();
+        }
+        throw new Error(`API Error: ${response.status}`);
+    } catch (error) {
+        console.error('Error logging practice sessions:', error);
+        throw error;
+    }
+};
+
 /**
  * Get comprehensive analytics for skill practice
  * @param {number} reportId - The report ID
@@ -129,6 +151,7 @@ export default {
     getDaysProgress,
     completeAssessment,
     logPracticeSession,
+    logPracticeSessions,
     getSkillAnalytics,
     getPracticeSessions
 };
@@ -22,24 +22,29 @@ export const saveNeetQuestions = async (subject, questions, teacherUid) => {
 };
 
 /**
- * Fetch all questions for a specific subject, optionally filtered
+ * Fetch one page of questions for a specific subject, optionally filtered
  * @param {string} subject - physics | chemistry | biology
  * @param {string} [topic] 
  * @param {string} [subTopic]
- * @returns {Promise<Array>}
+ * @param {string} [cursor] - nextCursor of the previous page; omit for the first page
+ * @returns {Promise<{questions: Array, nextCursor: string|null}>} nextCursor is null on the last page
  */
-export const getNeetQuestions = async (subject, topic, subTopic) => {
+export const getNeetQuestions = async (subject, topic, subTopic, cursor) => {
     try {
         const params = new URLSearchParams();
         if (topic) params.append('topic', topic);
         if (subTopic) params.append('sub_topic', subTopic);
+        if (cursor) params.append('cursor', cursor);
 
         const response = await fetch(`/api/neet/${subject}?${params.toString()}`);
-        if (!response.ok) return [];
-        return await response.json();
+        if (!response.ok) return { questions: [], nextCursor: null };
+        return {
+            questions: await response.json(),
+            nextCursor: response.headers.get('X-Next-Cursor')
+        };
     } catch (error) {
         console.error(`Error fetching NEET ${subject} questions:`, error);
-        return [];
+        return { questions: [], nextCursor: null };
     }
 };
 
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError
+from app.core.database import get_db_pool
+from app.core.identity import identity
+from app.core.security import token_verifier
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+@dataclass
+class Principal:
+    """The authenticated caller: token subject resolved to its users row."""
+    uid: str
+    user_id: int
+    role: Optional[str]
+    claims: Dict[str, Any]
+
+
+async def authenticate(token: str) -> Principal:
+    """
+    Verifies a bearer token and resolves its subject (firebase_uid) to a user.
+    With the token and the user both cached this does no crypto and no database work.
+    """
+    try:
+        claims = token_verifier.verify(token)
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+    uid = claims.get("sub")
+    if not uid:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+    user = identity.cached_user(uid)
+    if user is None:
+        pool = await get_db_pool()
+        async with pool.acquire() as conn:
+            user = await identity.load_user(conn, uid)
+    if user is None:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    return Principal(uid=uid, user_id=user['user_id'], role=user['role'], claims=claims)
+
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> Principal:
+    """Route dependency: the caller's Principal, or 401 without a valid bearer token."""
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    return await authenticate(credentials.credentials)
+
+
+async def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> Optional[Principal]:
+    """Like get_current_user, but anonymous callers get None instead of a 401."""
+    if credentials is None:
+        return None
+    return await authenticate(credentials.credentials)
@@ -9,6 +9,14 @@ class Settings(BaseSettings):
     DB_PORT: Optional[int] = 5432
     DB_NAME: Optional[str] = None
 
+    # Connection pool (opened and warmed at startup, drained at shutdown)
+    DB_POOL_MIN_SIZE: int = 5
+    DB_POOL_MAX_SIZE: int = 20
+    DB_POOL_MAX_INACTIVE_LIFETIME: float = 300.0  # idle connections above min_size are closed after this
+    DB_POOL_CLOSE_TIMEOUT: float = 10.0
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_COMMAND_TIMEOUT: Optional[float] = 30.0
+
     # Firebase
     FIREBASE_DATABASE_URL: Optional[str] = None
     GOOGLE_APPLICATION_CREDENTIALS: Optional[str] = None # Path
@@ -24,6 +32,43 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 43200 # 30 days
 
+    # Verified JWT claims cache (entries never outlive the token's exp)
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 900
+
+    # Password hashing (bcrypt cost; stored hashes of another cost are rehashed on login)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64  # callers waiting for a worker beyond this get a 503
+
+    # Identity cache (firebase_uid -> user_id/role, student_id, parent_id)
+    IDENTITY_CACHE_MAX_ENTRIES: int = 10000
+    IDENTITY_CACHE_TTL_SECONDS: int = 300
+
+    # NEET assessment sampler (in-process question id index, per subject)
+    NEET_SAMPLER_TTL_SECONDS: int = 60
+
+    # NEET question listing (GET /api/neet/{subject})
+    NEET_QUESTIONS_PAGE_SIZE: int = 200
+    NEET_QUESTIONS_MAX_PAGE_SIZE: int = 1000
+
+    # Admin dashboard aggregates (served from memory, reconciled from the database)
+    DASHBOARD_AGGREGATES_REFRESH_SECONDS: float = 30.0
+    DASHBOARD_AGGREGATES_MAX_STALENESS_SECONDS: float = 60.0
+
+    # Conditional GET / gzip for versioned read-mostly endpoints (app/core/http_cache.py)
+    HTTP_COMPRESS_MIN_BYTES: int = 1024
+    HTTP_COMPRESS_LEVEL: int = 6
+
+    # Skill practice (POST /api/skill-practice/log-practice/batch)
+    SKILL_PRACTICE_MAX_BATCH: int = 500
+
+    # Optional write-behind buffer for POST /api/skill-practice/log-practice
+    SKILL_PRACTICE_WRITE_BEHIND: bool = False
+    SKILL_PRACTICE_FLUSH_INTERVAL_MS: int = 250
+    SKILL_PRACTICE_FLUSH_MAX_EVENTS: int = 500
+    SKILL_PRACTICE_MAX_PENDING: int = 10000  # beyond this, sessions are written synchronously
+
     class Config:
         env_file = ".env"
         extra = "ignore" # Ignore extra env vars
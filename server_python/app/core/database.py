@@ -1,20 +1,77 @@
 from app.core.config import settings
+import asyncio
+import time
+from contextlib import asynccontextmanager
 import asyncpg
-from typing import Optional
+from typing import Any, Dict, Optional
+from app.db.codecs import register_json_codecs
+from app.db.queries import queries
+
+
+async def init_connection(conn):
+    await register_json_codecs(conn)
+
 
 class Database:
+    """
+    The asyncpg pool plus how long callers wait for a connection, so pool saturation
+    shows up in /api/system/metrics before it shows up as request latency.
+    """
+
     pool: Optional[asyncpg.Pool] = None
 
+    def __init__(self):
+        self.waiters = 0
+        self.max_waiters = 0
+        self.acquires = 0
+        self.acquire_timeouts = 0
+        self.total_acquire_ms = 0.0
+        self.max_acquire_ms = 0.0
+
+    @asynccontextmanager
+    async def acquire(self, timeout: Optional[float] = None):
+        """`async with db.acquire() as conn`: a pool connection, with the wait for it timed."""
+        started_at = time.perf_counter()
+        self.waiters += 1
+        self.max_waiters = max(self.max_waiters, self.waiters)
+        try:
+            conn = await self.pool.acquire(timeout=timeout)
+        except asyncio.TimeoutError:
+            self.acquire_timeouts += 1
+            raise
+        finally:
+            self.waiters -= 1
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            self.acquires += 1
+            self.total_acquire_ms += elapsed_ms
+            self.max_acquire_ms = max(self.max_acquire_ms, elapsed_ms)
+        try:
+            yield conn
+        finally:
+            await self.pool.release(conn)
+
     async def connect(self):
         if not self.pool:
             try:
                 print("Connecting to PostgreSQL...")
+                if len(queries.statements) > settings.DB_STATEMENT_CACHE_SIZE:
+                    print(f"Warning: {len(queries.statements)} registered queries exceed "
+                          f"DB_STATEMENT_CACHE_SIZE={settings.DB_STATEMENT_CACHE_SIZE}; hot queries will be re-prepared")
+                # Awaiting the pool opens min_size connections up front, each registering
+                # the JSON codecs (app.db.codecs)
                 self.pool = await asyncpg.create_pool(
                     user=settings.DB_USER,
                     password=settings.DB_PASSWORD,
                     host=settings.DB_HOST,
                     port=settings.DB_PORT,
                     database=settings.DB_NAME,
+                    min_size=settings.DB_POOL_MIN_SIZE,
+                    max_size=settings.DB_POOL_MAX_SIZE,
+                    max_queries=50000,
+                    max_inactive_connection_lifetime=settings.DB_POOL_MAX_INACTIVE_LIFETIME,
+                    statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+                    command_timeout=settings.DB_COMMAND_TIMEOUT,
+                    init=init_connection,
                 )
                 print("Connected to PostgreSQL.")
             except Exception as e:
@@ -25,12 +82,35 @@ class Database:
 
     async def disconnect(self):
         if self.pool:
-            await self.pool.close()
+            pool, self.pool = self.pool, None
+            try:
+                # Lets in-flight requests release their connections first
+                await asyncio.wait_for(pool.close(), timeout=settings.DB_POOL_CLOSE_TIMEOUT)
+            except asyncio.TimeoutError:
+                print("Timed out draining PostgreSQL pool; terminating remaining connections.")
+                pool.terminate()
             print("Disconnected from PostgreSQL.")
 
+    def stats(self) -> Optional[Dict[str, Any]]:
+        if not self.pool:
+            return None
+        return {
+            "size": self.pool.get_size(),
+            "idle": self.pool.get_idle_size(),
+            "minSize": self.pool.get_min_size(),
+            "maxSize": self.pool.get_max_size(),
+            "waiters": self.waiters,
+            "maxWaiters": self.max_waiters,
+            "acquires": self.acquires,
+            "acquireTimeouts": self.acquire_timeouts,
+            "avgAcquireMs": round(self.total_acquire_ms / self.acquires, 3) if self.acquires else 0.0,
+            "maxAcquireMs": round(self.max_acquire_ms, 3),
+        }
+
 db = Database()
 
-async def get_db_pool() -> asyncpg.Pool:
+async def get_db_pool() -> Database:
+    """The connected database; callers check connections out with `async with pool.acquire()`."""
     if not db.pool:
         await db.connect()
-    return db.pool
+    return db
@@ -0,0 +1,225 @@
+"""
+Conditional GET (ETag / 304) and gzip for read-mostly GET endpoints.
+
+An endpoint opts in with a dependency naming the tables its response is built from:
+
+    @router.get("/{subject}/topics", dependencies=[http_cache.versioned("neet.topics", tables=["neet_topic_counts"])])
+
+The dependency reads the tables' versions from data_versions (kept by the triggers of
+migration 0013) with one indexed query and derives a weak ETag from them, the request path
+and the query string. A matching If-None-Match is answered with 304 there, before the
+endpoint and its queries run. Otherwise HttpCacheMiddleware adds the ETag and
+Cache-Control: private, no-cache to the 200 (browsers revalidate on every poll and reuse their
+copy on 304), and gzips the body when the client accepts it and the body is at least
+min_compress_bytes (streamed bodies are always compressed).
+
+If the versions cannot be read (e.g. migration 0013 not applied) the response is served
+without an ETag. Per-route counters are reported by stats() in /api/system/metrics.
+"""
+import hashlib
+import time
+import zlib
+from typing import Any, Dict, NamedTuple, Optional, Sequence
+import asyncpg
+from fastapi import Depends, HTTPException, Request
+from starlette.datastructures import Headers, MutableHeaders
+from app.core.config import settings
+from app.core.database import get_db_pool
+from app.db.queries import queries
+
+TABLE_VERSIONS = queries.register("http_cache.table_versions", """
+    SELECT table_name, SUM(version)::bigint AS version
+    FROM data_versions
+    WHERE table_name = ANY($1::text[])
+    GROUP BY table_name
+""")
+
+CACHE_CONTROL = "private, no-cache"
+
+# Request scope key through which the dependency hands its route to HttpCacheMiddleware
+SCOPE_KEY = "http_cache"
+
+
+class RouteStats:
+    __slots__ = ("requests", "not_modified", "compressed", "body_bytes", "sent_bytes",
+                 "compress_cpu_ms", "version_ms", "total_ms")
+
+    def __init__(self):
+        self.requests = 0
+        self.not_modified = 0
+        self.compressed = 0
+        self.body_bytes = 0
+        self.sent_bytes = 0
+        self.compress_cpu_ms = 0.0
+        self.version_ms = 0.0
+        self.total_ms = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "notModified": self.not_modified,
+            "compressed": self.compressed,
+            "bodyBytes": self.body_bytes,
+            "sentBytes": self.sent_bytes,
+            "compressCpuMs": round(self.compress_cpu_ms, 3),
+            "avgVersionMs": round(self.version_ms / self.requests, 3) if self.requests else 0.0,
+            "avgResponseMs": round(self.total_ms / self.requests, 3) if self.requests else 0.0,
+        }
+
+
+class VersionedRequest(NamedTuple):
+    route: RouteStats
+    etag: Optional[str]
+    started_at: float
+
+
+class HttpCache:
+    """Versioned routes and their per-route counters."""
+
+    def __init__(self, min_compress_bytes: int, compress_level: int):
+        self.min_compress_bytes = min_compress_bytes
+        self.compress_level = compress_level
+        self.routes: Dict[str, RouteStats] = {}
+        self.version_errors = 0
+
+    def versioned(self, name: str, tables: Sequence[str]):
+        """Route dependency: ETag from the versions of `tables`, 304 on a matching If-None-Match."""
+        route = self.routes.setdefault(name, RouteStats())
+        tables = list(tables)
+
+        async def check_version(request: Request):
+            started_at = time.perf_counter()
+            route.requests += 1
+            etag = await self.etag(name, request.scope, tables)
+            route.version_ms += (time.perf_counter() - started_at) * 1000
+            request.scope[SCOPE_KEY] = VersionedRequest(route, etag, started_at)
+            if etag is not None and etag_matches(request.headers.get("if-none-match"), etag):
+                route.not_modified += 1
+                raise HTTPException(status_code=304, headers={
+                    "ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"
+                })
+
+        return Depends(check_version)
+
+    async def table_versions(self, tables: Sequence[str]) -> Dict[str, int]:
+        pool = await get_db_pool()
+        async with pool.acquire() as conn:
+            rows = await queries.fetch(conn, TABLE_VERSIONS, list(tables))
+        return {r['table_name']: r['version'] for r in rows}
+
+    async def etag(self, name: str, scope, tables: Sequence[str]) -> Optional[str]:
+        try:
+            versions = await self.table_versions(tables)
+        except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+            self.version_errors += 1
+            print(f"Could not read data versions for {name}: {e}")
+            return None
+        key = "|".join(
+            [name, scope["path"], scope.get("query_string", b"").decode("latin-1")]
+            + [str(versions.get(t, 0)) for t in tables]
+        )
+        return 'W/"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "minCompressBytes": self.min_compress_bytes,
+            "versionErrors": self.version_errors,
+            "routes": {name: route.stats() for name, route in self.routes.items()},
+        }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match list (or *)."""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or etag[2:] in (c[2:] if c.startswith("W/") else c for c in candidates)
+
+
+class HttpCacheMiddleware:
+    """Adds the ETag/caching headers and gzip to 200s of requests that went through versioned()."""
+
+    def __init__(self, app, cache: Optional[HttpCache] = None):
+        self.app = app
+        self.cache = cache or http_cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        accepts_gzip = "gzip" in Headers(scope=scope).get("accept-encoding", "")
+        versioned: Optional[VersionedRequest] = None
+        start_message = None
+        compressor = None
+
+        async def send_wrapper(message):
+            nonlocal versioned, start_message, compressor
+            if message["type"] == "http.response.start":
+                versioned = scope.get(SCOPE_KEY)
+                if versioned is None:
+                    await send(message)
+                    return
+                # Held until the first body chunk shows whether the body is worth compressing
+                start_message = message
+                return
+            if versioned is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            route = versioned.route
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            route.body_bytes += len(body)
+            if start_message is not None:
+                compressor = self._finish_headers(start_message, versioned.etag, accepts_gzip, body, more_body)
+                if compressor is not None:
+                    route.compressed += 1
+                    body = self._compress(compressor, body, more_body, route)
+                    if not more_body:
+                        MutableHeaders(raw=start_message["headers"])["Content-Length"] = str(len(body))
+                await send(start_message)
+                start_message = None
+            elif compressor is not None:
+                body = self._compress(compressor, body, more_body, route)
+                if not body and more_body:
+                    return
+            route.sent_bytes += len(body)
+            if not more_body:
+                route.total_ms += (time.perf_counter() - versioned.started_at) * 1000
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _finish_headers(self, start_message, etag: Optional[str], accepts_gzip: bool, body: bytes, more_body: bool):
+        """Adds the caching headers to a 200; returns a gzip compressor if the body is to be compressed."""
+        if start_message["status"] != 200:
+            return None
+        response_headers = MutableHeaders(raw=start_message["headers"])
+        if etag is not None:
+            response_headers["ETag"] = etag
+            response_headers["Cache-Control"] = CACHE_CONTROL
+        response_headers.add_vary_header("Accept-Encoding")
+        # Streamed bodies (more_body) are compressed whatever the size of their first chunk
+        if not accepts_gzip or "content-encoding" in response_headers \
+                or (not more_body and len(body) < self.cache.min_compress_bytes):
+            return None
+        response_headers["Content-Encoding"] = "gzip"
+        if "content-length" in response_headers:
+            del response_headers["content-length"]
+        return zlib.compressobj(self.cache.compress_level, zlib.DEFLATED, 31)
+
+    @staticmethod
+    def _compress(compressor, body: bytes, more_body: bool, route: RouteStats) -> bytes:
+        started_at = time.process_time()
+        out = compressor.compress(body)
+        if not more_body:
+            out += compressor.flush()
+        route.compress_cpu_ms += (time.process_time() - started_at) * 1000
+        return out
+
+
+http_cache = HttpCache(
+    min_compress_bytes=settings.HTTP_COMPRESS_MIN_BYTES,
+    compress_level=settings.HTTP_COMPRESS_LEVEL,
+)
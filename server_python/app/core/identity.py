@@ -0,0 +1,116 @@
+from typing import Any, Dict, Optional
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.queries import queries
+
+USER_BY_UID = queries.register(
+    "identity.user_by_uid", "SELECT user_id, role FROM users WHERE firebase_uid = $1"
+)
+STUDENT_OF_USER = queries.register(
+    "identity.student_of_user", "SELECT student_id FROM students WHERE user_id = $1 LIMIT 1"
+)
+PARENT_OF_USER = queries.register(
+    "identity.parent_of_user", "SELECT parent_id FROM parents WHERE user_id = $1"
+)
+
+
+class IdentityResolver:
+    """
+    Caches the firebase_uid -> user lookups most handlers run before doing any real work,
+    plus the user_id -> student_id / parent_id lookups that usually follow them.
+    Only positive results are cached, so a user created by another worker is picked up
+    on the next request. Writers that delete users or change roles must invalidate.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.users = TTLCache(max_entries, ttl_seconds)     # uid -> {"user_id", "role"}
+        self.students = TTLCache(max_entries, ttl_seconds)  # user_id -> student_id
+        self.parents = TTLCache(max_entries, ttl_seconds)   # user_id -> parent_id
+
+    async def get_user(self, conn, uid: str) -> Optional[Dict[str, Any]]:
+        """Return {"user_id", "role"} for a firebase_uid, or None if unknown."""
+        if not uid:
+            return None
+
+        user = self.cached_user(uid)
+        if user is not None:
+            return user
+        return await self.load_user(conn, uid)
+
+    def cached_user(self, uid: str) -> Optional[Dict[str, Any]]:
+        """Cache-only half of get_user, for callers that want to skip acquiring a connection on a hit."""
+        return self.users.get(uid)
+
+    async def load_user(self, conn, uid: str) -> Optional[Dict[str, Any]]:
+        """Database half of get_user: look the uid up and cache it."""
+        row = await queries.fetchrow(conn, USER_BY_UID, uid)
+        if not row:
+            return None
+        return self.remember_user(uid, row['user_id'], row['role'])
+
+    async def get_user_id(self, conn, uid: str) -> Optional[int]:
+        user = await self.get_user(conn, uid)
+        return user['user_id'] if user else None
+
+    async def get_student_id(self, conn, user_id: int) -> Optional[int]:
+        if user_id is None:
+            return None
+
+        student_id = self.students.get(user_id)
+        if student_id is not None:
+            return student_id
+
+        student_id = await queries.fetchval(conn, STUDENT_OF_USER, user_id)
+        if student_id is not None:
+            self.students.set(user_id, student_id)
+        return student_id
+
+    async def get_parent_id(self, conn, user_id: int) -> Optional[int]:
+        if user_id is None:
+            return None
+
+        parent_id = self.parents.get(user_id)
+        if parent_id is not None:
+            return parent_id
+
+        parent_id = await queries.fetchval(conn, PARENT_OF_USER, user_id)
+        if parent_id is not None:
+            self.parents.set(user_id, parent_id)
+        return parent_id
+
+    def remember_user(self, uid: str, user_id: int, role: Optional[str]) -> Dict[str, Any]:
+        """Prime the cache from a row the caller already has (register/login)."""
+        user = {"user_id": user_id, "role": role}
+        if uid:
+            self.users.set(uid, user)
+        return user
+
+    def invalidate(self, uid: Optional[str] = None, user_id: Optional[int] = None):
+        """Forget everything cached for a user, by firebase_uid and/or user_id."""
+        if uid:
+            cached = self.users.pop(uid)
+            if cached and user_id is None:
+                user_id = cached['user_id']
+
+        if user_id is not None:
+            self.users.pop_where(lambda _, user: user['user_id'] == user_id)
+            self.students.pop(user_id)
+            self.parents.pop(user_id)
+
+    def clear(self):
+        self.users.clear()
+        self.students.clear()
+        self.parents.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "users": self.users.stats(),
+            "students": self.students.stats(),
+            "parents": self.parents.stats(),
+        }
+
+
+identity = IdentityResolver(
+    max_entries=settings.IDENTITY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.IDENTITY_CACHE_TTL_SECONDS,
+)
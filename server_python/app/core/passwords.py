@@ -0,0 +1,124 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from app.core.config import settings
+
+
+def make_password_context(rounds: int) -> CryptContext:
+    # min == max == default: a stored hash of any other cost is reported as needing an update
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a small dedicated thread pool so hashing never blocks the event loop
+    (bcrypt releases the GIL, so the workers hash in parallel).
+
+    Once started (app lifespan), at most max_workers calls run at once and at most
+    max_pending more wait for a worker; further callers are turned away with a 503 instead
+    of piling unbounded work onto the pool during a login burst. Before start() (scripts,
+    tests without the lifespan) calls go straight to the pool. Queue depth, rejections and
+    timings are exposed through stats().
+    """
+
+    def __init__(self, rounds: int, max_workers: int, max_pending: int):
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.context = make_password_context(rounds)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.waiting = 0
+        self.in_flight = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.total_wait_ms = 0.0
+        self.total_work_ms = 0.0
+
+    def start(self):
+        """Bounds concurrent calls from now on; call from the app's startup."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        if self._slots is None:
+            return await loop.run_in_executor(self._executor, fn, *args)
+
+        queued_at = time.perf_counter()
+        if self._slots.locked():
+            if self.waiting >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Server is busy, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+            try:
+                await self._slots.acquire()
+            finally:
+                self.waiting -= 1
+        else:
+            await self._slots.acquire()
+
+        started_at = time.perf_counter()
+        self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+            self.completed += 1
+            self.total_wait_ms += (started_at - queued_at) * 1000
+            self.total_work_ms += (time.perf_counter() - started_at) * 1000
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Returns (valid, new_hash). new_hash is set when the password is valid but the stored
+        hash uses another cost factor than BCRYPT_ROUNDS; the caller should store it.
+        """
+        valid, new_hash = await self._run(self.context.verify_and_update, password, hashed_password)
+        if new_hash:
+            self.rehashed += 1
+        return valid, new_hash
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rounds": self.rounds,
+            "workers": self.max_workers,
+            "maxPending": self.max_pending,
+            "waiting": self.waiting,
+            "inFlight": self.in_flight,
+            "maxWaiting": self.max_waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "avgWaitMs": round(self.total_wait_ms / self.completed, 3) if self.completed else 0.0,
+            "avgWorkMs": round(self.total_work_ms / self.completed, 3) if self.completed else 0.0,
+        }
+
+
+hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,14 @@
+import re
+from typing import Optional
+
+_NON_DIGITS = re.compile(r"[^0-9]")
+
+
+def phone_last10(phone: Optional[str]) -> Optional[str]:
+    """
+    Lookup key for a phone number: its last 10 digits, ignoring formatting and country code.
+    Must match the students/parents.phone_last10 generated columns (migration 0011).
+    """
+    if not phone:
+        return None
+    return _NON_DIGITS.sub("", phone)[-10:] or None
@@ -0,0 +1,29 @@
+"""
+JSON response classes.
+
+ORJSONResponse is the app's default_response_class. Handlers that build a large payload
+from plain dicts, lists, str/int/bool/None and datetimes can return ORJSONResponse(payload)
+themselves, which also skips FastAPI's jsonable_encoder pass (orjson rejects Decimal, so
+not for rows with NUMERIC columns).
+
+RawJSONResponse sends JSON text that is already serialized, typically selected from
+Postgres as ::text, without parsing or re-encoding it.
+"""
+from typing import Any, Iterable
+import orjson
+from fastapi.responses import JSONResponse, Response
+
+
+class ORJSONResponse(JSONResponse):
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class RawJSONResponse(Response):
+    media_type = "application/json"
+
+    @classmethod
+    def array(cls, items: Iterable[str], **kwargs) -> "RawJSONResponse":
+        """A JSON array of pre-serialized items."""
+        return cls(content="[" + ",".join(items) + "]", **kwargs)
@@ -1,11 +1,14 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Union, Any
+from typing import Optional, Union, Any, Dict
 from jose import jwt
-from passlib.context import CryptContext
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.passwords import hasher
 
-# Password Hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password Hashing (blocking; async handlers use app.core.passwords.hasher instead)
+pwd_context = hasher.context
 
 # JWT Configuration
 SECRET_KEY = settings.SECRET_KEY
@@ -27,3 +30,39 @@ def create_access_token(subject: Union[str, Any], expires_delta: Optional[timede
     to_encode = {"sub": str(subject), "exp": expire}
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """Verifies signature and expiry; raises jose.JWTError on a bad token."""
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+class TokenVerifier:
+    """
+    Verified-claims cache in front of decode_access_token, keyed by the token's SHA-256.
+    An entry never outlives the token's exp claim, so a cache hit is as good as a
+    fresh verification and skips the signature check entirely.
+    Only valid tokens are cached.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.cache = TTLCache(max_entries, ttl_seconds)
+        self.verifications = 0
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        key = hashlib.sha256(token.encode()).digest()
+        claims = self.cache.get(key)
+        if claims is not None:
+            return claims
+
+        claims = decode_access_token(token)
+        self.verifications += 1
+
+        exp = claims.get("exp")
+        remaining = exp - time.time() if exp is not None else None
+        if remaining is None or remaining > 0:
+            self.cache.set(key, claims, ttl_seconds=remaining)
+        return claims
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.cache.stats(), "verifications": self.verifications}
+
+token_verifier = TokenVerifier(settings.TOKEN_CACHE_MAX_ENTRIES, settings.TOKEN_CACHE_TTL_SECONDS)
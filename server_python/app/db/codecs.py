@@ -0,0 +1,40 @@
+"""
+json/jsonb type codecs for asyncpg, backed by orjson.
+
+With the codecs registered, JSON columns come back as Python objects and parameters
+bound to json/jsonb are passed as Python objects (dicts, lists, ...) rather than
+pre-serialized strings. The codecs use the binary wire format, so they also apply to
+copy_records_to_table, and orjson reads and writes the bytes without an intermediate str.
+
+Pool connections get them from the pool init hook (app.core.database); scripts that open
+their own connection call register_json_codecs(conn) right after connecting. A query
+whose JSON is only passed through selects it as ::text and is never decoded.
+"""
+import orjson
+
+# Binary jsonb is a version byte followed by the JSON text
+JSONB_VERSION = b"\x01"
+
+
+def encode_json(value) -> bytes:
+    return orjson.dumps(value)
+
+
+def encode_jsonb(value) -> bytes:
+    return JSONB_VERSION + orjson.dumps(value)
+
+
+def decode_jsonb(data: bytes):
+    if data[:1] != JSONB_VERSION:
+        raise ValueError(f"Unsupported jsonb version {data[:1]!r}")
+    return orjson.loads(memoryview(data)[1:])
+
+
+async def register_json_codecs(conn):
+    """Must run before statements are prepared on conn (set_type_codec resets its statement cache)."""
+    await conn.set_type_codec(
+        "json", schema="pg_catalog", encoder=encode_json, decoder=orjson.loads, format="binary"
+    )
+    await conn.set_type_codec(
+        "jsonb", schema="pg_catalog", encoder=encode_jsonb, decoder=decode_jsonb, format="binary"
+    )
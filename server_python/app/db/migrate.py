@@ -0,0 +1,117 @@
+"""
+Versioned schema migrations.
+
+    python -m app.db.migrate            # apply pending migrations
+    python -m app.db.migrate --status   # list applied / pending
+
+The base scripts (schema.sql, missing_tables.sql) run first, then app/db/migrations/NNNN_*.sql
+in name order. Each one runs in its own transaction and is recorded in schema_migrations,
+so it is applied exactly once per database. Scripts written before the runner existed are
+idempotent, so databases set up by the old setup_db.py adopt them safely.
+"""
+import asyncio
+import hashlib
+import os
+import sys
+from typing import List, Tuple
+
+DB_DIR = os.path.dirname(os.path.abspath(__file__))
+MIGRATIONS_DIR = os.path.join(DB_DIR, "migrations")
+BASE_SCRIPTS = ["schema.sql", "missing_tables.sql"]
+
+# pg_advisory_lock key: only one runner at a time per database
+MIGRATION_LOCK_ID = 727001
+
+# Creates student_report_summary empty; it is filled from the existing reports once applied
+REPORT_SUMMARY_MIGRATION = "0006_student_report_summary"
+
+
+def list_migrations() -> List[Tuple[str, str]]:
+    """(version, path) in apply order. Base scripts are versioned as base/<file>."""
+    migrations = [(f"base/{name}", os.path.join(DB_DIR, name)) for name in BASE_SCRIPTS]
+    for name in sorted(os.listdir(MIGRATIONS_DIR)):
+        if name.endswith(".sql"):
+            migrations.append((name[:-len(".sql")], os.path.join(MIGRATIONS_DIR, name)))
+    return migrations
+
+
+def _read(path: str) -> Tuple[str, str]:
+    with open(path, "r") as f:
+        sql = f.read()
+    return sql, hashlib.sha256(sql.encode()).hexdigest()
+
+
+async def apply_migrations(conn) -> List[str]:
+    """Applies every pending migration; returns the versions applied."""
+    applied_now = []
+    await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_ID)
+    try:
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version VARCHAR(255) PRIMARY KEY,
+                checksum CHAR(64) NOT NULL,
+                applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        applied = {r['version']: r['checksum'] for r in await conn.fetch("SELECT version, checksum FROM schema_migrations")}
+
+        for version, path in list_migrations():
+            sql, checksum = _read(path)
+            if version in applied:
+                if applied[version] != checksum:
+                    print(f"Warning: migration {version} changed after it was applied; add a new migration instead.")
+                continue
+
+            print(f"Applying migration {version}...")
+            async with conn.transaction():
+                await conn.execute(sql)
+                await conn.execute(
+                    "INSERT INTO schema_migrations (version, checksum) VALUES ($1, $2)",
+                    version, checksum
+                )
+            applied_now.append(version)
+
+        if REPORT_SUMMARY_MIGRATION in applied_now:
+            from app.features.reports.summary import rebuild_report_summaries
+            total = await rebuild_report_summaries(conn)
+            print(f"{total} student report summaries built.")
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_ID)
+
+    return applied_now
+
+
+async def migration_status(conn) -> List[Tuple[str, bool]]:
+    exists = await conn.fetchval("SELECT to_regclass('schema_migrations') IS NOT NULL")
+    applied = set()
+    if exists:
+        applied = {r['version'] for r in await conn.fetch("SELECT version FROM schema_migrations")}
+    return [(version, version in applied) for version, _ in list_migrations()]
+
+
+async def main(args: List[str]):
+    import asyncpg
+    from app.core.config import settings
+
+    print(f"Connecting to database {settings.DB_NAME} at {settings.DB_HOST}...")
+    conn = await asyncpg.connect(
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        database=settings.DB_NAME
+    )
+    try:
+        if "--status" in args:
+            for version, is_applied in await migration_status(conn):
+                print(f"{'applied' if is_applied else 'pending'}  {version}")
+            return
+
+        applied = await apply_migrations(conn)
+        print(f"Database up to date ({len(applied)} migrations applied).")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
@@ -0,0 +1,10 @@
+-- Normalized keys for the case-insensitive subject/topic/sub-topic filters in neet.router.
+-- Generated columns stay in sync with every write path (INSERT, COPY, UPDATE) automatically.
+ALTER TABLE neet_questions
+    ADD COLUMN IF NOT EXISTS subject_key VARCHAR(50) GENERATED ALWAYS AS (LOWER(BTRIM(subject))) STORED,
+    ADD COLUMN IF NOT EXISTS topic_key VARCHAR(255) GENERATED ALWAYS AS (LOWER(BTRIM(topic))) STORED,
+    ADD COLUMN IF NOT EXISTS sub_topic_key VARCHAR(255) GENERATED ALWAYS AS (LOWER(BTRIM(sub_topic))) STORED;
+
+-- Serves subject, subject+topic, subject+topic+sub_topic and the per-type filters
+CREATE INDEX IF NOT EXISTS idx_neet_questions_keys
+    ON neet_questions (subject_key, topic_key, sub_topic_key, question_type);
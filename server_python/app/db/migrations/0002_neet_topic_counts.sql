@@ -0,0 +1,20 @@
+-- Per (subject, topic, sub_topic, question_type) question counts behind GET /api/neet/{subject}/topics.
+-- Kept current by the NEET write endpoints (see app/features/neet/topic_counts.py).
+CREATE TABLE IF NOT EXISTS neet_topic_counts (
+    subject_key VARCHAR(50) NOT NULL,
+    topic_key VARCHAR(255) NOT NULL,
+    sub_topic VARCHAR(255) NOT NULL DEFAULT '', -- trimmed sub_topic, '' when none
+    question_type VARCHAR(50) NOT NULL DEFAULT '', -- '' when none
+    topic_display VARCHAR(255),
+    question_count INTEGER NOT NULL,
+    PRIMARY KEY (subject_key, topic_key, sub_topic, question_type)
+);
+
+-- Backfill from existing questions
+INSERT INTO neet_topic_counts (subject_key, topic_key, sub_topic, question_type, topic_display, question_count)
+SELECT subject_key, topic_key, COALESCE(BTRIM(sub_topic), ''), COALESCE(question_type, ''), MIN(BTRIM(topic)), COUNT(*)
+FROM neet_questions
+WHERE subject_key IS NOT NULL AND topic_key IS NOT NULL
+GROUP BY 1, 2, 3, 4
+ON CONFLICT (subject_key, topic_key, sub_topic, question_type)
+DO UPDATE SET question_count = EXCLUDED.question_count, topic_display = EXCLUDED.topic_display;
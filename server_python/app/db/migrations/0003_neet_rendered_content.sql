@@ -0,0 +1,3 @@
+-- Display-ready question payload written at upload/update time (app/features/neet/render.py).
+-- Existing rows are filled by: python -m app.features.neet.render
+ALTER TABLE neet_questions ADD COLUMN IF NOT EXISTS rendered_content JSONB;
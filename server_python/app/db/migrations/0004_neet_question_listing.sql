@@ -0,0 +1,10 @@
+-- Keyset pagination for GET /api/neet/{subject} orders by (created_at DESC, id DESC);
+-- the row comparison needs created_at to be non-null.
+UPDATE neet_questions SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL;
+ALTER TABLE neet_questions ALTER COLUMN created_at SET NOT NULL;
+
+-- Subject-wide listing, and listing within a topic (sub-topic is filtered on top)
+CREATE INDEX IF NOT EXISTS idx_neet_questions_listing
+    ON neet_questions (subject_key, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_neet_questions_topic_listing
+    ON neet_questions (subject_key, topic_key, created_at DESC, id DESC);
@@ -0,0 +1,4 @@
+-- Per-teacher lookups of the set-based GET /api/teachers/ query (teachers.router.fetch_teacher_list)
+CREATE INDEX IF NOT EXISTS idx_mentorship_mentor_id ON mentorship (mentor_id);
+CREATE INDEX IF NOT EXISTS idx_teaching_teacher_id ON teaching (teacher_id);
+CREATE INDEX IF NOT EXISTS idx_credentials_user_id ON credentials (user_id);
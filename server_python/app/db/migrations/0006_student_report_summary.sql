@@ -0,0 +1,17 @@
+-- One row per student with report counts and the latest standard / rapid report,
+-- maintained by reports.router.save_report (app/features/reports/summary.py).
+-- Filled from existing reports by setup_db.py, or: python -m app.features.reports.summary
+CREATE TABLE IF NOT EXISTS student_report_summary (
+    student_id INTEGER PRIMARY KEY REFERENCES students(student_id) ON DELETE CASCADE,
+    standard_count INTEGER NOT NULL DEFAULT 0,
+    rapid_count INTEGER NOT NULL DEFAULT 0,
+    latest_standard_report_id INTEGER REFERENCES reports(report_id) ON DELETE SET NULL,
+    latest_standard_marks INTEGER,
+    latest_standard_at TIMESTAMP,
+    latest_rapid_report_id INTEGER REFERENCES reports(report_id) ON DELETE SET NULL,
+    latest_rapid_marks INTEGER,
+    latest_rapid_time_taken INTEGER,
+    latest_rapid_total_questions INTEGER,
+    latest_rapid_at TIMESTAMP
+);
+
@@ -0,0 +1,11 @@
+-- One puzzle per user per day, assigned on the first /api/puzzles/daily call of the day
+-- (app/features/puzzles/assignments.py). The primary key serves the hot-path lookup.
+CREATE TABLE IF NOT EXISTS daily_puzzle_assignments (
+    user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    grade INTEGER,
+    puzzle_id INTEGER NOT NULL REFERENCES puzzles(puzzle_id) ON DELETE CASCADE,
+    assigned_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP,
+    PRIMARY KEY (user_id, day)
+);
@@ -0,0 +1,32 @@
+-- Content identity for the puzzle bank importer (app/features/puzzles/importer.py).
+-- jsonb text is canonical (key order and whitespace normalized), so equal content hashes equally.
+ALTER TABLE puzzles
+    ADD COLUMN IF NOT EXISTS content_hash TEXT GENERATED ALWAYS AS (md5(content::text)) STORED,
+    ADD COLUMN IF NOT EXISTS active BOOLEAN NOT NULL DEFAULT TRUE;
+
+-- Collapse existing duplicates onto the oldest row before enforcing uniqueness
+WITH dupes AS (
+    SELECT puzzle_id, MIN(puzzle_id) OVER (PARTITION BY grade, content_hash) AS keep_id
+    FROM puzzles
+)
+UPDATE puzzle_completions c SET puzzle_id = d.keep_id
+FROM dupes d
+WHERE c.puzzle_id = d.puzzle_id AND d.puzzle_id <> d.keep_id;
+
+WITH dupes AS (
+    SELECT puzzle_id, MIN(puzzle_id) OVER (PARTITION BY grade, content_hash) AS keep_id
+    FROM puzzles
+)
+UPDATE daily_puzzle_assignments a SET puzzle_id = d.keep_id
+FROM dupes d
+WHERE a.puzzle_id = d.puzzle_id AND d.puzzle_id <> d.keep_id;
+
+WITH dupes AS (
+    SELECT puzzle_id, MIN(puzzle_id) OVER (PARTITION BY grade, content_hash) AS keep_id
+    FROM puzzles
+)
+DELETE FROM puzzles p
+USING dupes d
+WHERE p.puzzle_id = d.puzzle_id AND d.puzzle_id <> d.keep_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_puzzles_grade_content_hash ON puzzles (grade, content_hash);
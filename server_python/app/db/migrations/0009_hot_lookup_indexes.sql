@@ -0,0 +1,26 @@
+-- Secondary indexes for the routers' hot lookups (checked by app/db/plan_check.py).
+-- Already covered elsewhere: users.firebase_uid and credentials.username (UNIQUE in schema.sql),
+-- puzzle_completions (user_id, completed_at) (UNIQUE in schema.sql), mentorship.mentor_id (0005).
+
+-- Reports of a user, newest first; reports saved by a parent for a child
+CREATE INDEX IF NOT EXISTS idx_reports_user_id_created_at ON reports (user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_reports_child_id ON reports ((report_json->>'childId'));
+
+-- Role profile of a user (identity resolution, dashboards)
+CREATE INDEX IF NOT EXISTS idx_students_user_id ON students (user_id);
+CREATE INDEX IF NOT EXISTS idx_parents_user_id ON parents (user_id);
+CREATE INDEX IF NOT EXISTS idx_teachers_user_id ON teachers (user_id);
+CREATE INDEX IF NOT EXISTS idx_students_parent_id ON students (parent_id);
+
+-- Phone lookups
+CREATE INDEX IF NOT EXISTS idx_students_phone_number ON students (phone_number);
+CREATE INDEX IF NOT EXISTS idx_parents_phone_number ON parents (phone_number);
+
+-- Students of a mentor / mentors of a student
+CREATE INDEX IF NOT EXISTS idx_mentorship_mentee_id ON mentorship (mentee_id);
+
+-- Puzzles a user has already solved (daily puzzle assignment)
+CREATE INDEX IF NOT EXISTS idx_puzzle_completions_user_puzzle ON puzzle_completions (user_id, puzzle_id);
+
+-- Admin student list ordering
+CREATE INDEX IF NOT EXISTS idx_users_created_at ON users (created_at DESC);
@@ -0,0 +1,44 @@
+-- Skill practice progress and session log, formerly created by the skill_practice handlers on every request
+CREATE TABLE IF NOT EXISTS skill_practice_progress (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER REFERENCES users(user_id),
+    report_id INTEGER NOT NULL,
+    day_number INTEGER NOT NULL,
+    category VARCHAR(255) NOT NULL,
+    assessment_completed BOOLEAN DEFAULT FALSE,
+    assessment_questions INTEGER DEFAULT 0,
+    assessment_correct INTEGER DEFAULT 0,
+    assessment_time_seconds INTEGER DEFAULT 0,
+    practice_count INTEGER DEFAULT 0,
+    total_practice_questions INTEGER DEFAULT 0,
+    total_practice_correct INTEGER DEFAULT 0,
+    total_practice_time_seconds INTEGER DEFAULT 0,
+    completed_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(user_id, report_id, day_number)
+);
+
+CREATE TABLE IF NOT EXISTS skill_practice_sessions (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER REFERENCES users(user_id),
+    report_id INTEGER NOT NULL,
+    day_number INTEGER NOT NULL,
+    category VARCHAR(255) NOT NULL,
+    session_type VARCHAR(20) NOT NULL DEFAULT 'practice',
+    questions_attempted INTEGER NOT NULL,
+    correct_answers INTEGER NOT NULL,
+    time_taken_seconds INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_skill_progress_user
+ON skill_practice_progress(user_id);
+
+CREATE INDEX IF NOT EXISTS idx_skill_progress_report
+ON skill_practice_progress(report_id);
+
+CREATE INDEX IF NOT EXISTS idx_skill_sessions_user
+ON skill_practice_sessions(user_id);
+
+CREATE INDEX IF NOT EXISTS idx_skill_sessions_report
+ON skill_practice_sessions(report_id);
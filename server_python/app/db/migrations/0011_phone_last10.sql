@@ -0,0 +1,13 @@
+-- Normalized phone key for the reports phone lookup (app/core/phone.py computes the same key
+-- from the searched number). Generated, so every writer (register, update_profile, add_child,
+-- imports) keeps it in sync and adding the column backfills existing rows.
+ALTER TABLE students
+    ADD COLUMN IF NOT EXISTS phone_last10 VARCHAR(10)
+    GENERATED ALWAYS AS (NULLIF(RIGHT(REGEXP_REPLACE(phone_number, '[^0-9]', '', 'g'), 10), '')) STORED;
+ALTER TABLE parents
+    ADD COLUMN IF NOT EXISTS phone_last10 VARCHAR(10)
+    GENERATED ALWAYS AS (NULLIF(RIGHT(REGEXP_REPLACE(phone_number, '[^0-9]', '', 'g'), 10), '')) STORED;
+
+-- Not unique: siblings can share a parent's number
+CREATE INDEX IF NOT EXISTS idx_students_phone_last10 ON students (phone_last10);
+CREATE INDEX IF NOT EXISTS idx_parents_phone_last10 ON parents (phone_last10);
@@ -0,0 +1,38 @@
+-- Typed copies of the report_json fields the dashboard, reports and skill practice routers
+-- filter and aggregate on. Generated, so save_report and any other writer keep them in sync
+-- and adding them backfills existing rows. Non-numeric summary values become NULL (the old
+-- CAST(... AS INTEGER) raised on them); the 1-9 digit bound keeps the ::int cast from overflowing.
+ALTER TABLE reports
+    ADD COLUMN IF NOT EXISTS report_type VARCHAR(10) GENERATED ALWAYS AS (
+        CASE
+            WHEN LOWER(COALESCE(report_json->>'type', 'standard')) IN ('rapid_math', 'rapid') THEN 'rapid'
+            WHEN LOWER(COALESCE(report_json->>'type', 'standard')) IN ('standard', 'quiz', 'assessment') THEN 'standard'
+            WHEN report_json->'summary' ? 'totalTime' THEN 'rapid'
+            ELSE 'standard'
+        END
+    ) STORED,
+    ADD COLUMN IF NOT EXISTS accuracy_percent INTEGER GENERATED ALWAYS AS (
+        CASE WHEN report_json->'summary'->>'accuracyPercent' ~ '^-?[0-9]{1,9}(\.[0-9]+)?$'
+             THEN TRUNC((report_json->'summary'->>'accuracyPercent')::numeric)::int END
+    ) STORED,
+    ADD COLUMN IF NOT EXISTS total_questions INTEGER GENERATED ALWAYS AS (
+        CASE WHEN report_json->'summary'->>'totalQuestions' ~ '^-?[0-9]{1,9}(\.[0-9]+)?$'
+             THEN TRUNC((report_json->'summary'->>'totalQuestions')::numeric)::int END
+    ) STORED,
+    ADD COLUMN IF NOT EXISTS total_time INTEGER GENERATED ALWAYS AS (
+        CASE WHEN report_json->'summary'->>'totalTime' ~ '^-?[0-9]{1,9}(\.[0-9]+)?$'
+             THEN TRUNC((report_json->'summary'->>'totalTime')::numeric)::int END
+    ) STORED,
+    ADD COLUMN IF NOT EXISTS child_id TEXT GENERATED ALWAYS AS (report_json->>'childId') STORED,
+    ADD COLUMN IF NOT EXISTS learning_plan_days INTEGER GENERATED ALWAYS AS (
+        CASE WHEN jsonb_typeof(report_json->'learningPlan') = 'array'
+             THEN jsonb_array_length(report_json->'learningPlan') END
+    ) STORED;
+
+-- Reports saved by a parent for a child (replaces the expression index from 0009)
+CREATE INDEX IF NOT EXISTS idx_reports_child_id_column ON reports (child_id);
+DROP INDEX IF EXISTS idx_reports_child_id;
+
+-- Admin stats: average and perfect-score count are answered from this index alone
+CREATE INDEX IF NOT EXISTS idx_reports_accuracy_percent ON reports (accuracy_percent)
+    WHERE accuracy_percent IS NOT NULL;
@@ -0,0 +1,38 @@
+-- Change counters behind the ETags of read-mostly GET endpoints (app/core/http_cache.py).
+-- A statement-level trigger counts every write statement on a tracked table, whoever runs it
+-- (any worker, scripts, ON DELETE CASCADE), so a table's version is SUM(version) over its rows
+-- and changes with every commit that wrote to it. The count is spread over 16 buckets picked
+-- by transaction id so concurrent writers rarely wait on (or deadlock over) the same row.
+CREATE TABLE IF NOT EXISTS data_versions (
+    table_name TEXT NOT NULL,
+    bucket SMALLINT NOT NULL,
+    version BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (table_name, bucket)
+);
+
+CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO data_versions AS v (table_name, bucket, version)
+    VALUES (TG_TABLE_NAME, (txid_current() % 16)::smallint, 1)
+    ON CONFLICT (table_name, bucket) DO UPDATE SET version = v.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY[
+        'neet_questions', 'neet_topic_counts',
+        'users', 'teachers', 'teaching', 'mentorship', 'credentials',
+        'students', 'reports'
+    ] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_data_version', t);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version()',
+            t || '_data_version', t
+        );
+    END LOOP;
+END $$;
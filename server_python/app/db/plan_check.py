@@ -0,0 +1,146 @@
+"""
+Fails when a hot router query can only be answered by a sequential scan.
+
+    python -m app.db.plan_check
+
+Each check EXPLAINs a query the routers really run, imported from their SQL constants rather
+than copied, with enable_seqscan off: the planner then uses any index able to serve the
+predicate, so a Seq Scan left on a checked table means no such index exists, whatever the
+table size. Exits non-zero on any regression.
+"""
+import asyncio
+import json
+import sys
+from typing import Any, Iterator, List, NamedTuple, Tuple
+from app.core.http_cache import TABLE_VERSIONS
+from app.core.identity import PARENT_OF_USER, STUDENT_OF_USER, USER_BY_UID
+from app.db.queries import queries
+from app.features.auth.router import CREDENTIAL_BY_USERNAME
+from app.features.neet.listing import FIRST_PAGE_KEY, LIST_QUERIES
+from app.features.puzzles.assignments import ASSIGN_SQL, TODAY_ASSIGNMENT_SQL
+from app.features.reports.router import REPORTS_OF_CHILD, REPORTS_OF_USER, USER_BY_PHONE
+from app.features.skill_practice.router import SESSION_HISTORY
+from app.features.teachers.router import teacher_list_sql
+
+
+class PlanCheck(NamedTuple):
+    name: str
+    query: str
+    args: Tuple[Any, ...]
+    tables: Tuple[str, ...]  # tables that must not be sequentially scanned
+
+
+CHECKS: List[PlanCheck] = [
+    PlanCheck(
+        "identity: user by firebase_uid",
+        queries.statements[USER_BY_UID],
+        ("uid",), ("users",),
+    ),
+    PlanCheck(
+        "identity: student of a user",
+        queries.statements[STUDENT_OF_USER],
+        (1,), ("students",),
+    ),
+    PlanCheck(
+        "identity: parent of a user",
+        queries.statements[PARENT_OF_USER],
+        (1,), ("parents",),
+    ),
+    PlanCheck(
+        "auth.login: credential by username",
+        queries.statements[CREDENTIAL_BY_USERNAME],
+        ("S123456",), ("credentials", "users"),
+    ),
+    PlanCheck(
+        "reports.get_reports: by user",
+        queries.statements[REPORTS_OF_USER],
+        (1,), ("reports",),
+    ),
+    PlanCheck(
+        "reports.get_reports: by child",
+        queries.statements[REPORTS_OF_CHILD],
+        (1, 2, "3"), ("reports",),
+    ),
+    PlanCheck(
+        "reports.get_reports: user by phone",
+        queries.statements[USER_BY_PHONE],
+        ("9876543210",), ("students", "parents"),
+    ),
+    PlanCheck(
+        "teachers.get_all_teachers: students and ticket code of each teacher",
+        teacher_list_sql(),
+        (50, 0), ("mentorship", "teaching", "credentials"),
+    ),
+    PlanCheck(
+        "puzzles.daily: today's assignment",
+        TODAY_ASSIGNMENT_SQL,
+        (1,), ("daily_puzzle_assignments", "puzzles"),
+    ),
+    PlanCheck(
+        "puzzles.daily: pick a puzzle not completed yet",
+        ASSIGN_SQL,
+        (1, 5), ("puzzle_completions", "daily_puzzle_assignments"),
+    ),
+    PlanCheck(
+        "neet.get_questions: topic page",
+        queries.statements[LIST_QUERIES[(True, False)]],
+        ("Biology", "Ecology", None, *FIRST_PAGE_KEY, 200), ("neet_questions",),
+    ),
+    PlanCheck(
+        "skill_practice.get_practice_sessions: history",
+        queries.statements[SESSION_HISTORY],
+        (1, 1, None, None, 50), ("skill_practice_sessions",),
+    ),
+    PlanCheck(
+        "http_cache: table versions behind an ETag",
+        queries.statements[TABLE_VERSIONS],
+        (["students", "users", "reports"],), ("data_versions",),
+    ),
+]
+
+
+def _seq_scans(plan: dict) -> Iterator[str]:
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan.get("Relation Name")
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+async def run_checks(conn, checks: List[PlanCheck] = CHECKS) -> List[str]:
+    """Returns one message per failing check (empty when every query is indexed)."""
+    failures = []
+    async with conn.transaction():
+        await conn.execute("SET LOCAL enable_seqscan = off")
+        for check in checks:
+            raw = await conn.fetchval("EXPLAIN (FORMAT JSON) " + check.query, *check.args)
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            scanned = sorted({t for t in _seq_scans(plan) if t in check.tables})
+            if scanned:
+                failures.append(f"{check.name}: sequential scan on {', '.join(scanned)}")
+    return failures
+
+
+async def main():
+    import asyncpg
+    from app.core.config import settings
+
+    conn = await asyncpg.connect(
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        database=settings.DB_NAME
+    )
+    try:
+        failures = await run_checks(conn)
+    finally:
+        await conn.close()
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print(f"{len(CHECKS) - len(failures)}/{len(CHECKS)} query plans use an index.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,95 @@
+"""
+Registry of the hot SQL statements the routers run.
+
+Each statement is declared once with a name:
+
+    USER_BY_UID = queries.register("identity.user_by_uid", "SELECT ... WHERE firebase_uid = $1")
+
+and run by name:
+
+    row = await queries.fetchrow(conn, USER_BY_UID, uid)
+
+Every name maps to one fixed SQL text, so asyncpg's per-connection statement cache
+(DB_STATEMENT_CACHE_SIZE, which must hold all registered statements) prepares each hot query
+once per connection and reuses it across pool checkouts; statements with optional filters are
+declared as a fixed set of canonical variants so that set stays small. The cache belongs to the
+connection rather than to a checkout, and asyncpg re-prepares entries invalidated by schema
+changes itself. The registry adds per-statement call counts and timings.
+"""
+import time
+import asyncpg
+from typing import Any, Dict, List, Optional
+
+
+class QueryTiming:
+    __slots__ = ("calls", "errors", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avgMs": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "maxMs": round(self.max_ms, 3),
+        }
+
+
+class QueryRegistry:
+
+    def __init__(self):
+        self.statements: Dict[str, str] = {}
+        self.timings: Dict[str, QueryTiming] = {}
+
+    def register(self, name: str, sql: str) -> str:
+        if self.statements.get(name, sql) != sql:
+            raise ValueError(f"Query {name!r} is already registered with different SQL")
+        self.statements[name] = sql
+        self.timings.setdefault(name, QueryTiming())
+        return name
+
+    async def _run(self, conn, name: str, method: str, args):
+        timing = self.timings[name]
+        started_at = time.perf_counter()
+        try:
+            return await getattr(conn, method)(self.statements[name], *args)
+        except Exception:
+            timing.errors += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            timing.calls += 1
+            timing.total_ms += elapsed_ms
+            timing.max_ms = max(timing.max_ms, elapsed_ms)
+
+    async def fetch(self, conn, name: str, *args) -> List[asyncpg.Record]:
+        return await self._run(conn, name, "fetch", args)
+
+    async def fetchrow(self, conn, name: str, *args) -> Optional[asyncpg.Record]:
+        return await self._run(conn, name, "fetchrow", args)
+
+    async def fetchval(self, conn, name: str, *args) -> Any:
+        return await self._run(conn, name, "fetchval", args)
+
+    async def execute(self, conn, name: str, *args) -> str:
+        return await self._run(conn, name, "execute", args)
+
+    def cursor(self, conn, name: str, *args, prefetch: int):
+        """Server-side cursor over a registered statement. Must be used inside a transaction."""
+        self.timings[name].calls += 1
+        return conn.cursor(self.statements[name], *args, prefetch=prefetch)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "registered": len(self.statements),
+            "statements": {
+                name: timing.stats() for name, timing in self.timings.items() if timing.calls
+            },
+        }
+
+
+queries = QueryRegistry()
@@ -1,11 +1,23 @@
 from fastapi import APIRouter, HTTPException, Depends, Body, Response, Request
 from app.core.database import get_db_pool
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import create_access_token
+from app.core.passwords import hasher
+from app.core.identity import identity
+from app.core.auth import Principal, get_current_user
+from app.db.queries import queries
+from app.features.dashboard.aggregates import dashboard_aggregates
 from typing import Dict, Any
 import uuid
 
 router = APIRouter()
 
+CREDENTIAL_BY_USERNAME = queries.register("auth.credential_by_username", """
+    SELECT c.user_id, c.password_hash, u.firebase_uid, u.role, u.name
+    FROM credentials c
+    JOIN users u ON c.user_id = u.user_id
+    WHERE c.username = $1
+""")
+
 
 from app.features.auth.schemas import UserRegisterRequest, LoginRequest, AdminLoginRequest
 
@@ -36,6 +48,9 @@ async def register(request: UserRegisterRequest):
 
     custom_id = generate_id(role)
 
+    # Hash before taking a connection so the pool is not held while bcrypt runs
+    pwd_hash = await hasher.hash(password)
+
     async with pool.acquire() as conn:
         async with conn.transaction():
             # Create User
@@ -46,7 +61,6 @@ async def register(request: UserRegisterRequest):
             )
 
             # Create Credentials with Custom ID as Username
-            pwd_hash = get_password_hash(password)
             await conn.execute(
                 "INSERT INTO credentials (user_id, username, password_hash, oauth_provider) VALUES ($1, $2, $3, 'custom')",
                 user_id, custom_id, pwd_hash
@@ -70,6 +84,7 @@ async def register(request: UserRegisterRequest):
                     user_id, email, phone
                 )
                 children = request.children or []
+                created_children = 0
                 if children:
                     for child in children:
                         child_name = child.get('name')
@@ -87,27 +102,33 @@ async def register(request: UserRegisterRequest):
                                  "INSERT INTO students (user_id, parent_id, grade, parent_name) VALUES ($1, $2, $3, $4)",
                                  child_user_id, parent_id, child_grade, name
                              )
+                             created_children += 1
             elif role == 'guest':
                  await conn.execute(
                     "INSERT INTO guests (user_id, email_id, phone_number) VALUES ($1, $2, $3)",
                     user_id, email, phone
                 )
 
-            # Generate Token
-            access_token = create_access_token(subject=new_uid)
-            
-            return {
-                "success": True, 
-                "token": access_token, 
-                "user": {
-                    "uid": new_uid,
-                    "name": name,
-                    "email": email,
-                    "role": role,
-                    "user_id": user_id,
-                    "username": custom_id # Return the Ticket ID
-                }
-            }
+    identity.remember_user(new_uid, user_id, role)
+    if role == 'student':
+        dashboard_aggregates.note_users(1, students=1)
+    elif role == 'parent':
+        dashboard_aggregates.note_users(1 + created_children, students=created_children)
+
+    # Generate Token
+    access_token = create_access_token(subject=new_uid)
+    return {
+        "success": True, 
+        "token": access_token, 
+        "user": {
+            "uid": new_uid,
+            "name": name,
+            "email": email,
+            "role": role,
+            "user_id": user_id,
+            "username": custom_id # Return the Ticket ID
+        }
+    }
 
 @router.post("/login")
 async def login(request: LoginRequest):
@@ -120,34 +141,52 @@ async def login(request: LoginRequest):
 
     async with pool.acquire() as conn:
         # Fetch Credential
-        cred_row = await conn.fetchrow(
-            """SELECT c.user_id, c.password_hash, u.firebase_uid, u.role, u.name 
-               FROM credentials c 
-               JOIN users u ON c.user_id = u.user_id 
-               WHERE c.username = $1""", 
-            email
-        )
-        
-        if not cred_row:
-             raise HTTPException(status_code=401, detail="Invalid credentials")
+        cred_row = await queries.fetchrow(conn, CREDENTIAL_BY_USERNAME, email)
         
-        if not verify_password(password, cred_row['password_hash']):
-             raise HTTPException(status_code=401, detail="Invalid credentials")
+    if not cred_row:
+         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-        # Generate Token
-        access_token = create_access_token(subject=cred_row['firebase_uid'])
-        
-        return {
-            "success": True, 
-            "token": access_token, 
-            "user": {
-                "uid": cred_row['firebase_uid'],
-                "name": cred_row['name'],
-                "email": email,
-                "role": cred_row['role'],
-                "user_id": cred_row['user_id']
-            }
+    # Verified off the event loop and without holding a pool connection
+    valid, new_hash = await hasher.verify_and_update(password, cred_row['password_hash'])
+    if not valid:
+         raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    # Stored with an outdated cost factor: upgrade it now that we have the plain password
+    if new_hash:
+        async with pool.acquire() as conn:
+            await conn.execute(
+                "UPDATE credentials SET password_hash = $1 WHERE username = $2 AND password_hash = $3",
+                new_hash, email, cred_row['password_hash']
+            )
+
+    # Generate Token
+    access_token = create_access_token(subject=cred_row['firebase_uid'])
+    identity.invalidate(uid=cred_row['firebase_uid'], user_id=cred_row['user_id'])
+    identity.remember_user(cred_row['firebase_uid'], cred_row['user_id'], cred_row['role'])
+
+    return {
+        "success": True, 
+        "token": access_token, 
+        "user": {
+            "uid": cred_row['firebase_uid'],
+            "name": cred_row['name'],
+            "email": email,
+            "role": cred_row['role'],
+            "user_id": cred_row['user_id']
+        }
+    }
+
+@router.get("/me")
+async def get_me(principal: Principal = Depends(get_current_user)):
+    """The user behind the bearer token (served from the token and identity caches when warm)."""
+    return {
+        "success": True,
+        "user": {
+            "uid": principal.uid,
+            "role": principal.role,
+            "user_id": principal.user_id
         }
+    }
 
 from app.features.auth.schemas import GoogleLoginRequest
 
@@ -172,6 +211,7 @@ async def google_login(request: GoogleLoginRequest):
                 role = user_row['role']
                 # Generate Token
                 access_token = create_access_token(subject=uid)
+                identity.remember_user(uid, user_id, role)
                 return {
                     "success": True,
                     "token": access_token,
@@ -202,6 +242,7 @@ async def google_login(request: GoogleLoginRequest):
                 
                 # Generate Token
                 access_token = create_access_token(subject=uid)
+                identity.remember_user(uid, user_id, role)
                 
                 return {
                     "success": True,
@@ -0,0 +1,197 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.core.database import get_db_pool
+
+STUDENT_COUNT_SQL = "SELECT COUNT(*) FROM students"
+
+# Overall score figures (accuracy_percent is the typed column from migration 0012)
+REPORT_TOTALS_SQL = """
+    SELECT COUNT(*) AS reports,
+           COUNT(accuracy_percent) AS scored,
+           COALESCE(SUM(accuracy_percent), 0) AS score_sum,
+           COUNT(*) FILTER (WHERE accuracy_percent = 100) AS perfect
+    FROM reports
+"""
+
+# Marks by grade: reports saved by a student's own user
+GRADE_MARKS_SQL = """
+    SELECT s.grade, SUM(r.accuracy_percent) AS score_sum, COUNT(*) AS scored
+    FROM reports r
+    JOIN students s ON r.user_id = s.user_id
+    WHERE r.accuracy_percent IS NOT NULL
+    GROUP BY s.grade
+"""
+
+USER_GROWTH_SQL = """
+    SELECT TO_CHAR(created_at, 'YYYY-MM') as month, COUNT(*) as count
+    FROM users
+    WHERE role = 'student' OR role = 'parent'
+    GROUP BY month
+"""
+
+
+class DashboardAggregates:
+    """
+    In-memory totals behind GET /api/dashboard/admin/stats and /admin/charts: counters,
+    per-grade score sums/counts and per-month user sign-ups.
+
+    Writers in this process apply their change as they commit (note_report, note_users),
+    so a page view is served from memory without touching the tables. A background task
+    reconciles everything from the database every refresh_seconds, picking up other workers'
+    writes and changes that are not reported (grade edits, deletes); a read finding the
+    totals older than max_staleness_seconds reconciles first. Served figures are therefore
+    never more than max_staleness_seconds behind another worker's writes.
+    """
+
+    def __init__(self, refresh_seconds: float, max_staleness_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.max_staleness_seconds = max_staleness_seconds
+        self.loaded_at: Optional[float] = None
+        self.students = 0
+        self.reports = 0
+        self.scored = 0
+        self.score_sum = 0
+        self.perfect = 0
+        self.grades: Dict[str, List[int]] = {}  # grade -> [score_sum, scored]
+        self.growth: Dict[str, int] = {}        # 'YYYY-MM' -> student/parent users created
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self.reconciles = 0
+        self.incremental_updates = 0
+        self.total_reconcile_ms = 0.0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                print(f"Dashboard aggregates reconcile failed: {e}")
+            await asyncio.sleep(self.refresh_seconds)
+
+    def age(self) -> Optional[float]:
+        return None if self.loaded_at is None else time.monotonic() - self.loaded_at
+
+    def invalidate(self):
+        """Force a reconcile on the next read (e.g. after a delete)."""
+        self.loaded_at = None
+
+    async def reconcile(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        started_at = time.monotonic()
+        async with self._lock:
+            # Another caller reconciled while this one waited
+            if self.loaded_at is not None and self.loaded_at >= started_at:
+                return
+            pool = await get_db_pool()
+            async with pool.acquire() as conn:
+                async with conn.transaction(isolation='repeatable_read', readonly=True):
+                    students = await conn.fetchval(STUDENT_COUNT_SQL)
+                    totals = await conn.fetchrow(REPORT_TOTALS_SQL)
+                    grade_rows = await conn.fetch(GRADE_MARKS_SQL)
+                    growth_rows = await conn.fetch(USER_GROWTH_SQL)
+
+            self.students = students
+            self.reports = totals['reports']
+            self.scored = totals['scored']
+            self.score_sum = totals['score_sum']
+            self.perfect = totals['perfect']
+            self.grades = {r['grade']: [r['score_sum'], r['scored']] for r in grade_rows}
+            self.growth = {r['month']: r['count'] for r in growth_rows}
+            self.loaded_at = time.monotonic()
+            self.reconciles += 1
+            self.total_reconcile_ms += (self.loaded_at - started_at) * 1000
+
+    async def _fresh(self):
+        age = self.age()
+        if age is None or age > self.max_staleness_seconds:
+            await self.reconcile()
+
+    def note_report(self, accuracy_percent: Optional[int], grade: Optional[str]):
+        """A report was saved (call after commit). grade: the saving user's student grade, as GRADE_MARKS_SQL credits it."""
+        if self.loaded_at is None:
+            return
+        self.incremental_updates += 1
+        self.reports += 1
+        if accuracy_percent is None:
+            return
+        self.scored += 1
+        self.score_sum += accuracy_percent
+        if accuracy_percent == 100:
+            self.perfect += 1
+        if grade is not None:
+            totals = self.grades.setdefault(grade, [0, 0])
+            totals[0] += accuracy_percent
+            totals[1] += 1
+
+    def note_users(self, users: int, students: int = 0):
+        """`users` student/parent users and `students` student rows were created (call after commit)."""
+        if self.loaded_at is None:
+            return
+        self.incremental_updates += 1
+        self.students += students
+        if users:
+            month = datetime.now().strftime('%Y-%m')
+            self.growth[month] = self.growth.get(month, 0) + users
+
+    async def admin_stats(self) -> Dict[str, Any]:
+        await self._fresh()
+        avg_score = round(self.score_sum / self.scored) if self.scored else 0
+        return {
+            "totalStudents": self.students,
+            "totalReports": self.reports,
+            "totalPassed": f"{avg_score}%",
+            "totalPerfectScores": self.perfect
+        }
+
+    async def admin_charts(self) -> Dict[str, Any]:
+        await self._fresh()
+        marks_by_grade = [
+            {"name": grade, "avg": round(score_sum / scored)}
+            for grade, (score_sum, scored) in sorted(self.grades.items(), key=lambda item: str(item[0]))
+            if grade and scored
+        ]
+
+        student_growth = []
+        cumulative = 0
+        for month in sorted(self.growth):
+            cumulative += self.growth[month]
+            student_growth.append({"name": month, "students": cumulative})
+
+        return {
+            "marksByGrade": marks_by_grade,
+            "studentGrowth": student_growth
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        age = self.age()
+        return {
+            "ageSeconds": round(age, 3) if age is not None else None,
+            "refreshSeconds": self.refresh_seconds,
+            "maxStalenessSeconds": self.max_staleness_seconds,
+            "reconciles": self.reconciles,
+            "incrementalUpdates": self.incremental_updates,
+            "avgReconcileMs": round(self.total_reconcile_ms / self.reconciles, 3) if self.reconciles else 0.0,
+        }
+
+
+dashboard_aggregates = DashboardAggregates(
+    refresh_seconds=settings.DASHBOARD_AGGREGATES_REFRESH_SECONDS,
+    max_staleness_seconds=settings.DASHBOARD_AGGREGATES_MAX_STALENESS_SECONDS,
+)
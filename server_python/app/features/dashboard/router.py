@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
 from typing import Optional, Dict, Any, List
-import json
 from app.core.database import get_db_pool
+from app.core.http_cache import http_cache
+from app.core.responses import ORJSONResponse
+from app.features.reports.summary import REPORT_FIELDS_SQL
+from .aggregates import dashboard_aggregates
 
 router = APIRouter()
 
@@ -94,7 +97,9 @@ async def get_teacher_students(uid: str, grade: Optional[str] = None):
         
         return students
 
-@router.get("/teacher/student-detail")
+@router.get("/teacher/student-detail", dependencies=[http_cache.versioned(
+    "dashboard.teacher_student_detail", tables=["students", "users", "reports"]
+)])
 async def get_teacher_student_detail(uid: str, studentUid: str, childId: str):
     """
     Get detailed student data for teacher view.
@@ -136,13 +141,7 @@ async def get_teacher_student_detail(uid: str, studentUid: str, childId: str):
         # Process reports into the format expected by TeacherStudentView
         reports = {}
         for r in reports_raw:
-            data = r['report_json']
-            if isinstance(data, str):
-                try:
-                    data = json.loads(data)
-                except:
-                    data = {}
-            
+            data = r['report_json'] if isinstance(r['report_json'], dict) else {}
             report_key = str(r['report_id'])
             reports[report_key] = {
                 **data,
@@ -151,10 +150,11 @@ async def get_teacher_student_detail(uid: str, studentUid: str, childId: str):
                 "category": r['category']
             }
         
-        return {
+        # Built from plain values only: serialized once by orjson, without jsonable_encoder
+        return ORJSONResponse({
             "studentInfo": student_info,
             "reports": reports if reports else None
-        }
+        })
 
 # -----------------------------------------------------------------------------
 # STUDENT DASHBOARD
@@ -180,276 +180,129 @@ async def get_student_dashboard(uid: str):
 # ADMIN DASHBOARD
 # -----------------------------------------------------------------------------
 
+def _aggregates_age_header(response: Response):
+    # Seconds since the served totals were reconciled (bounded by DASHBOARD_AGGREGATES_MAX_STALENESS_SECONDS)
+    response.headers["X-Data-Age"] = str(int(dashboard_aggregates.age() or 0))
+
+
 @router.get("/admin/stats")
-async def get_admin_stats():
-    pool = await get_db_pool()
-    async with pool.acquire() as conn:
-        total_students = await conn.fetchval("SELECT COUNT(*) FROM students")
-        total_reports = await conn.fetchval("SELECT COUNT(*) FROM reports")
-        
-        # Calculate Average Score (approximate for now, assuming reports have score field extractable or we scan)
-        # Postgres JSONB allows extraction. assuming report_json->'summary'->>'accuracyPercent'
-        avg_score_row = await conn.fetchrow("""
-            SELECT AVG(CAST(report_json->'summary'->>'accuracyPercent' AS INTEGER)) as avg_score
-            FROM reports 
-            WHERE report_json->'summary'->>'accuracyPercent' IS NOT NULL
-        """)
-        avg_score = round(avg_score_row['avg_score']) if avg_score_row and avg_score_row['avg_score'] else 0
-        
-        # Perfect Scores
-        perfect_scores = await conn.fetchval("""
-            SELECT COUNT(*)
-            FROM reports 
-            WHERE CAST(report_json->'summary'->>'accuracyPercent' AS INTEGER) = 100
-        """) or 0
-        
-        return {
-            "totalStudents": total_students,
-            "totalReports": total_reports,
-            "totalPassed": f"{avg_score}%",
-            "totalPerfectScores": perfect_scores
-        }
+async def get_admin_stats(response: Response):
+    """Served from memory by dashboard_aggregates."""
+    stats = await dashboard_aggregates.admin_stats()
+    _aggregates_age_header(response)
+    return stats
 
 @router.get("/admin/students")
 async def get_admin_students(skip: int = 0, limit: int = 50):
+    """
+    Admin student list. Report stats come from student_report_summary; report bodies
+    are not included, load them with /admin/students/{child_id}/history and /api/reports/{id}.
+    """
     pool = await get_db_pool()
     async with pool.acquire() as conn:
         # Fetch students with some details
-        # Using LEFT JOIN on parents to get fallback phone number and email, AND parent user_id
+        # Using LEFT JOIN on parents to get fallback phone number and email
+        # Credentials on the student's own user mean Email/Pass sign-in, otherwise Google/Phone
         rows = await conn.fetch("""
             SELECT s.*, u.created_at, u.firebase_uid, u.role, u.name as user_name, 
                    COALESCE(s.phone_number, p.phone_number) as resolved_phone,
                    p.email_id as parent_email,
-                   p.user_id as parent_user_id,
                    sc.username as student_ticket,
-                   pc.username as parent_ticket
+                   pc.username as parent_ticket,
+                   sc.user_id IS NOT NULL as has_credentials,
+                   rs.standard_count, rs.latest_standard_report_id, rs.latest_standard_marks, rs.latest_standard_at,
+                   rs.latest_rapid_report_id, rs.latest_rapid_marks, rs.latest_rapid_time_taken,
+                   rs.latest_rapid_total_questions, rs.latest_rapid_at
             FROM students s
             JOIN users u ON s.user_id = u.user_id
             LEFT JOIN parents p ON s.parent_id = p.parent_id
             LEFT JOIN credentials sc ON s.user_id = sc.user_id
             LEFT JOIN credentials pc ON p.user_id = pc.user_id
+            LEFT JOIN student_report_summary rs ON rs.student_id = s.student_id
             ORDER BY u.created_at DESC
             OFFSET $1 LIMIT $2
         """, skip, limit)
         
-        student_ids = [r['student_id'] for r in rows]
-        student_ids_set = set(student_ids) # For fast lookup
-        
-        student_user_map = {}
-        reports_map = {}
-        rapid_map = {}
-        count_map = {}
-        student_history = {} # Added initialization
-
-        if student_ids:
-             # Get user_ids for these students to query reports DIRECTLY
-            student_user_map_rows = await conn.fetch("SELECT student_id, user_id FROM students WHERE student_id = ANY($1::int[])", student_ids)
-            student_user_map = {r['user_id']: r['student_id'] for r in student_user_map_rows}
-            
-            # Also get parent user_ids to query reports INDIRECTLY
-            parent_user_ids = set()
-            for r in rows:
-                if r['parent_user_id']:
-                    parent_user_ids.add(r['parent_user_id'])
-            
-            # Combine all relevant user IDs
-            all_target_user_ids = list(set(student_user_map.keys()) | parent_user_ids)
+    students = []
+    for r in rows:
+        # ID Selection Priority: 
+        # 1. Student's Ticket (Direct)
+        # 2. Parent's Ticket (Managed)
+        # 3. Firebase UID (Google)
+        # 4. Fallback User ID
+        display_id = r['student_ticket'] or r['parent_ticket'] or r['firebase_uid'] or str(r['user_id'])
 
-            # Fetch all reports to process in Python for accurate counts and classification
-            all_reports = await conn.fetch("""
-                SELECT user_id, report_json, created_at, report_id,
-                       COALESCE(report_json->>'type', 'standard') as report_type
-                FROM reports
-                WHERE user_id = ANY($1::int[])
-                ORDER BY created_at DESC
-            """, all_target_user_ids)
+        rapid_math = None
+        if r['latest_rapid_report_id']:
+            rapid_math = {
+                "marks": r['latest_rapid_marks'],
+                "timeTaken": r['latest_rapid_time_taken'] or 0,
+                "totalQuestions": r['latest_rapid_total_questions'],
+                "date": r['latest_rapid_at'].isoformat(),
+                "reportId": r['latest_rapid_report_id']
+            }
 
-            for r in all_reports:
-                sid = None
-                
-                # Check 1: Direct Link (User ID matches Student User ID)
-                if r['user_id'] in student_user_map:
-                    sid = student_user_map[r['user_id']]
-                
-                data = r['report_json']
-                if isinstance(data, str):
-                    try:
-                        data = json.loads(data)
-                    except:
-                        data = {}
-                
-                # Check 2: Indirect Link (via childId in JSON, stored under Parent)
-                if sid is None:
-                    child_id = data.get('childId')
-                    # Ensure integer comparison if child_id exists
-                    if child_id is not None:
-                        try:
-                            child_id_int = int(child_id)
-                            if child_id_int in student_ids_set:
-                                sid = child_id_int
-                        except:
-                            pass
-                
-                # If still no SID, skip this report (it's a parent's personal report or unrelated)
-                if sid is None:
-                    continue
+        students.append({
+            "id": display_id,
+            "name": r['user_name'] or r.get('name', 'Unknown'), # Prefer user name from join
+            "childId": str(r['student_id']),
+            "grade": r['grade'],
+            "school": r['school'],
+            "email": r['email_id'] or r['parent_email'], # Try student email then parent fallback
+            "phoneNumber": r['resolved_phone'], 
+            "joinedAt": r['created_at'].isoformat() if r['created_at'] else None,
+            "attemptCount": r['standard_count'] or 0, # Standard attempts only
+            "marks": r['latest_standard_marks'], 
+            "date": r['latest_standard_at'].isoformat() if r['latest_standard_at'] else None, # Latest report date
+            "reportId": r['latest_standard_report_id'],
+            "rapidMath": rapid_math,
+            "authProvider": 'Email' if r['has_credentials'] else 'Google'
+        })
 
-                # ... (rest of processing logic) ...
-                
-                rtype = r['report_type'].lower() if r['report_type'] else 'standard'
-                summary = data.get('summary', {})
-                is_rapid_content = 'totalTime' in summary
-                
-                # Check for explicit Standard types
-                # Using 'assessment' because debug output showed it
-                is_explicit_standard = rtype in ['standard', 'quiz', 'assessment']
-                
-                # Determine Types
-                # Only use heuristic if NOT explicitly standard
-                is_rapid = False
-                if rtype in ['rapid_math', 'rapid', 'rapid_math']:
-                     is_rapid = True
-                elif not is_explicit_standard and is_rapid_content:
-                     is_rapid = True
-                
-                # Initialize lists/counters
-                if sid not in student_history: student_history[sid] = []
-                if sid not in count_map: count_map[sid] = {'standard': 0, 'rapid': 0}
-                
-                hist_type = 'rapid' if is_rapid else 'standard'
-                
-                # Update Counts
-                count_map[sid][hist_type] += 1
-                
-                # Update Latest Reports (First one encountered is latest due to DESC sort)
-                if hist_type == 'standard' and sid not in reports_map:
-                    reports_map[sid] = {
-                        "marks": int(summary.get('accuracyPercent', 0)),
-                        "date": r['created_at'].isoformat(),
-                        "topicFeedback": data.get('topicFeedback', {}),
-                        "learningPlan": data.get('learningPlan', []),
-                        "perQuestionReport": data.get('perQuestionReport', []),
-                        "summary": summary
-                    }
-                elif hist_type == 'rapid' and sid not in rapid_map:
-                    rapid_map[sid] = {
-                        "marks": int(summary.get('accuracyPercent', 0)),
-                        "timeTaken": int(summary.get('totalTime', 0)),
-                        "totalQuestions": int(summary.get('totalQuestions', 0)),
-                        "date": r['created_at'].isoformat(),
-                        "report": data 
-                    }
+    return ORJSONResponse(students)
 
-                student_history[sid].append({
-                    "type": hist_type,
-                    "date": r['created_at'].isoformat(),
-                    "marks": int(summary.get('accuracyPercent', 0)),
-                    "totalQuestions": int(summary.get('totalQuestions', 0)),
-                    "timeTaken": int(summary.get('totalTime', 0)) if 'totalTime' in summary else None,
-                    "reportId": r.get('report_id'), 
-                    "childId": str(sid),
-                    "summary": summary,
-                    "perQuestionReport": data.get('perQuestionReport', []),
-                    "topicFeedback": data.get('topicFeedback', {}),
-                    "learningPlan": data.get('learningPlan', []),
-                    "rapidMath": {
-                        "marks": int(summary.get('accuracyPercent', 0)),
-                        "date": r['created_at'].isoformat(),
-                        "timeTaken": int(summary.get('totalTime', 0)) if 'totalTime' in summary else 0,
-                        "totalQuestions": int(summary.get('totalQuestions', 0)),
-                        "report": data
-                    } if hist_type == 'rapid' else None
-                })
+@router.get("/admin/students/{child_id}/history")
+async def get_admin_student_history(child_id: int):
+    """
+    Report history of one student, newest first, without report bodies
+    (fetch a body with /api/reports/{reportId}). Attribution matches student_report_summary.
+    """
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        owner = await conn.fetchrow("""
+            SELECT s.user_id, p.user_id as parent_user_id
+            FROM students s
+            LEFT JOIN parents p ON s.parent_id = p.parent_id
+            WHERE s.student_id = $1
+        """, child_id)
+        if not owner:
+            raise HTTPException(status_code=404, detail="Student not found")
 
-        # Get Credentials Map to determine Auth Provider
-        # If user_id is in credentials table, they have Email/Pass. If not, they are Google/Phone only.
-        # But we need to check specifically.
-        user_ids_for_creds = [r['user_id'] for r in rows]
-        
-        creds_rows = await conn.fetch("SELECT user_id FROM credentials WHERE user_id = ANY($1::int[])", user_ids_for_creds)
-        email_user_ids = set(r['user_id'] for r in creds_rows)
-        
-        students = []
-        for r in rows:
-            sid = r['student_id']
-            # User ID calculation needs to handle potential missing user_id if logic was looser, but our query ensures it.
-            uid_int = r['user_id']
-            
-            std_data = reports_map.get(sid, {})
-            rapid_data = rapid_map.get(sid, {})
-            hist = student_history.get(sid, [])
-            
-            # Sort history by date desc
-            hist.sort(key=lambda x: x['date'], reverse=True)
-            
-            # Safe get counts
-            counts = count_map.get(sid, {'standard': 0, 'rapid': 0})
-            
-            # Auth Provider Logic
-            if uid_int in email_user_ids:
-                auth_provider = 'Email'
-            else:
-                auth_provider = 'Google'
-            
-            # ID Selection Priority: 
-            # 1. Student's Ticket (Direct)
-            # 2. Parent's Ticket (Managed)
-            # 3. Firebase UID (Google)
-            # 4. Fallback User ID
-            display_id = r['student_ticket'] or r['parent_ticket'] or r['firebase_uid'] or str(r['user_id'])
+        rows = await conn.fetch(f"""
+            SELECT report_id, created_at, {REPORT_FIELDS_SQL}
+            FROM reports
+            WHERE user_id = $1
+            OR (user_id = $2 AND child_id = $3
+                AND NOT EXISTS (SELECT 1 FROM students WHERE user_id = $2))
+            ORDER BY created_at DESC, report_id DESC
+        """, owner['user_id'], owner['parent_user_id'], str(child_id))
 
-            students.append({
-                "id": display_id,
-                "name": r['user_name'] or r.get('name', 'Unknown'), # Prefer user name from join
-                "childId": str(r['student_id']),
-                "grade": r['grade'],
-                "school": r['school'],
-                "email": r['email_id'] or r['parent_email'], # Try student email then parent fallback
-                "phoneNumber": r['resolved_phone'], 
-                "joinedAt": r['created_at'].isoformat() if r['created_at'] else None,
-                "attemptCount": counts.get('standard', 0), # Standard attempts only
-                "marks": std_data.get('marks'), 
-                "date": std_data.get('date'), # Latest report date
-                "topicFeedback": std_data.get('topicFeedback'), 
-                "learningPlan": std_data.get('learningPlan'),
-                "summary": std_data.get('summary'),
-                "perQuestionReport": std_data.get('perQuestionReport'),
-                "rapidMath": rapid_data if rapid_data else None,
-                "history": hist,
-                "authProvider": auth_provider 
-            })
-            
-        return students
+    return [
+        {
+            "type": r['kind'],
+            "date": r['created_at'].isoformat(),
+            "marks": r['marks'],
+            "totalQuestions": r['total_questions'],
+            "timeTaken": r['time_taken'],
+            "reportId": r['report_id'],
+            "childId": str(child_id)
+        }
+        for r in rows
+    ]
 
 @router.get("/admin/charts")
-async def get_admin_charts():
-    pool = await get_db_pool()
-    async with pool.acquire() as conn:
-        marks_rows = await conn.fetch("""
-            SELECT s.grade, AVG(CAST(r.report_json->'summary'->>'accuracyPercent' AS INTEGER)) as avg_mark
-            FROM reports r
-            JOIN students s ON r.user_id = s.user_id 
-            WHERE r.report_json->'summary'->>'accuracyPercent' IS NOT NULL
-            GROUP BY s.grade
-        """)
-        
-        marks_by_grade = [{"name": r['grade'], "avg": round(r['avg_mark'])} for r in marks_rows if r['grade']]
-        
-        growth_rows = await conn.fetch("""
-            SELECT TO_CHAR(created_at, 'YYYY-MM') as month, COUNT(*) as count
-            FROM users 
-            WHERE role = 'student' OR role = 'parent'
-            GROUP BY month
-            ORDER BY month
-        """)
-        
-        student_growth = []
-        cumulative = 0
-        for r in growth_rows:
-            cumulative += r['count']
-            student_growth.append({"name": r['month'], "students": cumulative})
-            
-        return {
-            "marksByGrade": marks_by_grade,
-            "studentGrowth": student_growth
-        }
+async def get_admin_charts(response: Response):
+    """Served from memory by dashboard_aggregates."""
+    charts = await dashboard_aggregates.admin_charts()
+    _aggregates_age_header(response)
+    return charts
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Body
 from app.core.database import get_db_pool
+from app.core.identity import identity
 from typing import Dict, Any
-import json
 
 router = APIRouter()
 
@@ -30,7 +30,7 @@ async def register_lottery(payload: Dict[str, Any] = Body(...)):
         # Note: The frontend sends 'uid' which might be the Firebase UID or the new PG-based ID depending on what registerAuth returns.
         # In the new system, `registerAuth` returns `user.uid` which is the `firebase_uid` column in users table.
         
-        user_id = await conn.fetchval("SELECT user_id FROM users WHERE firebase_uid = $1", uid)
+        user_id = await identity.get_user_id(conn, uid)
         
         if not user_id:
              # Fallback: If for some reason the user isn't found (maybe async delay?), we might error.
@@ -38,11 +38,10 @@ async def register_lottery(payload: Dict[str, Any] = Body(...)):
              # Yes, 'registerAuth' was called first.
              raise HTTPException(status_code=404, detail="User not found for lottery registration")
              
-        # Insert into lottery_registrations - serialize payload to JSON string for 'data' column
-        data_json = json.dumps(payload)
+        # Insert into lottery_registrations - the jsonb codec serializes payload for the 'data' column
         await conn.execute("""
             INSERT INTO lottery_registrations (user_id, ticket_code, user_type, data)
             VALUES ($1, $2, $3, $4)
-        """, user_id, ticket_code, user_type, data_json)
+        """, user_id, ticket_code, user_type, payload)
         
     return {"success": True, "message": "Lottery registration saved"}
@@ -0,0 +1,77 @@
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException
+from app.db.queries import queries
+
+# Question payload built in SQL and returned as JSON text, so rows are never decoded in Python.
+# Same shape as before: id first (overridable by content), then content, then row metadata.
+QUESTION_PAYLOAD_SQL = """
+    (jsonb_build_object('id', id::text)
+     || question_content
+     || jsonb_build_object(
+         'topic', topic, 'subTopic', sub_topic, 'questionType', question_type, 'createdAt', created_at
+     ))::text
+"""
+
+
+def encode_cursor(created_at: datetime, question_id: int) -> str:
+    """Opaque keyset cursor for the (created_at, id) position of the last row returned."""
+    raw = f"{created_at.isoformat()}|{question_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, question_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(question_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _register_list_query(name: str, filters: str) -> str:
+    return queries.register(f"neet.list_questions.{name}", f"""
+        SELECT id, created_at, {QUESTION_PAYLOAD_SQL} AS payload
+        FROM neet_questions
+        WHERE subject_key = LOWER(BTRIM($1))
+        AND jsonb_typeof(question_content) = 'object'
+        {filters}
+        AND (created_at, id) < ($4, $5)
+        ORDER BY created_at DESC, id DESC
+        LIMIT $6
+    """)
+
+
+# One canonical statement per filter combination, keyed by (topic given, sub_topic given).
+# Parameters are always ($1 subject, $2 topic, $3 sub_topic, $4/$5 cursor, $6 limit); unused
+# filters are bound as NULL (and typed via IS NULL so the statement prepares), a missing cursor
+# starts above every row and LIMIT NULL means no limit.
+LIST_QUERIES = {
+    (False, False): _register_list_query("subject", "AND $2::text IS NULL AND $3::text IS NULL"),
+    (True, False): _register_list_query("topic", "AND topic_key = LOWER(BTRIM($2)) AND $3::text IS NULL"),
+    (False, True): _register_list_query("sub_topic", "AND $2::text IS NULL AND sub_topic_key = LOWER(BTRIM($3))"),
+    (True, True): _register_list_query(
+        "topic_sub_topic", "AND topic_key = LOWER(BTRIM($2)) AND sub_topic_key = LOWER(BTRIM($3))"
+    ),
+}
+
+# Start position when no cursor is given: later than any stored (created_at, id)
+FIRST_PAGE_KEY = (datetime.max, 2 ** 31 - 1)
+
+
+def build_list_query(
+    subject: str,
+    topic: Optional[str],
+    sub_topic: Optional[str],
+    cursor: Optional[str],
+    limit: Optional[int]
+) -> Tuple[str, List[Any]]:
+    """
+    Newest-first listing in (created_at DESC, id DESC) order, as (registered query name, params).
+    Continuing after a cursor is a row comparison against the last returned key, served by the
+    idx_neet_questions_*listing indexes, so every page costs the same regardless of how deep it is.
+    """
+    created_at, question_id = decode_cursor(cursor) if cursor else FIRST_PAGE_KEY
+    name = LIST_QUERIES[(bool(topic), bool(sub_topic))]
+    return name, [subject, topic or None, sub_topic or None, created_at, question_id, limit]
@@ -0,0 +1,124 @@
+"""
+Display rendering for NEET questions.
+
+Questions are rendered once when they are written (upload, save, update) and the
+result is stored in neet_questions.rendered_content, so assessment generation only
+streams stored JSON. Re-render existing rows after changing this module:
+
+    python -m app.features.neet.render          # rows that have never been rendered
+    python -m app.features.neet.render --all    # every row
+"""
+import asyncio
+import sys
+from typing import Any, Dict, Optional
+
+# Rows per re-render round trip
+RERENDER_BATCH_SIZE = 500
+
+
+def render_question(content: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns a copy of the stored question whose 'question' field is display-ready HTML
+    (assertion/reason, statement-based and match-pairs layouts, newlines as <br/>).
+    """
+    q_data = dict(content)
+
+    if 'assertion' in q_data and 'reason' in q_data:
+        q_data['question'] = (
+            f"<div class='assertion-reason'>"
+            f"<p><strong>Assertion:</strong> {q_data['assertion']}</p>"
+            f"<p><strong>Reason:</strong> {q_data['reason']}</p>"
+            f"</div>"
+        )
+    elif any(k.startswith('statement') for k in q_data.keys()):
+        stmts = sorted([k for k in q_data.keys() if k.startswith('statement')])
+        html_parts = []
+        for idx, s_key in enumerate(stmts):
+            label = f"Statement {idx + 1}"
+            html_parts.append(f"<p class='mb-2'><strong>{label}:</strong> {q_data[s_key]}</p>")
+        q_data['question'] = f"<div class='statement-based'>{''.join(html_parts)}</div>"
+    elif 'pairs' in q_data:
+        pairs_html = "<div class='match-pairs'><table class='w-full border-collapse border border-gray-300'>"
+        for p in q_data['pairs'] or []:
+            if isinstance(p, dict):
+                c1 = p.get('col1') or p.get('column1') or ''
+                c2 = p.get('col2') or p.get('column2') or ''
+            else:
+                c1 = p[0] if len(p) > 0 else ''
+                c2 = p[1] if len(p) > 1 else ''
+            pairs_html += f"<tr><td class='p-2 border border-gray-300'>{c1}</td><td class='p-2 border border-gray-300'>{c2}</td></tr>"
+        pairs_html += "</table></div>"
+        q_data['question'] = pairs_html
+
+    # Standard text handling (MCQ, PYQ, or Statement with 'question' field)
+    if q_data.get('question'):
+        # Replace newlines with breaks for display
+        q_data['question'] = str(q_data['question']).replace('\n', '<br/>')
+    else:
+        # Fallback if specific keys missing AND question missing
+        q_data['question'] = "<p class='text-red-500'>[Question content missing]</p>"
+
+    return q_data
+
+
+def render_stored_question(content: Any) -> Optional[Dict[str, Any]]:
+    """render_question for stored question_content (decoded by the jsonb codec); None if there is nothing to render."""
+    if not content or not isinstance(content, dict):
+        return None
+    return render_question(content)
+
+
+async def rerender_questions(conn, only_missing: bool = True) -> int:
+    """Re-renders stored questions in id order, one batch per round trip."""
+    last_id = 0
+    total = 0
+    while True:
+        rows = await conn.fetch("""
+            SELECT id, question_content
+            FROM neet_questions
+            WHERE id > $1 AND ($2 = FALSE OR rendered_content IS NULL)
+            ORDER BY id
+            LIMIT $3
+        """, last_id, only_missing, RERENDER_BATCH_SIZE)
+        if not rows:
+            return total
+
+        updates = []
+        for r in rows:
+            try:
+                rendered = render_stored_question(r['question_content'])
+            except (ValueError, TypeError) as e:
+                print(f"Skipping question {r['id']}: {e}")
+                continue
+            if rendered is not None:
+                updates.append((rendered, r['id']))
+
+        if updates:
+            await conn.executemany("UPDATE neet_questions SET rendered_content = $1 WHERE id = $2", updates)
+        total += len(updates)
+        last_id = rows[-1]['id']
+        print(f"Rendered {total} questions (up to id {last_id})")
+
+
+async def main(only_missing: bool):
+    import asyncpg
+    from app.core.config import settings
+    from app.db.codecs import register_json_codecs
+
+    conn = await asyncpg.connect(
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        database=settings.DB_NAME
+    )
+    try:
+        await register_json_codecs(conn)
+        total = await rerender_questions(conn, only_missing=only_missing)
+        print(f"Done. {total} questions rendered.")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(only_missing="--all" not in sys.argv[1:]))
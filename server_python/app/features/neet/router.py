@@ -1,12 +1,26 @@
-from fastapi import APIRouter, HTTPException, Body, Depends, UploadFile, File, Form, Query
+from fastapi import APIRouter, HTTPException, Body, Depends, UploadFile, File, Form, Query, Response
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
 from app.core.database import get_db_pool
+from app.core.http_cache import http_cache
+from app.core.identity import identity
+from app.core.responses import RawJSONResponse
 from typing import List, Dict, Any, Optional
 from .service import NeetService
-import json
+from .sampler import sampler
+from .topic_counts import refresh_topic_counts, get_topic_tree
+from .render import render_question, render_stored_question
+from .listing import build_list_query, encode_cursor
+from app.db.queries import queries
+import asyncpg
+import orjson
 
 router = APIRouter()
 
-@router.get("/{subject}/topics")
+# Rows fetched per round trip when streaming NDJSON
+NDJSON_PREFETCH = 500
+
+@router.get("/{subject}/topics", dependencies=[http_cache.versioned("neet.topics", tables=["neet_topic_counts"])])
 async def get_topics(subject: str):
     """
     Get hierarchy of topics and sub-topics for a subject with counts.
@@ -14,119 +28,52 @@ async def get_topics(subject: str):
     """
     pool = await get_db_pool()
     async with pool.acquire() as conn:
-        # Fetch all topic/sub_topic pairs to count them
-        rows = await conn.fetch("""
-            SELECT topic, sub_topic, question_type
-            FROM neet_questions 
-            WHERE LOWER(subject) = LOWER($1) AND topic IS NOT NULL
-        """, subject)
-        
-        # Group by case-insensitive topic
-        topic_map = {} 
-        
-        for r in rows:
-            t_raw = r['topic'].strip() if r['topic'] else "Unknown"
-            t_key = t_raw.lower()
-            st_raw = r['sub_topic']
-            q_type = r['question_type']
-            
-            if t_key not in topic_map:
-                topic_map[t_key] = {
-                    "display": t_raw, 
-                    "count": 0,
-                    "sub_topics": {} # name -> {count: int, types: map}
-                }
-            
-            # Increment main topic count
-            topic_map[t_key]["count"] += 1
-            
-            if st_raw:
-                st_key = st_raw.strip()
-                if st_key not in topic_map[t_key]["sub_topics"]:
-                     topic_map[t_key]["sub_topics"][st_key] = {
-                         "count": 0,
-                         "types": {}
-                     }
-                
-                # Increment Sub-topic count
-                topic_map[t_key]["sub_topics"][st_key]["count"] += 1
-                
-                # Increment Type count
-                if q_type:
-                    if q_type not in topic_map[t_key]["sub_topics"][st_key]["types"]:
-                        topic_map[t_key]["sub_topics"][st_key]["types"][q_type] = 0
-                    topic_map[t_key]["sub_topics"][st_key]["types"][q_type] += 1
-        
-        result = []
-        for key in sorted(topic_map.keys()):
-            item = topic_map[key]
-            # Convert sub_topics dict to list
-            subs = []
-            for st_name, st_data in item["sub_topics"].items():
-                subs.append({ 
-                    "name": st_name, 
-                    "count": st_data["count"],
-                    "types": st_data["types"]
-                })
-            
-            # Sort sub-topics by name
-            subs.sort(key=lambda x: x["name"])
-            
-            result.append({
-                "topic": item["display"],
-                "count": item["count"],
-                "sub_topics": subs
-            })
-            
-        return result
+        # Served from the maintained neet_topic_counts summary
+        return await get_topic_tree(conn, subject)
 
-@router.get("/{subject}")
-async def get_questions(subject: str, topic: Optional[str] = None, sub_topic: Optional[str] = None):
+@router.get("/{subject}", dependencies=[http_cache.versioned("neet.questions", tables=["neet_questions"])])
+async def get_questions(
+    subject: str,
+    topic: Optional[str] = None,
+    sub_topic: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=settings.NEET_QUESTIONS_MAX_PAGE_SIZE),
+    format: str = Query("json", pattern="^(json|ndjson)$")
+):
     """
-    Fetch all questions for a subject, optionally filtered by topic and sub_topic (Case Insensitive).
+    Fetch questions for a subject, newest first, optionally filtered by topic and sub_topic (Case Insensitive).
+
+    format=json (default): one page of at most `limit` questions (NEET_QUESTIONS_PAGE_SIZE by default)
+    as a JSON array. When more remain, the X-Next-Cursor header holds the cursor for the next page.
+
+    format=ndjson: streams every question after `cursor` (up to `limit` if given), one JSON object per line.
     """
     pool = await get_db_pool()
-    query = """
-        SELECT id, question_content, topic, sub_topic, question_type, created_at, uploaded_by 
-        FROM neet_questions 
-        WHERE LOWER(subject) = LOWER($1) 
-    """
-    params = [subject]
-    
-    if topic:
-        query += f" AND LOWER(topic) = LOWER(${len(params) + 1})"
-        params.append(topic)
-        
-    if sub_topic:
-        # Sub-topic also case insensitive? Yes, safer.
-        query += f" AND LOWER(sub_topic) = LOWER(${len(params) + 1})"
-        params.append(sub_topic)
-        
-    query += " ORDER BY created_at DESC"
-    
+
+    if format == "ndjson":
+        query, params = build_list_query(subject, topic, sub_topic, cursor, limit)
+
+        async def stream():
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    async for r in queries.cursor(conn, query, *params, prefetch=NDJSON_PREFETCH):
+                        yield r['payload'] + "\n"
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    page_size = limit or settings.NEET_QUESTIONS_PAGE_SIZE
+    # One extra row tells whether another page exists
+    query, params = build_list_query(subject, topic, sub_topic, cursor, page_size + 1)
+
     async with pool.acquire() as conn:
-        rows = await conn.fetch(query, *params)
-        
-        results = []
-        for r in rows:
-            content = r['question_content']
-            
-            if isinstance(content, str):
-                try:
-                    content = json.loads(content)
-                except json.JSONDecodeError:
-                    continue 
-            
-            if isinstance(content, dict):
-                results.append({
-                    "id": str(r['id']),
-                    **content,
-                    "topic": r['topic'],
-                    "subTopic": r['sub_topic'],
-                    "questionType": r['question_type'],
-                    "createdAt": r['created_at'].isoformat()
-                })
-        return results
+        rows = await queries.fetch(conn, query, *params)
+
+    headers = {}
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1]['created_at'], rows[-1]['id'])
+
+    return RawJSONResponse.array((r['payload'] for r in rows), headers=headers)
 
 @router.post("/{subject}/upload")
 async def upload_questions(
@@ -140,33 +87,37 @@ async def upload_questions(
     """
     Upload questions via file.
     """
-    import json
-    
-    try:
-        if file.filename.endswith('.xlsx') or file.filename.endswith('.xls'):
-            questions = await NeetService.parse_upload_file(file, file_type='excel')
-        elif file.filename.endswith('.json') or file.filename.endswith('.txt'):
-            questions = await NeetService.parse_upload_file(file, file_type='json')
-        else:
-            raise HTTPException(400, "Invalid file format")
-    except Exception as e:
-        raise HTTPException(400, str(e))
+    filename = file.filename.lower()
+    if filename.endswith('.xlsx') or filename.endswith('.xls'):
+        file_type = 'excel'
+    elif filename.endswith('.json') or filename.endswith('.txt'):
+        file_type = 'json'
+    else:
+        raise HTTPException(400, "Invalid file format")
 
     pool = await get_db_pool()
     async with pool.acquire() as conn:
         user_id = None
         if teacherUid:
-            user_id = await conn.fetchval("SELECT user_id FROM users WHERE firebase_uid = $1", teacherUid)
+            user_id = await identity.get_user_id(conn, teacherUid)
 
-        for q in questions:
-            q_type = q.get('question_type') or question_type
-            
-            await conn.execute("""
-                INSERT INTO neet_questions (subject, topic, sub_topic, question_type, question_content, uploaded_by)
-                VALUES ($1, $2, $3, $4, $5, $6)
-            """, subject, topic, sub_topic, q_type, json.dumps(q), user_id)
+        # Parse and insert batch by batch; a parse error rolls back the whole upload
+        try:
+            async with conn.transaction():
+                result = await NeetService.bulk_insert_questions(
+                    conn, NeetService.iter_upload_batches(file, file_type),
+                    subject, topic, sub_topic, question_type, user_id
+                )
+                await refresh_topic_counts(conn, subject, [topic])
+        except HTTPException:
+            raise
+        except asyncpg.PostgresError as e:
+            raise HTTPException(400, f"Upload failed, no questions were saved: {e}")
+        except Exception as e:
+            raise HTTPException(400, str(e))
             
-    return {"success": True, "count": len(questions)}
+    sampler.invalidate(subject)
+    return {"success": True, "count": result["inserted"], **result}
 
 @router.patch("/{subject}/{question_id}")
 async def update_question(
@@ -179,16 +130,14 @@ async def update_question(
     Payload should check for 'question', 'options', 'correctAnswer', etc.
     This updates the 'question_content' JSON blob and optionally question_type.
     """
-    import json
-    
     pool = await get_db_pool()
     async with pool.acquire() as conn:
         # 1. Fetch existing
-        row = await conn.fetchrow("SELECT question_content, question_type FROM neet_questions WHERE id = $1", int(question_id))
+        row = await conn.fetchrow("SELECT question_content, question_type, topic FROM neet_questions WHERE id = $1", int(question_id))
         if not row:
             raise HTTPException(404, "Question not found")
             
-        current_content = json.loads(row['question_content'])
+        current_content = row['question_content']
         
         # 2. Merge updates
         # We assume payload contains keys to update in the content
@@ -202,13 +151,17 @@ async def update_question(
             if f in payload:
                 current_content[f] = payload[f]
                 
-        # 3. Update DB
+        # 3. Update DB (re-render the display payload alongside the content)
         await conn.execute("""
             UPDATE neet_questions 
-            SET question_content = $1, question_type = $2
-            WHERE id = $3
-        """, json.dumps(current_content), new_type, int(question_id))
+            SET question_content = $1, question_type = $2, rendered_content = $3
+            WHERE id = $4
+        """, current_content, new_type, render_question(current_content), int(question_id))
+
+        if new_type != row['question_type']:
+            await refresh_topic_counts(conn, subject, [row['topic']])
         
+    sampler.invalidate(subject)
     return {"success": True}
 
 
@@ -221,21 +174,24 @@ async def save_questions(
     question_type: Optional[str] = Body(None),
     teacherUid: Optional[str] = Body(None)
 ):
-    import json 
-    
     pool = await get_db_pool()
     async with pool.acquire() as conn:
         user_id = None
         if teacherUid:
-            user_id = await conn.fetchval("SELECT user_id FROM users WHERE firebase_uid = $1", teacherUid)
+            user_id = await identity.get_user_id(conn, teacherUid)
 
-        for q in questions:
-            await conn.execute("""
-                INSERT INTO neet_questions (subject, topic, sub_topic, question_type, question_content, uploaded_by)
-                VALUES ($1, $2, $3, $4, $5, $6)
-            """, subject, topic, sub_topic, question_type, json.dumps(q), user_id)
+        try:
+            async with conn.transaction():
+                result = await NeetService.bulk_insert_questions(
+                    conn, NeetService.iter_batches(questions),
+                    subject, topic, sub_topic, question_type, user_id
+                )
+                await refresh_topic_counts(conn, subject, [topic])
+        except asyncpg.PostgresError as e:
+            raise HTTPException(400, f"Save failed, no questions were saved: {e}")
             
-    return {"success": True}
+    sampler.invalidate(subject)
+    return {"success": True, **result}
 
 @router.post("/assessment/generate")
 async def generate_assessment(
@@ -246,145 +202,56 @@ async def generate_assessment(
     distribution: Optional[List[Dict[str, Any]]] = Body(None)
 ):
     pool = await get_db_pool()
-    questions = []
     
     async with pool.acquire() as conn:
-        where_clauses = ["LOWER(subject) = LOWER($1)"]
-        params = [subject]
-        param_idx = 2
-        
-        if topics:
-            # Apply BTRIM to topic as well to be safe
-            where_clauses.append(f"LOWER(TRIM(topic)) IN (SELECT LOWER(TRIM(unnest(${param_idx}::varchar[]))))")
-            params.append(topics)
-            param_idx += 1
-            
-        if sub_topics:
-            where_clauses.append(f"LOWER(TRIM(sub_topic)) IN (SELECT LOWER(TRIM(unnest(${param_idx}::varchar[]))))")
-            params.append(sub_topics)
-            param_idx += 1
+        # Draw ids for every requested type in one pass, then fetch only those rows
+        question_ids = await sampler.sample(conn, subject, topics, sub_topics, distribution, total_questions)
+        if not question_ids:
+            return []
 
-        base_query = f"""
-            SELECT id, question_content, topic, sub_topic, question_type 
+        # Pre-rendered payloads are passed through as JSON text without decoding
+        rows = await conn.fetch("""
+            SELECT id, question_content, topic, sub_topic, question_type,
+                   (rendered_content || jsonb_build_object(
+                       'id', id, 'topic', topic, 'sub_topic', sub_topic, 'questionType', question_type
+                   ))::text AS payload
             FROM neet_questions 
-            WHERE {" AND ".join(where_clauses)}
-        """
+            WHERE id = ANY($1::int[])
+        """, question_ids)
 
-        if distribution:
-            # Map frontend friendly types to database types
-            TYPE_MAP = {
-                "mcq": "MCQ",
-                "statement": "STATEMENT_BASED",
-                "assertion": "ASSERTION_REASON",
-                "previous": "NEET_PYQ"
-            }
-
-            for dist in distribution:
-                raw_type = dist.get('type', '').lower()
-                # Use map if exists, otherwise fallback to substring search (legacy)
-                db_type = TYPE_MAP.get(raw_type, raw_type)
-                
-                count = dist.get('count', 0)
-                if count > 0:
-                    type_query = base_query + f" AND question_type ILIKE ${param_idx} ORDER BY RANDOM() LIMIT ${param_idx+1}"
-                    
-                    # Use exact match pattern for mapped types, or %like% for others
-                    search_pattern = db_type if raw_type in TYPE_MAP else f"%{db_type}%"
-                    
-                    type_params = params + [search_pattern, count]
-                    
-                    print(f"DEBUG: Querying type '{raw_type}' -> DB '{db_type}' (Pattern: {search_pattern})")
-                    rows = await conn.fetch(type_query, *type_params)
-                    
-                    print(f"DEBUG: Found {len(rows)} questions for type '{raw_type}' (Requested: {count})")
-                    
-                    for r in rows:
-                        try:
-                            content_str = r['question_content']
-                            if not content_str: 
-                                continue
-                                
-                            q_data = json.loads(content_str)
-                            q_data['id'] = r['id']
-                            q_data['topic'] = r['topic']
-                            q_data['sub_topic'] = r['sub_topic']
-                            q_data['questionType'] = r['question_type']
-                            
-                            # --- NORMALIZATION LOGIC ---
-                            if 'assertion' in q_data and 'reason' in q_data:
-                                q_data['question'] = (
-                                    f"<div class='assertion-reason'>"
-                                    f"<p><strong>Assertion:</strong> {q_data['assertion']}</p>"
-                                    f"<p><strong>Reason:</strong> {q_data['reason']}</p>"
-                                    f"</div>"
-                                )
-                            elif any(k.startswith('statement') for k in q_data.keys()):
-                                stmts = sorted([k for k in q_data.keys() if k.startswith('statement')])
-                                html_parts = []
-                                for idx, s_key in enumerate(stmts):
-                                    label = f"Statement {idx + 1}" 
-                                    html_parts.append(f"<p class='mb-2'><strong>{label}:</strong> {q_data[s_key]}</p>")
-                                q_data['question'] = f"<div class='statement-based'>{''.join(html_parts)}</div>"
-                            elif 'pairs' in q_data:
-                                pairs_html = "<div class='match-pairs'><table class='w-full border-collapse border border-gray-300'>"
-                                for p in q_data['pairs']:
-                                    c1 = p.get('col1') or p.get('column1') or (p[0] if isinstance(p, list) else '')
-                                    c2 = p.get('col2') or p.get('column2') or (p[1] if isinstance(p, list) else '')
-                                    pairs_html += f"<tr><td class='p-2 border border-gray-300'>{c1}</td><td class='p-2 border border-gray-300'>{c2}</td></tr>"
-                                pairs_html += "</table></div>"
-                                q_data['question'] = pairs_html
-                            
-                            # Standard text handling (MCQ, PYQ, or Statement with 'question' field)
-                            if q_data.get('question'):
-                                # Replace newlines with breaks for display
-                                q_data['question'] = q_data['question'].replace('\n', '<br/>')
-                            else:
-                                # Fallback if specific keys missing AND question missing
-                                q_data['question'] = "<p class='text-red-500'>[Question content missing]</p>"
-                            
-                            questions.append(q_data)
-                        except Exception as e:
-                            print(f"Error parsing question {r['id']}: {e}")
-                            continue
-        else:
-            limit = total_questions if total_questions else 50
-            final_query = base_query + f" ORDER BY RANDOM() LIMIT ${param_idx}"
-            final_params = params + [limit]
-            rows = await conn.fetch(final_query, *final_params)
-            for r in rows:
-                try:
-                    q_data = json.loads(r['question_content'])
-                    q_data['id'] = r['id']
-                    q_data['topic'] = r['topic']
-                    q_data['sub_topic'] = r['sub_topic']
-                    q_data['questionType'] = r['question_type']
-                    
-                    # Generic Normalization
-                    if 'assertion' in q_data and 'reason' in q_data:
-                        q_data['question'] = f"<p><strong>Assertion:</strong> {q_data['assertion']}</p><p><strong>Reason:</strong> {q_data['reason']}</p>"
-                    elif any(k.startswith('statement') for k in q_data.keys()):
-                         stmts = sorted([k for k in q_data.keys() if k.startswith('statement')])
-                         html = "".join([f"<p><strong>Statement {i+1}:</strong> {q_data[k]}</p>" for i, k in enumerate(stmts)])
-                         q_data['question'] = html
-                    elif 'pairs' in q_data:
-                        pairs_html = "<table class='w-full border' style='border-collapse: collapse;'>"
-                        for p in q_data['pairs']:
-                            c1 = p.get('col1','')
-                            c2 = p.get('col2','')
-                            pairs_html += f"<tr><td style='border:1px solid #ddd; padding:4px;'>{c1}</td><td style='border:1px solid #ddd; padding:4px;'>{c2}</td></tr>"
-                        pairs_html += "</table>"
-                        q_data['question'] = pairs_html
-                    
-                    if q_data.get('question'):
-                        q_data['question'] = q_data['question'].replace('\n', '<br/>')
-                    else:
-                        q_data['question'] = "<p>[Question content missing]</p>"
-
-                    questions.append(q_data)
-                except:
-                    continue
-
-    return questions
+        rows_by_id = {r['id']: r for r in rows}
+        payloads = []
+        backfill = []
+        for qid in question_ids:
+            r = rows_by_id.get(qid)
+            if r is None:
+                # Deleted since the index was built
+                continue
+            if r['payload'] is not None:
+                payloads.append(r['payload'])
+                continue
+
+            # Not rendered yet (row predates rendered_content): render once and store it
+            try:
+                rendered = render_stored_question(r['question_content'])
+            except (ValueError, TypeError) as e:
+                print(f"Error parsing question {qid}: {e}")
+                continue
+            if rendered is None:
+                continue
+            backfill.append((rendered, qid))
+            payloads.append(orjson.dumps({
+                **rendered,
+                "id": qid,
+                "topic": r['topic'],
+                "sub_topic": r['sub_topic'],
+                "questionType": r['question_type']
+            }).decode())
+
+        if backfill:
+            await conn.executemany("UPDATE neet_questions SET rendered_content = $1 WHERE id = $2", backfill)
+
+    return RawJSONResponse.array(payloads)
 
 @router.post("/assessment/save")
 async def save_assessment(
@@ -394,17 +261,16 @@ async def save_assessment(
     config: Dict[str, Any] = Body(None),
     teacherUid: Optional[str] = Body(None)
 ):
-    import json
     pool = await get_db_pool()
     async with pool.acquire() as conn:
         user_id = None
         if teacherUid:
-            user_id = await conn.fetchval("SELECT user_id FROM users WHERE firebase_uid = $1", teacherUid)
+            user_id = await identity.get_user_id(conn, teacherUid)
             
         await conn.execute("""
             INSERT INTO neet_assessments (title, subject, question_ids, config, created_by)
             VALUES ($1, $2, $3, $4, $5)
-        """, title, subject, json.dumps(question_ids), json.dumps(config or {}), user_id)
+        """, title, subject, question_ids, config or {}, user_id)
         
     return {"success": True}
 
@@ -413,14 +279,14 @@ async def list_assessments(subject: str, teacherUid: Optional[str] = Query(None)
     pool = await get_db_pool()
     async with pool.acquire() as conn:
         query = """
-            SELECT id, title, subject, question_ids, config, created_at
+            SELECT id, title, subject, jsonb_array_length(question_ids) AS question_count, config, created_at
             FROM neet_assessments
             WHERE LOWER(subject) = LOWER($1)
         """
         params = [subject]
         
         if teacherUid:
-            user_id = await conn.fetchval("SELECT user_id FROM users WHERE firebase_uid = $1", teacherUid)
+            user_id = await identity.get_user_id(conn, teacherUid)
             if user_id:
                 query += " AND created_by = $2"
                 params.append(user_id)
@@ -439,8 +305,8 @@ async def list_assessments(subject: str, teacherUid: Optional[str] = Query(None)
                 "id": r['id'],
                 "title": r['title'],
                 "subject": r['subject'],
-                "questionCount": len(json.loads(r['question_ids'])),
-                "config": json.loads(r['config']),
+                "questionCount": r['question_count'],
+                "config": r['config'],
                 "createdAt": r['created_at'].isoformat()
             })
             
@@ -456,16 +322,19 @@ async def delete_topic_questions(
     Delete all questions for a specific topic (and optional sub-topic).
     """
     pool = await get_db_pool()
-    query = "DELETE FROM neet_questions WHERE LOWER(subject) = LOWER($1) AND LOWER(topic) = LOWER($2)"
+    query = "DELETE FROM neet_questions WHERE subject_key = LOWER(BTRIM($1)) AND topic_key = LOWER(BTRIM($2))"
     params = [subject, topic]
     
     if sub_topic:
-        query += " AND LOWER(sub_topic) = LOWER($3)"
+        query += " AND sub_topic_key = LOWER(BTRIM($3))"
         params.append(sub_topic)
         
     async with pool.acquire() as conn:
-        result = await conn.execute(query, *params)
+        async with conn.transaction():
+            result = await conn.execute(query, *params)
+            await refresh_topic_counts(conn, subject, [topic])
         
+    sampler.invalidate(subject)
     return {"success": True, "message": result}
 
 @router.patch("/{subject}/topic")
@@ -486,32 +355,46 @@ async def rename_topic(
             query = """
                 UPDATE neet_questions 
                 SET sub_topic = $1 
-                WHERE LOWER(subject) = LOWER($2) AND LOWER(topic) = LOWER($3) AND LOWER(sub_topic) = LOWER($4)
+                WHERE subject_key = LOWER(BTRIM($2)) AND topic_key = LOWER(BTRIM($3)) AND sub_topic_key = LOWER(BTRIM($4))
             """
-            await conn.execute(query, new_sub_topic, subject, old_topic, old_sub_topic)
+            async with conn.transaction():
+                await conn.execute(query, new_sub_topic, subject, old_topic, old_sub_topic)
+                await refresh_topic_counts(conn, subject, [old_topic])
         # If renaming main topic
         else:
             query = """
                 UPDATE neet_questions 
                 SET topic = $1 
-                WHERE LOWER(subject) = LOWER($2) AND LOWER(topic) = LOWER($3)
+                WHERE subject_key = LOWER(BTRIM($2)) AND topic_key = LOWER(BTRIM($3))
             """
-            await conn.execute(query, new_topic, subject, old_topic)
+            async with conn.transaction():
+                await conn.execute(query, new_topic, subject, old_topic)
+                await refresh_topic_counts(conn, subject, [old_topic, new_topic])
             
+    sampler.invalidate(subject)
     return {"success": True}
 
 @router.delete("/{subject}/{question_id}")
 async def delete_question(subject: str, question_id: int):
     pool = await get_db_pool()
     async with pool.acquire() as conn:
-        await conn.execute("DELETE FROM neet_questions WHERE id = $1 AND subject = $2", question_id, subject)
+        async with conn.transaction():
+            topic = await conn.fetchval(
+                "DELETE FROM neet_questions WHERE id = $1 AND subject = $2 RETURNING topic", question_id, subject
+            )
+            if topic:
+                await refresh_topic_counts(conn, subject, [topic])
+    sampler.invalidate(subject)
     return {"success": True}
 
 @router.delete("/{subject}")
 async def clear_questions(subject: str):
     pool = await get_db_pool()
     async with pool.acquire() as conn:
-        await conn.execute("DELETE FROM neet_questions WHERE subject = $1", subject)
+        async with conn.transaction():
+            await conn.execute("DELETE FROM neet_questions WHERE subject = $1", subject)
+            await refresh_topic_counts(conn, subject)
+    sampler.invalidate(subject)
     return {"success": True}
 
 @router.get("/files/template")
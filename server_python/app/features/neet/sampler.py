@@ -0,0 +1,176 @@
+import asyncio
+import random
+import time
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+
+# Map frontend friendly types to database types
+TYPE_MAP = {
+    "mcq": "MCQ",
+    "statement": "STATEMENT_BASED",
+    "assertion": "ASSERTION_REASON",
+    "previous": "NEET_PYQ"
+}
+
+BucketKey = Tuple[Optional[str], Optional[str], Optional[str]]  # (topic, sub_topic, question_type)
+
+
+def _norm(value: Optional[str]) -> Optional[str]:
+    return value.strip().lower() if value is not None else None
+
+
+class SubjectIndex:
+    """Question ids of one subject, bucketed by (topic, sub_topic, question_type)."""
+
+    def __init__(self, buckets: Dict[BucketKey, array]):
+        self.buckets = buckets
+        self.loaded_at = time.monotonic()
+        self.size = sum(len(ids) for ids in buckets.values())
+
+
+class QuestionSampler:
+    """
+    Replaces per-type `ORDER BY RANDOM() LIMIT n` scans in assessment generation.
+    Keeps an in-process index of question ids per subject, draws every requested type
+    from it in one pass using random offsets, and leaves only an `id = ANY($1)` fetch
+    for the database.
+
+    Writers in this process call invalidate(); changes made by other workers are
+    picked up once the index is older than the TTL.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._indexes: Dict[str, SubjectIndex] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.loads = 0
+
+    def invalidate(self, subject: Optional[str] = None):
+        if subject is None:
+            self._indexes.clear()
+        else:
+            self._indexes.pop(_norm(subject), None)
+
+    async def get_index(self, conn, subject: str) -> SubjectIndex:
+        key = _norm(subject)
+        index = self._indexes.get(key)
+        if index and time.monotonic() - index.loaded_at < self.ttl_seconds:
+            return index
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            index = self._indexes.get(key)
+            if index and time.monotonic() - index.loaded_at < self.ttl_seconds:
+                return index
+
+            rows = await conn.fetch("""
+                SELECT id, topic_key, sub_topic_key, question_type
+                FROM neet_questions
+                WHERE subject_key = LOWER(BTRIM($1))
+            """, subject)
+
+            buckets: Dict[BucketKey, array] = {}
+            for r in rows:
+                bucket_key = (r['topic_key'], r['sub_topic_key'], r['question_type'])
+                ids = buckets.get(bucket_key)
+                if ids is None:
+                    ids = buckets[bucket_key] = array('l')
+                ids.append(r['id'])
+
+            index = SubjectIndex(buckets)
+            self._indexes[key] = index
+            self.loads += 1
+            return index
+
+    async def sample(
+        self,
+        conn,
+        subject: str,
+        topics: Optional[List[str]],
+        sub_topics: Optional[List[str]],
+        distribution: Optional[List[Dict[str, Any]]],
+        total_questions: Optional[int]
+    ) -> List[int]:
+        """
+        Returns the chosen question ids in output order: grouped by distribution entry,
+        random within each group. Without a distribution, draws total_questions (default 50)
+        across all types.
+        """
+        index = await self.get_index(conn, subject)
+
+        topic_keys = {_norm(t) for t in topics} if topics else None
+        sub_topic_keys = {_norm(st) for st in sub_topics} if sub_topics else None
+
+        candidates = [
+            (key, ids) for key, ids in index.buckets.items()
+            if (topic_keys is None or key[0] in topic_keys)
+            and (sub_topic_keys is None or key[1] in sub_topic_keys)
+        ]
+
+        chosen: List[int] = []
+        if distribution:
+            seen = set()
+            for dist in distribution:
+                count = dist.get('count', 0)
+                if count <= 0:
+                    continue
+
+                raw_type = dist.get('type', '').lower()
+                matches = self._type_matcher(raw_type)
+                buckets = [ids for key, ids in candidates if key[2] is not None and matches(key[2].lower())]
+
+                for qid in self._draw(buckets, count, seen):
+                    seen.add(qid)
+                    chosen.append(qid)
+        else:
+            limit = total_questions if total_questions else 50
+            chosen = self._draw([ids for _, ids in candidates], limit, set())
+
+        return chosen
+
+    @staticmethod
+    def _type_matcher(raw_type: str):
+        # Mapped types match exactly (case-insensitive), anything else as a substring (legacy)
+        if raw_type in TYPE_MAP:
+            db_type = TYPE_MAP[raw_type].lower()
+            return lambda q_type: q_type == db_type
+        return lambda q_type: raw_type in q_type
+
+    @staticmethod
+    def _draw(buckets: List[array], count: int, exclude: set) -> List[int]:
+        """
+        Uniform sample without replacement over the concatenation of buckets,
+        done on offsets so no combined list is ever built.
+        """
+        offsets = []
+        total = 0
+        for ids in buckets:
+            offsets.append(total)
+            total += len(ids)
+        if total == 0:
+            return []
+
+        # Over-draw by the number of excluded ids so exclusions never starve the result
+        k = min(total, count + len(exclude))
+        result = []
+        for pos in random.sample(range(total), k):
+            b = bisect_right(offsets, pos) - 1
+            qid = buckets[b][pos - offsets[b]]
+            if qid in exclude:
+                continue
+            result.append(qid)
+            if len(result) == count:
+                break
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subjects": {key: index.size for key, index in self._indexes.items()},
+            "loads": self.loads,
+            "ttlSeconds": self.ttl_seconds,
+        }
+
+
+sampler = QuestionSampler(ttl_seconds=settings.NEET_SAMPLER_TTL_SECONDS)
@@ -1,9 +1,41 @@
 
 import pandas as pd
+import openpyxl
+import asyncio
+import codecs
 import json
 import io
-from typing import List, Dict, Any, Union
+from itertools import islice
+from typing import List, Dict, Any, Union, Optional, AsyncIterable, Iterable, Iterator
 from fastapi import UploadFile, HTTPException
+from .render import render_question
+
+# Rows per COPY batch for bulk question ingest
+INGEST_BATCH_SIZE = 1000
+# Cap on per-row errors echoed back to the client
+MAX_REPORTED_ERRORS = 100
+
+# Bytes read per step by the incremental JSON parser
+JSON_READ_CHUNK_SIZE = 64 * 1024
+
+QUESTION_COLUMNS = ['subject', 'topic', 'sub_topic', 'question_type', 'question_content', 'rendered_content', 'uploaded_by']
+
+
+def _take(rows: Iterator, n: int) -> list:
+    return list(islice(rows, n))
+
+
+def _is_blank(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, float) and value != value:  # NaN
+        return True
+    return isinstance(value, str) and not value.strip()
+
+
+def _cell_text(value: Any) -> str:
+    return "" if value is None else str(value)
+
 
 class NeetService:
     @staticmethod
@@ -12,61 +44,280 @@ class NeetService:
         Parses an uploaded file (JSON or Excel) and returns a list of question objects.
         Expected Excel validation:
         - Columns: ["question", "option_a", "option_b", "option_c", "option_d", "correct_answer", "explanation"]
+        Holds the whole result in memory; prefer iter_upload_batches for large uploads.
+        """
+        questions = []
+        async for batch in NeetService.iter_upload_batches(file, file_type):
+            questions.extend(batch)
+        return questions
+
+    @staticmethod
+    async def iter_upload_batches(file: UploadFile, file_type: str = None, batch_size: int = INGEST_BATCH_SIZE):
+        """
+        Streaming parse mode: yields lists of at most batch_size question dicts.
+        Each batch is parsed in a worker thread so the event loop is never blocked,
+        and only one batch is materialized at a time regardless of file size.
         """
-        
-        contents = await file.read()
-        filename = file.filename.lower()
+        rows = NeetService._iter_upload_rows(file.file, file.filename.lower(), file_type)
+        try:
+            while True:
+                batch = await asyncio.to_thread(_take, rows, batch_size)
+                if not batch:
+                    break
+                yield batch
+        finally:
+            rows.close()
+
+    @staticmethod
+    def _iter_upload_rows(fileobj, filename: str, file_type: str = None) -> Iterator[Dict[str, Any]]:
+        fileobj.seek(0)
 
         if filename.endswith('.json') or file_type == 'json':
-            try:
-                data = json.loads(contents.decode('utf-8'))
-                if not isinstance(data, list):
-                    raise ValueError("JSON must be a list of objects")
-                return data
-            except json.JSONDecodeError:
-                raise HTTPException(status_code=400, detail="Invalid JSON file")
-
-        elif filename.endswith('.xlsx') or filename.endswith('.xls') or file_type == 'excel':
-            try:
-                df = pd.read_excel(io.BytesIO(contents))
-                
-                # Normalize headers
-                df.columns = [c.lower().replace(' ', '_') for c in df.columns]
-                
-                required_cols = {'question', 'option_a', 'option_b', 'option_c', 'option_d', 'correct_answer'}
-                if not required_cols.issubset(set(df.columns)):
-                    missing = required_cols - set(df.columns)
-                    raise HTTPException(status_code=400, detail=f"Missing columns in Excel: {', '.join(missing)}")
-                
-                questions = []
-                for _, row in df.iterrows():
-                    # Skip empty rows
-                    if pd.isna(row['question']):
-                        continue
-                        
-                    q_obj = {
-                        "question": str(row['question']),
-                        "options": [
-                            str(row['option_a']),
-                            str(row['option_b']),
-                            str(row['option_c']),
-                            str(row['option_d'])
-                        ],
-                        # Ensure correct answer is just the letter A/B/C/D if possible, or the full text? 
-                        # Usually logic expects index or letter. Let's assume letter input in excel.
-                        "correctAnswer": str(row['correct_answer']).strip().upper()[0] if str(row['correct_answer']) else "A",
-                        "explanation": str(row['explanation']) if 'explanation' in df.columns and not pd.isna(row['explanation']) else "",
-                        "question_type": str(row['question_type']).strip() if 'question_type' in df.columns and not pd.isna(row['question_type']) else None
-                    }
-                    questions.append(q_obj)
-                
-                return questions
-                
-            except Exception as e:
-                # Catch verify errors or pandas errors
-                if isinstance(e, HTTPException):
-                    raise e
-                raise HTTPException(status_code=400, detail=f"Error processing Excel: {str(e)}")
-        
+            yield from NeetService._iter_json_rows(fileobj)
+
+        elif filename.endswith('.xlsx') or file_type == 'excel':
+            if filename.endswith('.xls'):
+                # Legacy binary workbooks are not readable by openpyxl
+                yield from NeetService._iter_xls_rows(fileobj)
+            else:
+                yield from NeetService._iter_excel_rows(fileobj)
+
+        elif filename.endswith('.xls'):
+            yield from NeetService._iter_xls_rows(fileobj)
+
         else:
             raise HTTPException(status_code=400, detail="Unsupported file format. Use .json or .xlsx")
+
+    @staticmethod
+    def _iter_json_rows(fileobj) -> Iterator[Dict[str, Any]]:
+        """
+        Incremental parser for a top-level JSON array: decodes one element at a time
+        from fixed-size chunks instead of loading the whole document.
+        """
+        decoder = json.JSONDecoder()
+        text_decoder = codecs.getincrementaldecoder('utf-8-sig')()  # drops a BOM, even split across chunks
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill():
+            nonlocal buffer, pos, eof
+            chunk = fileobj.read(JSON_READ_CHUNK_SIZE)
+            if not chunk:
+                eof = True
+                buffer = buffer[pos:] + text_decoder.decode(b"", final=True)
+            else:
+                buffer = buffer[pos:] + text_decoder.decode(chunk)
+            pos = 0
+
+        def skip_whitespace():
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    return
+                fill()
+
+        try:
+            fill()
+            skip_whitespace()
+            if pos >= len(buffer) or buffer[pos] != '[':
+                raise HTTPException(status_code=400, detail="JSON upload must be an array of questions")
+            pos += 1
+
+            expect_value = True
+            seen_item = False
+            while True:
+                skip_whitespace()
+                if pos >= len(buffer):
+                    raise HTTPException(status_code=400, detail="Invalid JSON file")
+
+                ch = buffer[pos]
+                if ch == ']' and (not expect_value or not seen_item):
+                    # Only whitespace may follow the closing bracket
+                    pos += 1
+                    skip_whitespace()
+                    if pos < len(buffer):
+                        raise HTTPException(status_code=400, detail="Invalid JSON file")
+                    return
+                if ch == ',' and not expect_value:
+                    pos += 1
+                    expect_value = True
+                    continue
+                if not expect_value:
+                    raise HTTPException(status_code=400, detail="Invalid JSON file")
+
+                # Grow the buffer until a complete element can be decoded
+                while True:
+                    try:
+                        item, end = decoder.raw_decode(buffer, pos)
+                        # A number cut at a chunk boundary still decodes; make sure it ended
+                        if end == len(buffer) and not eof:
+                            fill()
+                            continue
+                        break
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise HTTPException(status_code=400, detail="Invalid JSON file")
+                        fill()
+
+                pos = end
+                expect_value = False
+                seen_item = True
+                yield item
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON file")
+
+    @staticmethod
+    def _iter_excel_rows(fileobj) -> Iterator[Dict[str, Any]]:
+        """Reads .xlsx row by row with openpyxl in read-only mode."""
+        try:
+            workbook = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Error processing Excel: {str(e)}")
+
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+
+            # Normalize headers
+            columns = [str(c).lower().replace(' ', '_') if c is not None else '' for c in header]
+            NeetService._check_excel_columns(columns)
+
+            for values in rows:
+                row = dict(zip(columns, values))
+                q_obj = NeetService._excel_row_to_question(row)
+                if q_obj:
+                    yield q_obj
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _iter_xls_rows(fileobj) -> Iterator[Dict[str, Any]]:
+        """Legacy .xls path: pandas loads the sheet at once, then rows are yielded without iterrows."""
+        try:
+            df = pd.read_excel(fileobj)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Error processing Excel: {str(e)}")
+
+        df.columns = [str(c).lower().replace(' ', '_') for c in df.columns]
+        NeetService._check_excel_columns(list(df.columns))
+        df = df.astype(object).where(pd.notna(df), None)
+
+        for row in df.to_dict('records'):
+            q_obj = NeetService._excel_row_to_question(row)
+            if q_obj:
+                yield q_obj
+
+    @staticmethod
+    def _check_excel_columns(columns: List[str]):
+        required_cols = {'question', 'option_a', 'option_b', 'option_c', 'option_d', 'correct_answer'}
+        if not required_cols.issubset(set(columns)):
+            missing = required_cols - set(columns)
+            raise HTTPException(status_code=400, detail=f"Missing columns in Excel: {', '.join(sorted(missing))}")
+
+    @staticmethod
+    def _excel_row_to_question(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Skip empty rows
+        if _is_blank(row.get('question')):
+            return None
+
+        correct = '' if _is_blank(row.get('correct_answer')) else str(row['correct_answer']).strip()
+
+        return {
+            "question": str(row['question']),
+            "options": [
+                _cell_text(row.get('option_a')),
+                _cell_text(row.get('option_b')),
+                _cell_text(row.get('option_c')),
+                _cell_text(row.get('option_d'))
+            ],
+            # Expect the letter A/B/C/D in the sheet
+            "correctAnswer": correct.upper()[0] if correct else "A",
+            "explanation": "" if _is_blank(row.get('explanation')) else str(row['explanation']),
+            "question_type": None if _is_blank(row.get('question_type')) else str(row['question_type']).strip()
+        }
+
+    @staticmethod
+    def validate_question(q: Any) -> Optional[str]:
+        """
+        Returns an error message if the question cannot be stored, else None.
+        A question needs some renderable content: question text, assertion/reason,
+        statement fields or match pairs.
+        """
+        if not isinstance(q, dict):
+            return "Question must be an object"
+
+        has_content = (
+            bool(q.get('question'))
+            or ('assertion' in q and 'reason' in q)
+            or any(k.startswith('statement') for k in q.keys())
+            or bool(q.get('pairs'))
+        )
+        if not has_content:
+            return "Missing question content"
+
+        q_type = q.get('question_type')
+        if q_type is not None and len(str(q_type)) > 50:
+            return "question_type is longer than 50 characters"
+
+        return None
+
+    @staticmethod
+    async def iter_batches(questions: Iterable[Dict[str, Any]], batch_size: int = INGEST_BATCH_SIZE):
+        """Adapts an in-memory list of questions to the batch stream bulk_insert_questions expects."""
+        batch = []
+        for q in questions:
+            batch.append(q)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    async def bulk_insert_questions(
+        conn,
+        batches: AsyncIterable[List[Dict[str, Any]]],
+        subject: str,
+        topic: Optional[str],
+        sub_topic: Optional[str],
+        question_type: Optional[str],
+        uploaded_by: Optional[int]
+    ) -> Dict[str, Any]:
+        """
+        Validates and inserts questions batch by batch with COPY inside one transaction,
+        so an upload is all-or-nothing and only one batch is held in memory at a time.
+        Invalid rows are skipped and reported (1-based row numbers) instead of failing the upload.
+        """
+        inserted = 0
+        rejected = 0
+        errors = []
+        row_number = 0
+
+        async with conn.transaction():
+            async for batch in batches:
+                records = []
+                for q in batch:
+                    row_number += 1
+                    error = NeetService.validate_question(q)
+                    if error:
+                        rejected += 1
+                        if len(errors) < MAX_REPORTED_ERRORS:
+                            errors.append({"row": row_number, "error": error})
+                        continue
+
+                    q_type = q.get('question_type') or question_type
+                    records.append((
+                        subject, topic, sub_topic, q_type,
+                        q, render_question(q), uploaded_by
+                    ))
+
+                if records:
+                    await conn.copy_records_to_table('neet_questions', records=records, columns=QUESTION_COLUMNS)
+                    inserted += len(records)
+
+        return {"inserted": inserted, "rejected": rejected, "errors": errors}
@@ -0,0 +1,80 @@
+from typing import Any, Dict, List, Optional
+
+async def refresh_topic_counts(conn, subject: str, topics: Optional[List[str]] = None):
+    """
+    Recomputes the neet_topic_counts rows of the given topics (every topic of the subject
+    when topics is None) from neet_questions. Cost is proportional to the questions in
+    those topics, served by idx_neet_questions_keys. Call it from every endpoint that
+    inserts, deletes, retypes or renames questions, inside the same connection.
+    """
+    topics = [t for t in topics if t] if topics is not None else None
+    if topics == []:
+        return
+
+    async with conn.transaction():
+        await conn.execute("""
+            DELETE FROM neet_topic_counts
+            WHERE subject_key = LOWER(BTRIM($1))
+            AND ($2::text[] IS NULL OR topic_key IN (SELECT LOWER(BTRIM(t)) FROM unnest($2::text[]) t))
+        """, subject, topics)
+
+        await conn.execute("""
+            INSERT INTO neet_topic_counts
+                (subject_key, topic_key, sub_topic, question_type, topic_display, question_count)
+            SELECT subject_key, topic_key, COALESCE(BTRIM(sub_topic), ''), COALESCE(question_type, ''),
+                   MIN(BTRIM(topic)), COUNT(*)
+            FROM neet_questions
+            WHERE subject_key = LOWER(BTRIM($1)) AND topic_key IS NOT NULL
+            AND ($2::text[] IS NULL OR topic_key IN (SELECT LOWER(BTRIM(t)) FROM unnest($2::text[]) t))
+            GROUP BY 1, 2, 3, 4
+            ON CONFLICT (subject_key, topic_key, sub_topic, question_type)
+            DO UPDATE SET question_count = EXCLUDED.question_count, topic_display = EXCLUDED.topic_display
+        """, subject, topics)
+
+async def get_topic_tree(conn, subject: str) -> List[Dict[str, Any]]:
+    """
+    Builds [{ topic, count, sub_topics: [{ name, count, types }] }] from the summary rows,
+    so the work is O(number of topic/sub-topic/type groups), not O(number of questions).
+    """
+    rows = await conn.fetch("""
+        SELECT topic_key, topic_display, sub_topic, question_type, question_count
+        FROM neet_topic_counts
+        WHERE subject_key = LOWER(BTRIM($1)) AND question_count > 0
+    """, subject)
+
+    topic_map = {}
+    for r in rows:
+        item = topic_map.get(r['topic_key'])
+        if item is None:
+            item = topic_map[r['topic_key']] = {
+                "display": r['topic_display'] or "Unknown",
+                "count": 0,
+                "sub_topics": {}  # name -> {count: int, types: map}
+            }
+
+        item["count"] += r['question_count']
+
+        st_name = r['sub_topic']
+        if st_name:
+            sub = item["sub_topics"].setdefault(st_name, {"count": 0, "types": {}})
+            sub["count"] += r['question_count']
+            if r['question_type']:
+                sub["types"][r['question_type']] = sub["types"].get(r['question_type'], 0) + r['question_count']
+
+    result = []
+    for key in sorted(topic_map.keys()):
+        item = topic_map[key]
+        subs = [
+            {"name": st_name, "count": st_data["count"], "types": st_data["types"]}
+            for st_name, st_data in item["sub_topics"].items()
+        ]
+        # Sort sub-topics by name
+        subs.sort(key=lambda x: x["name"])
+
+        result.append({
+            "topic": item["display"],
+            "count": item["count"],
+            "sub_topics": subs
+        })
+
+    return result
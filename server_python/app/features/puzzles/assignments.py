@@ -0,0 +1,67 @@
+from typing import Optional
+from asyncpg import Record
+
+# Puzzle payload as the client expects it ({id, grade, ...content}), built in SQL as JSON text
+PUZZLE_PAYLOAD_SQL = "(jsonb_build_object('id', p.puzzle_id, 'grade', p.grade) || p.content)::text"
+
+TODAY_ASSIGNMENT_SQL = f"""
+    SELECT a.grade, a.completed_at, {PUZZLE_PAYLOAD_SQL} AS payload
+    FROM daily_puzzle_assignments a
+    JOIN puzzles p ON p.puzzle_id = a.puzzle_id
+    WHERE a.user_id = $1 AND a.day = CURRENT_DATE
+"""
+
+# Random active puzzle of grade $2 that user $1 never completed; replaces an unsolved
+# assignment for another grade
+ASSIGN_SQL = """
+    INSERT INTO daily_puzzle_assignments (user_id, day, grade, puzzle_id)
+    SELECT $1, CURRENT_DATE, $2, picked.puzzle_id
+    FROM (
+        SELECT p.puzzle_id
+        FROM puzzles p
+        WHERE p.grade = $2 AND p.active
+        AND NOT EXISTS (
+            SELECT 1 FROM puzzle_completions c
+            WHERE c.user_id = $1 AND c.puzzle_id = p.puzzle_id
+        )
+        ORDER BY random()
+        LIMIT 1
+    ) picked
+    ON CONFLICT (user_id, day) DO UPDATE
+    SET grade = EXCLUDED.grade, puzzle_id = EXCLUDED.puzzle_id, assigned_at = CURRENT_TIMESTAMP
+    WHERE daily_puzzle_assignments.completed_at IS NULL
+    AND daily_puzzle_assignments.grade IS DISTINCT FROM EXCLUDED.grade
+"""
+
+COMPLETE_SQL = """
+    INSERT INTO daily_puzzle_assignments (user_id, day, grade, puzzle_id, completed_at)
+    SELECT $1, CURRENT_DATE, p.grade, p.puzzle_id, CURRENT_TIMESTAMP
+    FROM puzzles p
+    WHERE p.puzzle_id = $2
+    ON CONFLICT (user_id, day) DO UPDATE
+    SET completed_at = COALESCE(daily_puzzle_assignments.completed_at, EXCLUDED.completed_at)
+"""
+
+
+async def get_assignment(conn, user_id: int) -> Optional[Record]:
+    """Today's assignment with its puzzle payload: one primary-key lookup."""
+    return await conn.fetchrow(TODAY_ASSIGNMENT_SQL, user_id)
+
+
+async def assign_daily_puzzle(conn, user_id: int, grade: int) -> Optional[Record]:
+    """
+    Picks today's puzzle for the user: random among the grade's active puzzles they have
+    never completed. Runs once per user per day (again only if they switch grade before solving it).
+    Returns the assignment like get_assignment, or None when the grade has nothing left
+    (even if an unsolved puzzle of another grade is still assigned for today).
+    """
+    await conn.execute(ASSIGN_SQL, user_id, grade)
+    assignment = await get_assignment(conn, user_id)
+    if assignment is None or (assignment['completed_at'] is None and assignment['grade'] != grade):
+        return None
+    return assignment
+
+
+async def mark_completed(conn, user_id: int, puzzle_id: int):
+    """Closes today's assignment; creates it if the puzzle was served before assignments existed."""
+    await conn.execute(COMPLETE_SQL, user_id, puzzle_id)
@@ -0,0 +1,141 @@
+"""
+Loads the puzzle banks (puzzles/grade*.json at the repository root) into the puzzles table.
+
+    python -m app.features.puzzles.importer [bank_dir]
+    POST /api/puzzles/import
+
+Entries listing several grades ("grades": [5, 6]) become one row per grade. Puzzles are
+identified by (grade, content_hash), so re-importing is idempotent and only touches
+what changed: new or edited puzzles are inserted, puzzles that left the bank of an
+imported grade are deactivated (kept for completion history), unchanged rows are not written.
+"""
+import asyncio
+import glob
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, Tuple
+import orjson
+
+PUZZLE_BANK_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "puzzles"))
+
+# Rows per COPY into the staging table
+IMPORT_BATCH_SIZE = 1000
+
+
+def iter_bank_files(bank_dir: str = PUZZLE_BANK_DIR) -> Iterator[str]:
+    return iter(sorted(glob.glob(os.path.join(bank_dir, "grade*.json"))))
+
+
+def iter_bank_rows(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yields (grade, content) for every puzzle of one bank file."""
+    with open(path, "rb") as f:
+        entries = orjson.loads(f.read())
+    for entry in entries:
+        content = {k: v for k, v in entry.items() if k != "grades"}
+        for grade in entry.get("grades") or []:
+            yield int(grade), content
+
+
+async def import_puzzle_banks(conn, bank_dir: str = PUZZLE_BANK_DIR) -> Dict[str, Any]:
+    """
+    Stages every bank row with COPY (one file in memory at a time), then applies the
+    difference to puzzles with set-based statements, all in one transaction.
+    """
+    start = time.perf_counter()
+    files = 0
+    rows = 0
+
+    async with conn.transaction():
+        await conn.execute("""
+            CREATE TEMP TABLE puzzle_import (grade INTEGER, content JSONB) ON COMMIT DROP
+        """)
+
+        for path in iter_bank_files(bank_dir):
+            files += 1
+            batch = []
+            for record in iter_bank_rows(path):
+                batch.append(record)
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    await conn.copy_records_to_table('puzzle_import', records=batch)
+                    rows += len(batch)
+                    batch = []
+            if batch:
+                await conn.copy_records_to_table('puzzle_import', records=batch)
+                rows += len(batch)
+
+        await conn.execute("""
+            CREATE TEMP TABLE puzzle_import_distinct ON COMMIT DROP AS
+            SELECT DISTINCT ON (grade, md5(content::text)) grade, content, md5(content::text) AS content_hash
+            FROM puzzle_import
+        """)
+        distinct = await conn.fetchval("SELECT COUNT(*) FROM puzzle_import_distinct")
+
+        inserted = await conn.execute("""
+            INSERT INTO puzzles (grade, content)
+            SELECT grade, content FROM puzzle_import_distinct
+            ON CONFLICT (grade, content_hash) DO NOTHING
+        """)
+
+        reactivated = await conn.execute("""
+            UPDATE puzzles p SET active = TRUE
+            FROM puzzle_import_distinct s
+            WHERE p.grade = s.grade AND p.content_hash = s.content_hash AND NOT p.active
+        """)
+
+        retired = await conn.execute("""
+            UPDATE puzzles p SET active = FALSE
+            WHERE p.active
+            AND p.grade IN (SELECT DISTINCT grade FROM puzzle_import_distinct)
+            AND NOT EXISTS (
+                SELECT 1 FROM puzzle_import_distinct s
+                WHERE s.grade = p.grade AND s.content_hash = p.content_hash
+            )
+        """)
+
+        grades = [r['grade'] for r in await conn.fetch("SELECT DISTINCT grade FROM puzzle_import_distinct ORDER BY grade")]
+
+    inserted = _row_count(inserted)
+    reactivated = _row_count(reactivated)
+    return {
+        "files": files,
+        "rows": rows,
+        "duplicates": rows - distinct,
+        "inserted": inserted,
+        "reactivated": reactivated,
+        "retired": _row_count(retired),
+        "unchanged": distinct - inserted - reactivated,
+        "grades": grades,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def _row_count(status: str) -> int:
+    # asyncpg status strings look like "INSERT 0 12" / "UPDATE 3"
+    return int(status.split()[-1])
+
+
+async def main(bank_dir: str):
+    import asyncpg
+    from app.core.config import settings
+    from app.db.codecs import register_json_codecs
+
+    conn = await asyncpg.connect(
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        database=settings.DB_NAME
+    )
+    try:
+        await register_json_codecs(conn)
+        result = await import_puzzle_banks(conn, bank_dir)
+        print(f"Imported {result['files']} files ({result['rows']} rows, {result['duplicates']} duplicates) "
+              f"in {result['seconds']}s: {result['inserted']} inserted, {result['reactivated']} reactivated, "
+              f"{result['retired']} retired, {result['unchanged']} unchanged")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else PUZZLE_BANK_DIR))
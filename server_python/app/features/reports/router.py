@@ -1,24 +1,73 @@
 from app.core.database import get_db_pool
+from app.core.identity import identity
+from app.core.phone import phone_last10
+from app.db.queries import queries
+from app.features.dashboard.aggregates import dashboard_aggregates
+from .summary import record_report
 from typing import Optional, Dict, Any
-import json
 from fastapi import APIRouter, HTTPException, Body
 
 router = APIRouter()
 
+# A student with this number first, else a parent (both served by the phone_last10 indexes)
+USER_BY_PHONE = queries.register("reports.user_by_phone", """
+    SELECT user_id FROM (
+        SELECT user_id, 1 AS preference FROM students WHERE phone_last10 = $1
+        UNION ALL
+        SELECT user_id, 2 AS preference FROM parents WHERE phone_last10 = $1
+    ) matches
+    WHERE user_id IS NOT NULL
+    ORDER BY preference
+    LIMIT 1
+""")
+# Fewer than 10 digits: a partial number, matched anywhere in the key as before phone_last10
+# existed. Unindexed (sequential scans), so only for these short inputs.
+USER_BY_PARTIAL_PHONE = queries.register("reports.user_by_partial_phone", """
+    SELECT user_id FROM (
+        SELECT user_id, 1 AS preference FROM students WHERE phone_last10 LIKE '%' || $1 || '%'
+        UNION ALL
+        SELECT user_id, 2 AS preference FROM parents WHERE phone_last10 LIKE '%' || $1 || '%'
+    ) matches
+    WHERE user_id IS NOT NULL
+    ORDER BY preference
+    LIMIT 1
+""")
+# The API shape of a report row (the typed columns generated from report_json are left out).
+# report_json is passed through as the stored text, which clients parse, so it is never decoded here.
+REPORT_COLUMNS = "report_id, user_id, category, report_json::text AS report_json, created_at"
+
+REPORTS_OF_USER = queries.register(
+    "reports.of_user", f"SELECT {REPORT_COLUMNS} FROM reports WHERE user_id = $1"
+)
+REPORTS_OF_CHILD = queries.register("reports.of_child", f"""
+    SELECT {REPORT_COLUMNS} FROM reports
+    WHERE (user_id = $1 OR user_id = $2)
+    AND child_id = $3
+""")
+REPORT_BY_ID = queries.register(
+    "reports.by_id", f"SELECT {REPORT_COLUMNS} FROM reports WHERE report_id = $1"
+)
+# Also returns what dashboard_aggregates.note_report needs
+INSERT_REPORT = queries.register("reports.insert", """
+    INSERT INTO reports (user_id, category, report_json) VALUES ($1, $2, $3)
+    RETURNING report_id, accuracy_percent,
+              (SELECT grade FROM students WHERE user_id = $1 LIMIT 1) AS grade
+""")
+
 @router.get("/")
 async def get_reports(uid: Optional[str] = None, childId: Optional[str] = None, phone: Optional[str] = None):
     pool = await get_db_pool()
     async with pool.acquire() as conn:
         if not uid and not phone:
              # Logic for Admin view (all reports)
-             rows = await conn.fetch("SELECT * FROM reports")
+             rows = await conn.fetch(f"SELECT {REPORT_COLUMNS} FROM reports")
              return {"success": True, "data": [dict(row) for row in rows]}
         
         user_id = None
         
         # Try lookup by firebase_uid first
         if uid:
-            user_id = await conn.fetchval("SELECT user_id FROM users WHERE firebase_uid = $1", uid)
+            user_id = await identity.get_user_id(conn, uid)
         
         if not user_id:
             # Check if uid is numeric and treat as user_id directly
@@ -26,23 +75,10 @@ async def get_reports(uid: Optional[str] = None, childId: Optional[str] = None,
             if uid and uid.isdigit() and len(uid) < 10:
                  user_id = await conn.fetchval("SELECT user_id FROM users WHERE user_id = $1", int(uid))
 
-            phone_to_search = phone or uid
-            if not user_id and phone_to_search:
-                # Normalize phone - keep last 10 digits
-                normalized_phone = ''.join(filter(str.isdigit, phone_to_search))[-10:]
-                # Search in students table for phone_number
-                user_id = await conn.fetchval(
-                    """SELECT s.user_id FROM students s 
-                       WHERE s.phone_number LIKE $1 OR s.phone_number LIKE $2""",
-                    f"%{normalized_phone}", f"%{normalized_phone}%"
-                )
-                # Also try parents table
-                if not user_id:
-                    user_id = await conn.fetchval(
-                        """SELECT p.user_id FROM parents p 
-                           WHERE p.phone_number LIKE $1 OR p.phone_number LIKE $2""",
-                        f"%{normalized_phone}", f"%{normalized_phone}%"
-                    )
+            phone_key = phone_last10(phone or uid)
+            if not user_id and phone_key:
+                lookup = USER_BY_PHONE if len(phone_key) == 10 else USER_BY_PARTIAL_PHONE
+                user_id = await queries.fetchval(conn, lookup, phone_key)
         
         if not user_id:
              return {"success": True, "data": []}
@@ -82,17 +118,11 @@ async def get_reports(uid: Optional[str] = None, childId: Optional[str] = None,
             # Either direct on their ID, or on parent's ID tagged with their childId.
             # Also need to handle string/int types for JSON matching if needed, but usually string in JSON.
             # Enforce filtering by childId in the JSON for both potential owners
-            query = """
-                SELECT * FROM reports 
-                WHERE (user_id = $1 OR user_id = $2)
-                AND report_json->>'childId' = $3
-            """
             # Validating if $2 (parent_user_id) is None is handled by Postgres (false) or Python logic
             # usage of OR with None is safe in SQL: (col = NULL) is null (falsy)
-            rows = await conn.fetch(query, user_id, parent_user_id, childId)
+            rows = await queries.fetch(conn, REPORTS_OF_CHILD, user_id, parent_user_id, childId)
         else:
-            query = "SELECT * FROM reports WHERE user_id = $1"
-            rows = await conn.fetch(query, user_id)
+            rows = await queries.fetch(conn, REPORTS_OF_USER, user_id)
             
         return {"success": True, "data": [dict(row) for row in rows]}
 
@@ -100,7 +130,7 @@ async def get_reports(uid: Optional[str] = None, childId: Optional[str] = None,
 async def get_report_by_id(report_id: int):
     pool = await get_db_pool()
     async with pool.acquire() as conn:
-        row = await conn.fetchrow("SELECT * FROM reports WHERE report_id = $1", report_id)
+        row = await queries.fetchrow(conn, REPORT_BY_ID, report_id)
         if not row:
             raise HTTPException(status_code=404, detail="Report not found")
         return {"success": True, "data": dict(row)}
@@ -118,7 +148,7 @@ async def save_report(
     pool = await get_db_pool()
     async with pool.acquire() as conn:
         # Get User ID
-        user_id = await conn.fetchval("SELECT user_id FROM users WHERE firebase_uid = $1", uid)
+        user_id = await identity.get_user_id(conn, uid)
         
         # If user doesn't exist (maybe first time saving report?), create user?
         # Or fail? Logic in Node implies simple push.
@@ -129,16 +159,18 @@ async def save_report(
                 "INSERT INTO users (name, role, firebase_uid) VALUES ($1, $2, $3) RETURNING user_id",
                 "Unknown", "student", uid
              )
+             identity.remember_user(uid, user_id, "student")
+             dashboard_aggregates.note_users(1)
         
         # Add childId to reportData if not present, to ensure queryability
         if childId:
             reportData['childId'] = childId
             
-        # Insert Report
-        report_json_str = json.dumps(reportData)
-        report_id = await conn.fetchval(
-            "INSERT INTO reports (user_id, category, report_json) VALUES ($1, $2, $3) RETURNING report_id",
-            user_id, category, report_json_str
-        )
-        
+        # Insert Report and fold it into the student's admin summary
+        async with conn.transaction():
+            inserted = await queries.fetchrow(conn, INSERT_REPORT, user_id, category, reportData)
+            report_id = inserted['report_id']
+            await record_report(conn, report_id, user_id, reportData.get('childId'))
+        dashboard_aggregates.note_report(inserted['accuracy_percent'], inserted['grade'])
+
         return {"success": True, "reportId": report_id}
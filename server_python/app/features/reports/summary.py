@@ -0,0 +1,188 @@
+"""
+Per-student report summaries (student_report_summary) for the admin student list.
+
+save_report records every new report with record_report, so the admin list reads one
+small row per student instead of every report body. The migration runner fills the table
+when it creates it. Deleting a student drops their row (ON DELETE CASCADE) and deleting a parent
+rebuilds their children's rows (users.router.delete_user); after any other bulk edit or
+delete of reports, rebuild the table with:
+
+    python -m app.features.reports.summary
+"""
+import asyncio
+from typing import List, Optional
+from app.core.identity import identity
+
+
+# Read from the typed columns generated from report_json (migration 0012): report_type is
+# 'rapid' or 'standard'; non-numeric marks and question counts count as 0
+REPORT_FIELDS_SQL = """
+    report_type AS kind,
+    COALESCE(accuracy_percent, 0) AS marks,
+    total_time AS time_taken,
+    COALESCE(total_questions, 0) AS total_questions
+"""
+
+SUMMARY_COLUMNS = """
+    student_id, standard_count, rapid_count,
+    latest_standard_report_id, latest_standard_marks, latest_standard_at,
+    latest_rapid_report_id, latest_rapid_marks, latest_rapid_time_taken,
+    latest_rapid_total_questions, latest_rapid_at
+"""
+
+# Folds one new report ($1) into its student's ($2) summary row
+RECORD_REPORT_SQL = f"""
+    INSERT INTO student_report_summary AS s ({SUMMARY_COLUMNS})
+    SELECT $2,
+           (r.kind = 'standard')::int, (r.kind = 'rapid')::int,
+           CASE WHEN r.kind = 'standard' THEN r.report_id END,
+           CASE WHEN r.kind = 'standard' THEN r.marks END,
+           CASE WHEN r.kind = 'standard' THEN r.created_at END,
+           CASE WHEN r.kind = 'rapid' THEN r.report_id END,
+           CASE WHEN r.kind = 'rapid' THEN r.marks END,
+           CASE WHEN r.kind = 'rapid' THEN r.time_taken END,
+           CASE WHEN r.kind = 'rapid' THEN r.total_questions END,
+           CASE WHEN r.kind = 'rapid' THEN r.created_at END
+    FROM (SELECT report_id, created_at, {REPORT_FIELDS_SQL} FROM reports WHERE report_id = $1) r
+    ON CONFLICT (student_id) DO UPDATE SET
+        standard_count = s.standard_count + EXCLUDED.standard_count,
+        rapid_count = s.rapid_count + EXCLUDED.rapid_count,
+        latest_standard_report_id = COALESCE(EXCLUDED.latest_standard_report_id, s.latest_standard_report_id),
+        latest_standard_marks = CASE WHEN EXCLUDED.latest_standard_report_id IS NULL
+                                     THEN s.latest_standard_marks ELSE EXCLUDED.latest_standard_marks END,
+        latest_standard_at = COALESCE(EXCLUDED.latest_standard_at, s.latest_standard_at),
+        latest_rapid_report_id = COALESCE(EXCLUDED.latest_rapid_report_id, s.latest_rapid_report_id),
+        latest_rapid_marks = CASE WHEN EXCLUDED.latest_rapid_report_id IS NULL
+                                  THEN s.latest_rapid_marks ELSE EXCLUDED.latest_rapid_marks END,
+        latest_rapid_time_taken = CASE WHEN EXCLUDED.latest_rapid_report_id IS NULL
+                                       THEN s.latest_rapid_time_taken ELSE EXCLUDED.latest_rapid_time_taken END,
+        latest_rapid_total_questions = CASE WHEN EXCLUDED.latest_rapid_report_id IS NULL
+                                            THEN s.latest_rapid_total_questions ELSE EXCLUDED.latest_rapid_total_questions END,
+        latest_rapid_at = COALESCE(EXCLUDED.latest_rapid_at, s.latest_rapid_at)
+"""
+
+
+def _rebuild_sql(reports_filter: str, students_filter: str) -> str:
+    """Summary rows recomputed from reports (same attribution as resolve_report_student)."""
+    return f"""
+        WITH classified AS (
+            SELECT COALESCE(own.student_id, child.student_id) AS student_id,
+                   r.report_id, r.created_at, {REPORT_FIELDS_SQL}
+            FROM reports r
+            LEFT JOIN LATERAL (
+                SELECT student_id FROM students WHERE user_id = r.user_id LIMIT 1
+            ) own ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT s.student_id
+                FROM students s
+                JOIN parents p ON s.parent_id = p.parent_id
+                WHERE own.student_id IS NULL
+                AND s.student_id::text = r.child_id
+                AND p.user_id = r.user_id
+            ) child ON TRUE
+            WHERE {reports_filter}
+        )
+        INSERT INTO student_report_summary ({SUMMARY_COLUMNS})
+        SELECT student_id,
+               COUNT(*) FILTER (WHERE kind = 'standard'),
+               COUNT(*) FILTER (WHERE kind = 'rapid'),
+               (ARRAY_AGG(report_id ORDER BY created_at DESC, report_id DESC) FILTER (WHERE kind = 'standard'))[1],
+               (ARRAY_AGG(marks ORDER BY created_at DESC, report_id DESC) FILTER (WHERE kind = 'standard'))[1],
+               MAX(created_at) FILTER (WHERE kind = 'standard'),
+               (ARRAY_AGG(report_id ORDER BY created_at DESC, report_id DESC) FILTER (WHERE kind = 'rapid'))[1],
+               (ARRAY_AGG(marks ORDER BY created_at DESC, report_id DESC) FILTER (WHERE kind = 'rapid'))[1],
+               (ARRAY_AGG(time_taken ORDER BY created_at DESC, report_id DESC) FILTER (WHERE kind = 'rapid'))[1],
+               (ARRAY_AGG(total_questions ORDER BY created_at DESC, report_id DESC) FILTER (WHERE kind = 'rapid'))[1],
+               MAX(created_at) FILTER (WHERE kind = 'rapid')
+        FROM classified
+        WHERE student_id IS NOT NULL AND {students_filter}
+        GROUP BY student_id
+    """
+
+
+# Every summary row
+REBUILD_SQL = _rebuild_sql("TRUE", "TRUE")
+
+# The rows of students $1 (int[]), from the reports they saved or that were saved for them
+REBUILD_STUDENTS_SQL = _rebuild_sql(
+    "(r.user_id IN (SELECT user_id FROM students WHERE student_id = ANY($1::int[]))"
+    " OR r.child_id = ANY($1::int[]::text[]))",
+    "student_id = ANY($1::int[])",
+)
+
+# Children of a parent user, whose rows count the reports that parent saved for them
+CHILDREN_OF_USER_SQL = """
+    SELECT s.student_id
+    FROM students s
+    JOIN parents p ON s.parent_id = p.parent_id
+    WHERE p.user_id = $1
+"""
+
+
+async def resolve_report_student(conn, user_id: int, child_id: Optional[str]) -> Optional[int]:
+    """
+    The student a report belongs to: the saving user's own student profile, else the
+    childId it was saved for when that child belongs to the saving parent.
+    """
+    student_id = await identity.get_student_id(conn, user_id)
+    if student_id is not None:
+        return student_id
+
+    if child_id is None or not str(child_id).isdigit():
+        return None
+    return await conn.fetchval("""
+        SELECT s.student_id
+        FROM students s
+        JOIN parents p ON s.parent_id = p.parent_id
+        WHERE s.student_id::text = $1 AND p.user_id = $2
+    """, str(child_id), user_id)
+
+
+async def record_report(conn, report_id: int, user_id: int, child_id: Optional[str]):
+    """Folds a just-inserted report into its student's summary. Call in the inserting transaction."""
+    student_id = await resolve_report_student(conn, user_id, child_id)
+    if student_id is not None:
+        await conn.execute(RECORD_REPORT_SQL, report_id, student_id)
+
+
+async def rebuild_report_summaries(conn) -> int:
+    async with conn.transaction():
+        await conn.execute("DELETE FROM student_report_summary")
+        status = await conn.execute(REBUILD_SQL)
+    return int(status.split()[-1])
+
+
+async def children_of_user(conn, user_id: int) -> List[int]:
+    """Students whose summaries include reports saved by this (parent) user."""
+    return [r['student_id'] for r in await conn.fetch(CHILDREN_OF_USER_SQL, user_id)]
+
+
+async def rebuild_student_summaries(conn, student_ids: List[int]):
+    """Recomputes the summary rows of these students, e.g. after some of their reports were deleted."""
+    if not student_ids:
+        return
+    async with conn.transaction():
+        await conn.execute("DELETE FROM student_report_summary WHERE student_id = ANY($1::int[])", student_ids)
+        await conn.execute(REBUILD_STUDENTS_SQL, student_ids)
+
+
+async def main():
+    import asyncpg
+    from app.core.config import settings
+
+    conn = await asyncpg.connect(
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        database=settings.DB_NAME
+    )
+    try:
+        total = await rebuild_report_summaries(conn)
+        print(f"Done. {total} student summaries rebuilt.")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
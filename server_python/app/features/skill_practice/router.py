@@ -1,5 +1,9 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, Body, Depends
+from app.core.config import settings
 from app.core.database import get_db_pool
+from app.core.identity import identity
+from app.db.queries import queries
 from typing import Optional, List
 from .schemas import (
     DayProgressCreate, 
@@ -11,7 +15,8 @@ from .schemas import (
     DayAnalytics,
     UserSkillAnalytics
 )
-import json
+from .writes import complete_day_assessment, log_practice_sessions
+from .write_behind import practice_writer
 from datetime import datetime
 
 router = APIRouter()
@@ -20,70 +25,78 @@ router = APIRouter()
 # ============== HELPER FUNCTIONS ==============
 
 async def get_user_id_from_uid(conn, uid: str) -> Optional[int]:
-    """Get user_id from firebase_uid"""
-    user_id = await conn.fetchval(
-        "SELECT user_id FROM users WHERE firebase_uid = $1", uid
-    )
-    return user_id
+    """Get user_id from firebase_uid (cached process-wide)"""
+    return await identity.get_user_id(conn, uid)
+
+
+# Set once the skill practice tables are known to exist in this process; handlers then skip the check
+_tables_ready = False
+_tables_lock = asyncio.Lock()
 
 
 async def ensure_tables_exist(conn):
-    """Create tables if they don't exist"""
-    # Day progress table - tracks assessment completion and aggregated practice stats
-    await conn.execute("""
-        CREATE TABLE IF NOT EXISTS skill_practice_progress (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER REFERENCES users(user_id),
-            report_id INTEGER NOT NULL,
-            day_number INTEGER NOT NULL,
-            category VARCHAR(255) NOT NULL,
-            assessment_completed BOOLEAN DEFAULT FALSE,
-            assessment_questions INTEGER DEFAULT 0,
-            assessment_correct INTEGER DEFAULT 0,
-            assessment_time_seconds INTEGER DEFAULT 0,
-            practice_count INTEGER DEFAULT 0,
-            total_practice_questions INTEGER DEFAULT 0,
-            total_practice_correct INTEGER DEFAULT 0,
-            total_practice_time_seconds INTEGER DEFAULT 0,
-            completed_at TIMESTAMP,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(user_id, report_id, day_number)
-        )
-    """)
-    
-    # Practice sessions table - individual practice session logs for analytics
-    await conn.execute("""
-        CREATE TABLE IF NOT EXISTS skill_practice_sessions (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER REFERENCES users(user_id),
-            report_id INTEGER NOT NULL,
-            day_number INTEGER NOT NULL,
-            category VARCHAR(255) NOT NULL,
-            session_type VARCHAR(20) NOT NULL DEFAULT 'practice',
-            questions_attempted INTEGER NOT NULL,
-            correct_answers INTEGER NOT NULL,
-            time_taken_seconds INTEGER NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # Create indices for performance
-    await conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_skill_progress_user 
-        ON skill_practice_progress(user_id)
-    """)
-    await conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_skill_progress_report 
-        ON skill_practice_progress(report_id)
-    """)
-    await conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_skill_sessions_user 
-        ON skill_practice_sessions(user_id)
-    """)
-    await conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_skill_sessions_report 
-        ON skill_practice_sessions(report_id)
-    """)
+    """
+    The tables come from migration 0010, applied by setup_db.py. The first call per process
+    confirms they exist (503 if the database was never migrated); every later call returns
+    without touching the database.
+    """
+    global _tables_ready
+    if _tables_ready:
+        return
+
+    async with _tables_lock:
+        if _tables_ready:
+            return
+        exists = await conn.fetchval("""
+            SELECT to_regclass('skill_practice_progress') IS NOT NULL
+               AND to_regclass('skill_practice_sessions') IS NOT NULL
+        """)
+        if not exists:
+            raise HTTPException(
+                status_code=503,
+                detail="Skill practice tables are missing; run setup_db.py to apply migrations"
+            )
+        _tables_ready = True
+
+
+PROGRESS_DAYS = queries.register("skill_practice.progress_days", """
+    SELECT day_number, category, assessment_completed, practice_count
+    FROM skill_practice_progress
+    WHERE user_id = $1 AND report_id = $2
+    ORDER BY day_number
+""")
+
+# Length of the report's learningPlan, without loading the report body (NULL: no plan)
+LEARNING_PLAN_DAYS = queries.register(
+    "skill_practice.learning_plan_days", "SELECT learning_plan_days FROM reports WHERE report_id = $1"
+)
+
+PROGRESS_ROWS = queries.register("skill_practice.progress_rows", """
+    SELECT * FROM skill_practice_progress
+    WHERE user_id = $1 AND report_id = $2
+    ORDER BY day_number
+""")
+
+SESSION_TOTALS = queries.register("skill_practice.session_totals", """
+    SELECT day_number, session_type,
+           COUNT(*) as count,
+           SUM(questions_attempted) as total_questions,
+           SUM(correct_answers) as total_correct,
+           SUM(time_taken_seconds) as total_time
+    FROM skill_practice_sessions
+    WHERE user_id = $1 AND report_id = $2
+    GROUP BY day_number, session_type
+""")
+
+# One statement for every filter combination: unset filters are passed as NULL.
+# The (user_id) index narrows the rows; the optional filters are cheap rechecks on top.
+SESSION_HISTORY = queries.register("skill_practice.session_history", """
+    SELECT * FROM skill_practice_sessions
+    WHERE user_id = $1 AND report_id = $2
+    AND ($3::int IS NULL OR day_number = $3)
+    AND ($4::text IS NULL OR session_type = $4)
+    ORDER BY created_at DESC LIMIT $5
+""")
 
 
 # ============== DAY PROGRESS ENDPOINTS ==============
@@ -103,27 +116,15 @@ async def get_all_days_progress(
             raise HTTPException(status_code=404, detail="User not found")
         
         # Get all progress records for this report
-        rows = await conn.fetch("""
-            SELECT day_number, category, assessment_completed, practice_count
-            FROM skill_practice_progress
-            WHERE user_id = $1 AND report_id = $2
-            ORDER BY day_number
-        """, user_id, report_id)
+        rows = await queries.fetch(conn, PROGRESS_DAYS, user_id, report_id)
         
         # Build response with unlock logic
         progress_map = {row['day_number']: dict(row) for row in rows}
         days = []
         
         # Get total days from report (learning plan)
-        report_row = await conn.fetchrow(
-            "SELECT report_json FROM reports WHERE report_id = $1", report_id
-        )
-        
-        total_days = 6  # Default
-        if report_row and report_row['report_json']:
-            report_data = report_row['report_json'] if isinstance(report_row['report_json'], dict) else json.loads(report_row['report_json'])
-            learning_plan = report_data.get('learningPlan', [])
-            total_days = len(learning_plan) if learning_plan else 6
+        plan_days = await queries.fetchval(conn, LEARNING_PLAN_DAYS, report_id)
+        total_days = plan_days or 6  # Default when the report has no learning plan
         
         for day_num in range(1, total_days + 1):
             progress = progress_map.get(day_num, {})
@@ -150,54 +151,20 @@ async def complete_assessment(
     uid: str = Body(...),
     data: DayProgressCreate = Body(...)
 ):
-    """Mark a day's assessment as completed"""
+    """Mark a day's assessment as completed (Day 1 always unlocked, others need previous complete)"""
     pool = await get_db_pool()
     async with pool.acquire() as conn:
         await ensure_tables_exist(conn)
-        
-        user_id = await get_user_id_from_uid(conn, uid)
+
+        user_id, completed = await complete_day_assessment(conn, uid, data, datetime.utcnow())
         if not user_id:
             raise HTTPException(status_code=404, detail="User not found")
-        
-        # Check if day is unlocked (Day 1 always unlocked, others need previous complete)
-        if data.day_number > 1:
-            prev_completed = await conn.fetchval("""
-                SELECT assessment_completed FROM skill_practice_progress
-                WHERE user_id = $1 AND report_id = $2 AND day_number = $3
-            """, user_id, data.report_id, data.day_number - 1)
-            
-            if not prev_completed:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Day {data.day_number - 1} assessment must be completed first"
-                )
-        
-        # Upsert progress record
-        await conn.execute("""
-            INSERT INTO skill_practice_progress 
-            (user_id, report_id, day_number, category, assessment_completed, 
-             assessment_questions, assessment_correct, assessment_time_seconds, completed_at)
-            VALUES ($1, $2, $3, $4, TRUE, $5, $6, $7, $8)
-            ON CONFLICT (user_id, report_id, day_number)
-            DO UPDATE SET 
-                assessment_completed = TRUE,
-                assessment_questions = $5,
-                assessment_correct = $6,
-                assessment_time_seconds = $7,
-                completed_at = $8
-        """, user_id, data.report_id, data.day_number, data.category,
-            data.questions_attempted, data.correct_answers, 
-            data.time_taken_seconds, datetime.utcnow())
-        
-        # Log this as a session too
-        await conn.execute("""
-            INSERT INTO skill_practice_sessions
-            (user_id, report_id, day_number, category, session_type,
-             questions_attempted, correct_answers, time_taken_seconds)
-            VALUES ($1, $2, $3, $4, 'assessment', $5, $6, $7)
-        """, user_id, data.report_id, data.day_number, data.category,
-            data.questions_attempted, data.correct_answers, data.time_taken_seconds)
-        
+        if not completed:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Day {data.day_number - 1} assessment must be completed first"
+            )
+
         return {"success": True, "message": f"Day {data.day_number} assessment completed"}
 
 
@@ -208,39 +175,47 @@ async def log_practice_session(
 ):
     """Log a practice session for analytics"""
     pool = await get_db_pool()
+
+    if practice_writer.running:
+        user = identity.cached_user(uid)
+        if user is None:
+            async with pool.acquire() as conn:
+                await ensure_tables_exist(conn)
+                user = await identity.load_user(conn, uid)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        # Acknowledged now, written by the next flush (the id is not known yet)
+        if practice_writer.offer(user['user_id'], data):
+            return {"success": True, "session_id": None, "queued": True}
+
+    async with pool.acquire() as conn:
+        await ensure_tables_exist(conn)
+
+        user_id, session_ids = await log_practice_sessions(conn, uid, [data])
+        if not user_id:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        return {"success": True, "session_id": session_ids[0]}
+
+
+@router.post("/log-practice/batch")
+async def log_practice_batch(
+    uid: str = Body(...),
+    sessions: List[PracticeSessionCreate] = Body(..., max_length=settings.SKILL_PRACTICE_MAX_BATCH)
+):
+    """Log several practice sessions at once (e.g. queued by the client while offline), in order"""
+    if not sessions:
+        return {"success": True, "session_ids": []}
+
+    pool = await get_db_pool()
     async with pool.acquire() as conn:
         await ensure_tables_exist(conn)
-        
-        user_id = await get_user_id_from_uid(conn, uid)
+
+        user_id, session_ids = await log_practice_sessions(conn, uid, sessions)
         if not user_id:
             raise HTTPException(status_code=404, detail="User not found")
-        
-        # Log the practice session
-        session_id = await conn.fetchval("""
-            INSERT INTO skill_practice_sessions
-            (user_id, report_id, day_number, category, session_type,
-             questions_attempted, correct_answers, time_taken_seconds)
-            VALUES ($1, $2, $3, $4, 'practice', $5, $6, $7)
-            RETURNING id
-        """, user_id, data.report_id, data.day_number, data.category,
-            data.questions_attempted, data.correct_answers, data.time_taken_seconds)
-        
-        # Update aggregated stats in progress table
-        await conn.execute("""
-            INSERT INTO skill_practice_progress 
-            (user_id, report_id, day_number, category, practice_count,
-             total_practice_questions, total_practice_correct, total_practice_time_seconds)
-            VALUES ($1, $2, $3, $4, 1, $5, $6, $7)
-            ON CONFLICT (user_id, report_id, day_number)
-            DO UPDATE SET 
-                practice_count = skill_practice_progress.practice_count + 1,
-                total_practice_questions = skill_practice_progress.total_practice_questions + $5,
-                total_practice_correct = skill_practice_progress.total_practice_correct + $6,
-                total_practice_time_seconds = skill_practice_progress.total_practice_time_seconds + $7
-        """, user_id, data.report_id, data.day_number, data.category,
-            data.questions_attempted, data.correct_answers, data.time_taken_seconds)
-        
-        return {"success": True, "session_id": session_id}
+
+        return {"success": True, "session_ids": session_ids}
 
 
 # ============== ANALYTICS ENDPOINTS ==============
@@ -260,24 +235,11 @@ async def get_skill_analytics(
             raise HTTPException(status_code=404, detail="User not found")
         
         # Get all progress records
-        progress_rows = await conn.fetch("""
-            SELECT * FROM skill_practice_progress
-            WHERE user_id = $1 AND report_id = $2
-            ORDER BY day_number
-        """, user_id, report_id)
-        
+        progress_rows = await queries.fetch(conn, PROGRESS_ROWS, user_id, report_id)
+
         # Get session counts
-        session_counts = await conn.fetch("""
-            SELECT day_number, session_type, 
-                   COUNT(*) as count,
-                   SUM(questions_attempted) as total_questions,
-                   SUM(correct_answers) as total_correct,
-                   SUM(time_taken_seconds) as total_time
-            FROM skill_practice_sessions
-            WHERE user_id = $1 AND report_id = $2
-            GROUP BY day_number, session_type
-        """, user_id, report_id)
-        
+        session_counts = await queries.fetch(conn, SESSION_TOTALS, user_id, report_id)
+
         # Build session lookup
         session_lookup = {}
         for row in session_counts:
@@ -370,24 +332,9 @@ async def get_practice_sessions(
         if not user_id:
             raise HTTPException(status_code=404, detail="User not found")
         
-        query = """
-            SELECT * FROM skill_practice_sessions
-            WHERE user_id = $1 AND report_id = $2
-        """
-        params = [user_id, report_id]
-        
-        if day_number:
-            query += f" AND day_number = ${len(params) + 1}"
-            params.append(day_number)
-        
-        if session_type:
-            query += f" AND session_type = ${len(params) + 1}"
-            params.append(session_type)
-        
-        query += f" ORDER BY created_at DESC LIMIT ${len(params) + 1}"
-        params.append(limit)
-        
-        rows = await conn.fetch(query, *params)
+        rows = await queries.fetch(
+            conn, SESSION_HISTORY, user_id, report_id, day_number or None, session_type or None, limit
+        )
         
         return [
             PracticeSessionResponse(
@@ -0,0 +1,221 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import asyncpg
+from app.core.config import settings
+from app.core.database import get_db_pool
+from app.db.queries import queries
+from .schemas import PracticeSessionCreate
+
+SESSION_COLUMNS = [
+    'user_id', 'report_id', 'day_number', 'category', 'session_type',
+    'questions_attempted', 'correct_answers', 'time_taken_seconds', 'created_at'
+]
+
+# Merged practice increments for many users, one array element per (user_id, report_id, day_number)
+ADD_PRACTICE_TOTALS = queries.register("skill_practice.add_practice_totals", """
+    INSERT INTO skill_practice_progress AS p
+    (user_id, report_id, day_number, category, practice_count,
+     total_practice_questions, total_practice_correct, total_practice_time_seconds)
+    SELECT * FROM unnest($1::int[], $2::int[], $3::int[], $4::text[], $5::int[], $6::int[], $7::int[], $8::int[])
+    ON CONFLICT (user_id, report_id, day_number)
+    DO UPDATE SET
+        practice_count = p.practice_count + EXCLUDED.practice_count,
+        total_practice_questions = p.total_practice_questions + EXCLUDED.total_practice_questions,
+        total_practice_correct = p.total_practice_correct + EXCLUDED.total_practice_correct,
+        total_practice_time_seconds = p.total_practice_time_seconds + EXCLUDED.total_practice_time_seconds
+""")
+
+# The database is unreachable rather than the data being bad: keep the batch and retry it
+TRANSIENT_ERRORS = (OSError, asyncio.TimeoutError, asyncpg.InterfaceError, asyncpg.PostgresConnectionError)
+
+
+class PracticeEvent(NamedTuple):
+    user_id: int
+    session: PracticeSessionCreate
+    created_at: datetime
+
+
+def merge_progress(events: List[PracticeEvent]) -> Dict[Tuple[int, int, int], List[Any]]:
+    """(user_id, report_id, day_number) -> [category, sessions, questions, correct, seconds].
+    The first event's category is kept, as the per-request upsert would on insert."""
+    totals: Dict[Tuple[int, int, int], List[Any]] = {}
+    for event in events:
+        s = event.session
+        key = (event.user_id, s.report_id, s.day_number)
+        total = totals.setdefault(key, [s.category, 0, 0, 0, 0])
+        total[1] += 1
+        total[2] += s.questions_attempted
+        total[3] += s.correct_answers
+        total[4] += s.time_taken_seconds
+    return totals
+
+
+class PracticeWriteBehind:
+    """
+    In-process write-behind buffer for practice sessions (SKILL_PRACTICE_WRITE_BEHIND).
+
+    POST /log-practice hands sessions to offer() and returns without touching the database.
+    A background task flushes the buffer every flush_interval_ms, or as soon as flush_max_events
+    are waiting: the sessions are COPYed into skill_practice_sessions and their progress
+    increments, merged per (user_id, report_id, day_number), applied by one upsert, in one
+    transaction. stop() flushes whatever is left, so a clean shutdown loses nothing; events
+    still buffered when the process is killed are lost, which is the trade-off for the fast ack.
+    """
+
+    def __init__(self, enabled: bool, flush_interval_ms: int, flush_max_events: int, max_pending: int):
+        self.enabled = enabled
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_max_events = flush_max_events
+        self.max_pending = max_pending
+        self._events: List[PracticeEvent] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.enqueued = 0
+        self.rejected = 0
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.max_depth = 0
+        self.last_flush_size = 0
+        self.total_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._stopping
+
+    def start(self):
+        if not self.enabled or self._task is not None:
+            return
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flusher and write out everything still buffered."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        await self._task
+        self._task = None
+        try:
+            await self.flush()
+        except TRANSIENT_ERRORS as e:
+            print(f"Practice write-behind final flush failed: {e}")
+        if self._events:
+            print(f"Practice write-behind: {len(self._events)} sessions could not be written at shutdown")
+
+    def offer(self, user_id: int, session: PracticeSessionCreate) -> bool:
+        """Buffer a session. False when the buffer is not running or full; write it synchronously then."""
+        if not self.running or len(self._events) >= self.max_pending:
+            self.rejected += 1
+            return False
+        self._events.append(PracticeEvent(user_id, session, datetime.utcnow()))
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, len(self._events))
+        if len(self._events) >= self.flush_max_events:
+            self._wake.set()
+        return True
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                # Never let the flusher die; the batch stays buffered for the next attempt
+                print(f"Practice write-behind flush failed: {e}")
+
+    async def flush(self):
+        if self._flush_lock is None:
+            return
+        async with self._flush_lock:
+            while self._events:
+                batch = self._events[:self.flush_max_events]
+                del self._events[:len(batch)]
+                started_at = time.perf_counter()
+                try:
+                    await self._write(batch)
+                except TRANSIENT_ERRORS:
+                    self.failed_flushes += 1
+                    self._events[:0] = batch
+                    raise
+                except asyncpg.PostgresError as e:
+                    # Something in the batch is rejected (e.g. a deleted user): write one by one
+                    self.failed_flushes += 1
+                    print(f"Practice write-behind batch rejected ({e}); retrying sessions individually")
+                    await self._write_individually(batch)
+                else:
+                    self.written += len(batch)
+                self.flushes += 1
+                self.last_flush_size = len(batch)
+                elapsed_ms = (time.perf_counter() - started_at) * 1000
+                self.total_flush_ms += elapsed_ms
+                self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+
+    async def _write_individually(self, batch: List[PracticeEvent]):
+        for i, event in enumerate(batch):
+            try:
+                await self._write([event])
+                self.written += 1
+            except TRANSIENT_ERRORS:
+                self._events[:0] = batch[i:]
+                raise
+            except asyncpg.PostgresError as e:
+                self.dropped += 1
+                print(f"Practice write-behind dropped session for user {event.user_id}: {e}")
+
+    async def _write(self, batch: List[PracticeEvent]):
+        totals = merge_progress(batch)
+        pool = await get_db_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.copy_records_to_table('skill_practice_sessions', columns=SESSION_COLUMNS, records=[
+                    (e.user_id, e.session.report_id, e.session.day_number, e.session.category, 'practice',
+                     e.session.questions_attempted, e.session.correct_answers, e.session.time_taken_seconds,
+                     e.created_at)
+                    for e in batch
+                ])
+                await queries.execute(
+                    conn, ADD_PRACTICE_TOTALS,
+                    [key[0] for key in totals],
+                    [key[1] for key in totals],
+                    [key[2] for key in totals],
+                    *([total[i] for total in totals.values()] for i in range(5))
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "depth": len(self._events),
+            "maxDepth": self.max_depth,
+            "maxPending": self.max_pending,
+            "enqueued": self.enqueued,
+            "rejected": self.rejected,
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "failedFlushes": self.failed_flushes,
+            "lastFlushSize": self.last_flush_size,
+            "avgFlushMs": round(self.total_flush_ms / self.flushes, 3) if self.flushes else 0.0,
+            "maxFlushMs": round(self.max_flush_ms, 3),
+        }
+
+
+practice_writer = PracticeWriteBehind(
+    enabled=settings.SKILL_PRACTICE_WRITE_BEHIND,
+    flush_interval_ms=settings.SKILL_PRACTICE_FLUSH_INTERVAL_MS,
+    flush_max_events=settings.SKILL_PRACTICE_FLUSH_MAX_EVENTS,
+    max_pending=settings.SKILL_PRACTICE_MAX_PENDING,
+)
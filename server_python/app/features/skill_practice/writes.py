@@ -0,0 +1,119 @@
+"""
+Skill practice submissions, each written by a single statement.
+
+Every statement resolves the firebase_uid, inserts the session row(s) and folds them into
+skill_practice_progress in one round trip, so a submission is atomic and there is no window
+between the unlock check, the upsert and the session insert for a concurrent submission
+to slip through.
+"""
+from typing import List, Optional, Tuple
+from app.db.queries import queries
+from .schemas import DayProgressCreate, PracticeSessionCreate
+
+# Returns user_id (NULL: unknown uid) and completed (false: previous day not completed yet)
+COMPLETE_ASSESSMENT = queries.register("skill_practice.complete_assessment", """
+    WITH u AS (
+        SELECT user_id FROM users WHERE firebase_uid = $1
+    ),
+    unlocked AS (
+        SELECT u.user_id FROM u
+        WHERE $3::int <= 1 OR EXISTS (
+            SELECT 1 FROM skill_practice_progress p
+            WHERE p.user_id = u.user_id AND p.report_id = $2 AND p.day_number = $3 - 1
+            AND p.assessment_completed
+        )
+    ),
+    progress AS (
+        INSERT INTO skill_practice_progress
+        (user_id, report_id, day_number, category, assessment_completed,
+         assessment_questions, assessment_correct, assessment_time_seconds, completed_at)
+        SELECT user_id, $2, $3, $4, TRUE, $5, $6, $7, $8 FROM unlocked
+        ON CONFLICT (user_id, report_id, day_number)
+        DO UPDATE SET
+            assessment_completed = TRUE,
+            assessment_questions = EXCLUDED.assessment_questions,
+            assessment_correct = EXCLUDED.assessment_correct,
+            assessment_time_seconds = EXCLUDED.assessment_time_seconds,
+            completed_at = EXCLUDED.completed_at
+        RETURNING user_id
+    ),
+    session AS (
+        INSERT INTO skill_practice_sessions
+        (user_id, report_id, day_number, category, session_type,
+         questions_attempted, correct_answers, time_taken_seconds)
+        SELECT user_id, $2, $3, $4, 'assessment', $5, $6, $7 FROM unlocked
+    )
+    SELECT (SELECT user_id FROM u) AS user_id, EXISTS (SELECT 1 FROM progress) AS completed
+""")
+
+# Practice sessions for one user, passed as parallel arrays ($2..$7) in submission order.
+# Sessions for the same day are summed before the upsert, which can touch each row once.
+# Returns user_id (NULL: unknown uid, nothing written) and the new session ids in order.
+LOG_PRACTICE_SESSIONS = queries.register("skill_practice.log_practice_sessions", """
+    WITH u AS (
+        SELECT user_id FROM users WHERE firebase_uid = $1
+    ),
+    input AS (
+        SELECT *
+        FROM unnest($2::int[], $3::int[], $4::text[], $5::int[], $6::int[], $7::int[])
+             WITH ORDINALITY AS t(report_id, day_number, category, questions, correct, seconds, ord)
+    ),
+    sessions AS (
+        INSERT INTO skill_practice_sessions
+        (user_id, report_id, day_number, category, session_type,
+         questions_attempted, correct_answers, time_taken_seconds)
+        SELECT u.user_id, i.report_id, i.day_number, i.category, 'practice',
+               i.questions, i.correct, i.seconds
+        FROM u, input i
+        ORDER BY i.ord
+        RETURNING id
+    ),
+    per_day AS (
+        SELECT report_id, day_number,
+               (ARRAY_AGG(category ORDER BY ord))[1] AS category,
+               COUNT(*)::int AS sessions,
+               SUM(questions)::int AS questions,
+               SUM(correct)::int AS correct,
+               SUM(seconds)::int AS seconds
+        FROM input
+        GROUP BY report_id, day_number
+    ),
+    progress AS (
+        INSERT INTO skill_practice_progress AS p
+        (user_id, report_id, day_number, category, practice_count,
+         total_practice_questions, total_practice_correct, total_practice_time_seconds)
+        SELECT u.user_id, d.report_id, d.day_number, d.category, d.sessions,
+               d.questions, d.correct, d.seconds
+        FROM u, per_day d
+        ON CONFLICT (user_id, report_id, day_number)
+        DO UPDATE SET
+            practice_count = p.practice_count + EXCLUDED.practice_count,
+            total_practice_questions = p.total_practice_questions + EXCLUDED.total_practice_questions,
+            total_practice_correct = p.total_practice_correct + EXCLUDED.total_practice_correct,
+            total_practice_time_seconds = p.total_practice_time_seconds + EXCLUDED.total_practice_time_seconds
+    )
+    SELECT (SELECT user_id FROM u) AS user_id, ARRAY(SELECT id FROM sessions ORDER BY id) AS session_ids
+""")
+
+
+async def complete_day_assessment(conn, uid: str, data: DayProgressCreate, completed_at) -> Tuple[Optional[int], bool]:
+    """(user_id, completed): user_id is None for an unknown uid; completed is False when the day is still locked."""
+    row = await queries.fetchrow(
+        conn, COMPLETE_ASSESSMENT, uid, data.report_id, data.day_number, data.category,
+        data.questions_attempted, data.correct_answers, data.time_taken_seconds, completed_at
+    )
+    return row['user_id'], row['completed']
+
+
+async def log_practice_sessions(conn, uid: str, sessions: List[PracticeSessionCreate]) -> Tuple[Optional[int], List[int]]:
+    """(user_id, session_ids in submission order); user_id is None for an unknown uid."""
+    row = await queries.fetchrow(
+        conn, LOG_PRACTICE_SESSIONS, uid,
+        [s.report_id for s in sessions],
+        [s.day_number for s in sessions],
+        [s.category for s in sessions],
+        [s.questions_attempted for s in sessions],
+        [s.correct_answers for s in sessions],
+        [s.time_taken_seconds for s in sessions],
+    )
+    return row['user_id'], list(row['session_ids'])
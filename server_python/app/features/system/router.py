@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+from app.core.database import db
+from app.core.http_cache import http_cache
+from app.core.identity import identity
+from app.core.passwords import hasher
+from app.core.security import token_verifier
+from app.features.dashboard.aggregates import dashboard_aggregates
+from app.db.queries import queries
+from app.features.neet.sampler import sampler
+from app.features.skill_practice.write_behind import practice_writer
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    In-process counters for this worker (caches, pools, queues).
+    Each worker process reports its own numbers.
+    """
+    return {
+        "dashboardAggregates": dashboard_aggregates.stats(),
+        "dbPool": db.stats(),
+        "httpCache": http_cache.stats(),
+        "identityCache": identity.stats(),
+        "neetSampler": sampler.stats(),
+        "passwordHasher": hasher.stats(),
+        "practiceWriteBehind": practice_writer.stats(),
+        "queries": queries.stats(),
+        "tokenCache": token_verifier.stats(),
+    }
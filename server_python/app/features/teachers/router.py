@@ -1,5 +1,7 @@
-from fastapi import APIRouter, HTTPException, Body, Query
+from fastapi import APIRouter, HTTPException, Body, Query, Response
 from app.core.database import get_db_pool
+from app.core.http_cache import http_cache
+from app.core.identity import identity
 from typing import List, Dict, Any, Optional
 
 router = APIRouter()
@@ -13,62 +15,109 @@ GRADE_COLUMN_MAP = {
     "SAT": "sat", "NEET": "neet", "CET": "cet", "JEE Mains": "jee_mains", "JEE Adv": "jee_adv"
 }
 
-@router.get("/")
-async def get_all_teachers():
+# Sortable columns of GET /api/teachers/ (client name -> SQL expression)
+TEACHER_SORT_COLUMNS = {
+    "name": "u.name",
+    "createdAt": "u.created_at",
+    "schoolName": "t.school",
+    "totalStudents": "student_count",
+    "assignedGradesCount": "CARDINALITY(assigned_grades)",
+}
+
+# Decodes a teaching row's grade flags into the list of GRADE_COLUMN_MAP labels, in map order
+ASSIGNED_GRADES_SQL = "ARRAY_REMOVE(ARRAY[{}], NULL)".format(", ".join(
+    f"CASE WHEN tp.{col} THEN '{grade}' END" for grade, col in GRADE_COLUMN_MAP.items()
+))
+
+def teacher_list_sql(sort: str = "createdAt", order: str = "desc") -> str:
+    """
+    Teachers with their student count, assigned grades and ticket code in one statement,
+    however many teachers there are. Each row also carries total_count (rows before paging);
+    $1/$2 are LIMIT/OFFSET.
+    """
+    sort_sql = TEACHER_SORT_COLUMNS[sort]
+    direction = "ASC" if order == "asc" else "DESC"
+    return f"""
+        SELECT t.teacher_id, t.school, u.user_id, u.firebase_uid, u.name, u.created_at,
+               t.email_id as teacher_email, t.phone_number as teacher_phone,
+               COALESCE(m.student_count, 0) AS student_count,
+               c.username AS ticket_code,
+               COALESCE(g.assigned_grades, ARRAY[]::text[]) AS assigned_grades,
+               COUNT(*) OVER () AS total_count
+        FROM teachers t
+        JOIN users u ON t.user_id = u.user_id
+        LEFT JOIN LATERAL (
+            SELECT COUNT(*) AS student_count FROM mentorship WHERE mentor_id = t.teacher_id
+        ) m ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT {ASSIGNED_GRADES_SQL} AS assigned_grades
+            FROM teaching tp WHERE tp.teacher_id = t.teacher_id
+            LIMIT 1
+        ) g ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT username FROM credentials WHERE user_id = u.user_id LIMIT 1
+        ) c ON TRUE
+        ORDER BY {sort_sql} {direction} NULLS LAST, t.teacher_id {direction}
+        LIMIT $1 OFFSET $2
+    """
+
+
+# X-Total-Count when the page is empty: total_count rides on the rows, so an offset past
+# the end has nothing to read it from
+TEACHER_COUNT_SQL = "SELECT COUNT(*) FROM teachers t JOIN users u ON t.user_id = u.user_id"
+
+
+async def fetch_teacher_list(
+    conn,
+    sort: str = "createdAt",
+    order: str = "desc",
+    limit: Optional[int] = None,
+    offset: int = 0
+):
+    """One page of teacher_list_sql."""
+    return await conn.fetch(teacher_list_sql(sort, order), limit, offset)
+
+@router.get("/", dependencies=[http_cache.versioned(
+    "teachers.list", tables=["teachers", "users", "teaching", "mentorship", "credentials"]
+)])
+async def get_all_teachers(
+    response: Response,
+    sort: str = Query("createdAt", pattern="^(" + "|".join(TEACHER_SORT_COLUMNS) + ")$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0)
+):
     """
     Get all teachers with their stats (assigned grades count, student count).
+    Optional paging via limit/offset; X-Total-Count carries the number of teachers.
     """
     pool = await get_db_pool()
     async with pool.acquire() as conn:
-        # Fetch teachers with basic info
-        # We need to join with users to get name/email/phone
-        # And aggregate mentorships/grades
-        
-        # 1. Basic Teacher Info
-        teachers = await conn.fetch("""
-            SELECT t.teacher_id, t.school, t.subject, u.user_id, u.firebase_uid, u.name, u.role, u.created_at,
-                   t.email_id as teacher_email, t.phone_number as teacher_phone
-            FROM teachers t
-            JOIN users u ON t.user_id = u.user_id
-        """)
-        
-        results = []
-        for t in teachers:
-            t_id = t['teacher_id']
-            
-            # 2. Get Student Count
-            student_count = await conn.fetchval("""
-                SELECT COUNT(*) FROM mentorship WHERE mentor_id = $1
-            """, t_id)
-            
-            # 3. Get Assigned Grades (from teaching table)
-            teaching_profile = await conn.fetchrow("SELECT * FROM teaching WHERE teacher_id = $1", t_id)
-            assigned_grades = []
-            if teaching_profile:
-                for grade_str, col_name in GRADE_COLUMN_MAP.items():
-                    if teaching_profile.get(col_name):
-                        assigned_grades.append(grade_str)
-            
-            # 4. Get ticket code (username from credentials) - optional but used in frontend
-            # Assuming username in credentials is the ticket code
-            ticket_code = await conn.fetchval("""
-                SELECT username FROM credentials WHERE user_id = $1
-            """, t['user_id'])
-            
-            results.append({
-                "uid": t['firebase_uid'] or str(t['user_id']), # Use firebase_uid as key
-                "name": t['name'],
-                "email": t['teacher_email'],
-                "phoneNumber": t['teacher_phone'],
-                "schoolName": t['school'],
-                "ticketCode": ticket_code or "N/A",
-                "totalStudents": student_count,
-                "assignedGradesCount": len(assigned_grades),
-                "assignedGrades": assigned_grades,
-                "createdAt": t['created_at'].isoformat() if t['created_at'] else None
-            })
-            
-        return results
+        teachers = await fetch_teacher_list(conn, sort, order, limit, offset)
+        if teachers:
+            total = teachers[0]['total_count']
+        else:
+            total = await conn.fetchval(TEACHER_COUNT_SQL) if offset else 0
+
+    response.headers["X-Total-Count"] = str(total)
+
+    results = []
+    for t in teachers:
+        assigned_grades = list(t['assigned_grades'])
+        results.append({
+            "uid": t['firebase_uid'] or str(t['user_id']), # Use firebase_uid as key
+            "name": t['name'],
+            "email": t['teacher_email'],
+            "phoneNumber": t['teacher_phone'],
+            "schoolName": t['school'],
+            "ticketCode": t['ticket_code'] or "N/A",
+            "totalStudents": t['student_count'],
+            "assignedGradesCount": len(assigned_grades),
+            "assignedGrades": assigned_grades,
+            "createdAt": t['created_at'].isoformat() if t['created_at'] else None
+        })
+
+    return results
 
 @router.get("/{uid}")
 async def get_teacher_details(uid: str):
@@ -219,14 +268,8 @@ async def assign_students(uid: str, payload: Dict[str, Any] = Body(...)):
             else:
                  # Lookup student by user firebase UID
                  # Assuming single student per user for legacy
-                 student_row = await conn.fetchrow("""
-                    SELECT s.student_id FROM students s
-                    JOIN users u ON s.user_id = u.user_id
-                    WHERE u.firebase_uid = $1
-                    LIMIT 1
-                 """, s.get('uid'))
-                 if student_row:
-                     student_db_id = student_row['student_id']
+                 student_user_id = await identity.get_user_id(conn, s.get('uid'))
+                 student_db_id = await identity.get_student_id(conn, student_user_id)
             
             if student_db_id:
                 # Insert into mentorship
@@ -269,16 +312,11 @@ async def remove_student(uid: str, student_uid: str):
             WHERE u.firebase_uid = $1
         """, uid)
          
-         student_row = await conn.fetchrow("""
-            SELECT s.student_id FROM students s
-            JOIN users u ON s.user_id = u.user_id
-            WHERE u.firebase_uid = $1
-            LIMIT 1
-         """, student_uid)
+         student_user_id = await identity.get_user_id(conn, student_uid)
+         s_id = await identity.get_student_id(conn, student_user_id)
          
-         if teacher_row and student_row:
+         if teacher_row and s_id:
              t_id = teacher_row['teacher_id']
-             s_id = student_row['student_id']
              
              await conn.execute("DELETE FROM mentorship WHERE mentor_id = $1 AND mentee_id = $2", t_id, s_id)
              # Unset in students table too if it matches
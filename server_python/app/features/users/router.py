@@ -1,5 +1,8 @@
 from fastapi import APIRouter, HTTPException, Path, Body
 from app.core.database import get_db_pool
+from app.core.identity import identity
+from app.features.dashboard.aggregates import dashboard_aggregates
+from app.features.reports.summary import children_of_user, rebuild_student_summaries
 from app.features.users.schemas import StudentCreate, TeacherCreate, ParentCreate, GuestCreate
 from typing import Dict, Any
 
@@ -32,7 +35,14 @@ async def delete_user(uid: str):
         # Ensure schema.sql uses ON DELETE CASCADE.
         # "user_id INTEGER REFERENCES users(user_id) ON DELETE CASCADE" - Yes they do.
         
-        await conn.execute("DELETE FROM users WHERE user_id = $1", user_id)
+        async with conn.transaction():
+            # A parent's reports go with them; their children keep their rows, recounted below
+            children = await children_of_user(conn, user_id)
+            await conn.execute("DELETE FROM users WHERE user_id = $1", user_id)
+            await rebuild_student_summaries(conn, children)
+        identity.invalidate(uid=uid, user_id=user_id)
+        # Cascaded rows (students, reports) are not tracked individually: reload the totals
+        dashboard_aggregates.invalidate()
         
     return {"success": True, "message": "User deleted"}
 
@@ -125,6 +135,7 @@ async def add_child(uid: str, child_data: Dict[str, Any] = Body(...)):
                 
                 user_id = user_row['user_id']
                 role = user_row['role']
+                upgraded = role != 'parent'
                 
                 # Ensure User is a Parent (Upgrade if Student/Guest/New)
                 if role != 'parent':
@@ -134,7 +145,7 @@ async def add_child(uid: str, child_data: Dict[str, Any] = Body(...)):
                     role = 'parent'
 
                 # Ensure Parent Record Exists
-                parent_id = await conn.fetchval("SELECT parent_id FROM parents WHERE user_id = $1", user_id)
+                parent_id = await identity.get_parent_id(conn, user_id)
                 if not parent_id:
                     # Create parent profile
                     parent_phone = child_data.get('parentPhone') or child_data.get('phoneNumber')
@@ -180,7 +191,10 @@ async def add_child(uid: str, child_data: Dict[str, Any] = Body(...)):
                 )
 
                 child_data['student_id'] = student_id
-                
+
+        if upgraded:
+            identity.invalidate(uid=uid, user_id=user_id)
+        dashboard_aggregates.note_users(1, students=1)
         return {"success": True, "message": "Child added", "data": child_data}
     except Exception as e:
         print(f"Error in add_child: {str(e)}") # Log to console
@@ -192,7 +206,7 @@ async def update_child(uid: str, child_id: str, updates: Dict[str, Any] = Body(.
     async with pool.acquire() as conn:
         async with conn.transaction():
              # Get User
-            user_row = await conn.fetchrow("SELECT user_id, role FROM users WHERE firebase_uid = $1", uid)
+            user_row = await identity.get_user(conn, uid)
             if not user_row:
                  raise HTTPException(status_code=404, detail="User not found")
             
@@ -209,7 +223,7 @@ async def update_child(uid: str, child_id: str, updates: Dict[str, Any] = Body(.
                 raise HTTPException(status_code=400, detail="Invalid child ID format")
 
             # Check if this student belongs to this parent
-            parent_id = await conn.fetchval("SELECT parent_id FROM parents WHERE user_id = $1", user_id)
+            parent_id = await identity.get_parent_id(conn, user_id)
             if not parent_id:
                 raise HTTPException(status_code=404, detail="Parent profile not found")
 
@@ -254,7 +268,7 @@ async def update_profile(uid: str, updates: Dict[str, Any] = Body(...)):
     async with pool.acquire() as conn:
         async with conn.transaction():
             # Get User ID and Role
-            user_row = await conn.fetchrow("SELECT user_id, role FROM users WHERE firebase_uid = $1", uid)
+            user_row = await identity.get_user(conn, uid)
             if not user_row:
                 raise HTTPException(status_code=404, detail="User not found")
             
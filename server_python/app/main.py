@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.features.auth.router import router as auth_router
@@ -9,10 +10,39 @@ from app.features.lottery.router import router as lottery_router
 from app.features.neet.router import router as neet_router
 from app.features.teachers.router import router as teachers_router
 from app.features.skill_practice.router import router as skill_practice_router
+from app.features.system.router import router as system_router
 
 from app.core.config import settings
+from app.core.database import db
+from app.core.http_cache import HttpCacheMiddleware
+from app.core.passwords import hasher
+from app.core.responses import ORJSONResponse
+from app.features.dashboard.aggregates import dashboard_aggregates
+from app.features.skill_practice.write_behind import practice_writer
 
-app = FastAPI(title="SkillBuilder API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the pool before serving so the first request does not pay for connection setup
+    await db.connect()
+    hasher.start()
+    practice_writer.start()
+    dashboard_aggregates.start()
+    try:
+        yield
+    finally:
+        await dashboard_aggregates.stop()
+        # Flush buffered practice sessions while the pool is still open
+        await practice_writer.stop()
+        await db.disconnect()
+
+
+app = FastAPI(
+    title="SkillBuilder API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # CORS
 origins = [
@@ -20,12 +50,17 @@ origins = [
     "http://localhost:3000",  # Next.js default (just in case)
 ]
 
+# ETag headers and gzip for the endpoints depending on http_cache.versioned; added before
+# CORSMiddleware so it runs inside it
+app.add_middleware(HttpCacheMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Data-Age"],
 )
 
 # Include Routers
@@ -38,6 +73,7 @@ app.include_router(lottery_router, prefix="/api/lottery", tags=["Lottery"])
 app.include_router(neet_router, prefix="/api/neet", tags=["NEET"])
 app.include_router(teachers_router, prefix="/api/teachers", tags=["Teachers"])
 app.include_router(skill_practice_router, prefix="/api/skill-practice", tags=["Skill Practice"])
+app.include_router(system_router, prefix="/api/system", tags=["System"])
 
 @app.get("/")
 async def root():
@@ -0,0 +1,67 @@
+"""
+GET /api/dashboard/admin/stats and /admin/charts: per-request aggregates vs dashboard_aggregates.
+
+    python -m benchmarks.admin_dashboard [iterations]
+
+The legacy path runs the original full-table aggregates on every call, so its latency grows
+with reports/users. The in-memory path is timed through the app after one reconcile; its
+cost depends only on the number of grades and months, not on table sizes.
+"""
+import asyncio
+import sys
+import httpx
+from app.core.database import db
+from app.features.dashboard.aggregates import dashboard_aggregates
+from app.main import app
+from benchmarks.common import print_latency, time_calls
+
+LEGACY_STATS = [
+    "SELECT COUNT(*) FROM students",
+    "SELECT COUNT(*) FROM reports",
+    """SELECT AVG(CAST(report_json->'summary'->>'accuracyPercent' AS NUMERIC)) FROM reports
+       WHERE report_json->'summary'->>'accuracyPercent' IS NOT NULL""",
+    """SELECT COUNT(*) FROM reports
+       WHERE CAST(report_json->'summary'->>'accuracyPercent' AS NUMERIC) = 100""",
+]
+LEGACY_CHARTS = [
+    """SELECT s.grade, AVG(CAST(r.report_json->'summary'->>'accuracyPercent' AS NUMERIC))
+       FROM reports r JOIN students s ON r.user_id = s.user_id
+       WHERE r.report_json->'summary'->>'accuracyPercent' IS NOT NULL
+       GROUP BY s.grade""",
+    """SELECT TO_CHAR(created_at, 'YYYY-MM') as month, COUNT(*) FROM users
+       WHERE role = 'student' OR role = 'parent' GROUP BY month ORDER BY month""",
+]
+
+
+async def main(iterations: int):
+    await db.connect()
+    try:
+        async with db.acquire() as conn:
+            reports = await conn.fetchval("SELECT COUNT(*) FROM reports")
+            users = await conn.fetchval("SELECT COUNT(*) FROM users")
+            print(f"{reports} reports, {users} users")
+
+            async def legacy(statements):
+                for statement in statements:
+                    await conn.fetch(statement)
+
+            print_latency("legacy stats", await time_calls(lambda: legacy(LEGACY_STATS), iterations))
+            print_latency("legacy charts", await time_calls(lambda: legacy(LEGACY_CHARTS), iterations))
+
+        await dashboard_aggregates.reconcile()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print_latency("in-memory stats", await time_calls(
+                lambda: client.get("/api/dashboard/admin/stats"), iterations
+            ))
+            print_latency("in-memory charts", await time_calls(
+                lambda: client.get("/api/dashboard/admin/charts"), iterations
+            ))
+        print(f"aggregates: {dashboard_aggregates.stats()}")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 200))
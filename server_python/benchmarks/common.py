@@ -0,0 +1,41 @@
+import time
+import asyncpg
+from app.core.config import settings
+from app.db.codecs import register_json_codecs
+
+async def connect() -> asyncpg.Connection:
+    """A connection set up like the pool's, minus the prepared statements (JSON codecs registered)."""
+    conn = await asyncpg.connect(
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        database=settings.DB_NAME
+    )
+    await register_json_codecs(conn)
+    return conn
+
+async def explain(conn, query: str, *args, analyze: bool = True) -> str:
+    prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+    rows = await conn.fetch(prefix + query, *args)
+    return "\n".join(r[0] for r in rows)
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+async def time_calls(fn, iterations: int):
+    """Runs an async callable repeatedly and returns per-call latencies in ms."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def print_latency(label: str, samples):
+    print(f"{label}: n={len(samples)} p50={percentile(samples, 50):.3f}ms "
+          f"p95={percentile(samples, 95):.3f}ms p99={percentile(samples, 99):.3f}ms")
@@ -0,0 +1,73 @@
+"""
+Conditional GET and gzip on the versioned read-mostly endpoints (app.core.http_cache).
+
+    python -m benchmarks.http_cache [subject] [iterations]
+
+Each endpoint is timed through the app three ways: a full uncompressed response, a full
+gzipped one, and a revalidation with the ETag of the first response (304, the endpoint's
+query does not run). Bytes on the wire are reported for each. Needs migration 0013.
+"""
+import asyncio
+import sys
+import httpx
+from app.core.database import db
+from app.core.http_cache import http_cache
+from app.main import app
+from benchmarks.common import print_latency, time_calls
+
+# A teacher student-detail target: the student with the most reports
+BUSIEST_STUDENT_SQL = """
+    SELECT s.student_id, u.firebase_uid
+    FROM students s
+    JOIN users u ON s.user_id = u.user_id
+    JOIN reports r ON r.user_id = s.user_id
+    GROUP BY s.student_id, u.firebase_uid
+    ORDER BY COUNT(*) DESC
+    LIMIT 1
+"""
+
+
+async def main(subject: str, iterations: int):
+    await db.connect()
+    try:
+        async with db.acquire() as conn:
+            busiest = await conn.fetchrow(BUSIEST_STUDENT_SQL)
+
+        urls = [
+            f"/api/neet/{subject}/topics",
+            f"/api/neet/{subject}?limit=1000",
+            "/api/teachers/",
+        ]
+        if busiest:
+            urls.append(
+                f"/api/dashboard/teacher/student-detail?uid=bench&studentUid={busiest['firebase_uid']}"
+                f"&childId={busiest['student_id']}"
+            )
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for url in urls:
+                print(f"-- GET {url}")
+                for label, headers in [("identity", {"Accept-Encoding": "identity"}), ("gzip", {"Accept-Encoding": "gzip"})]:
+                    response = await client.get(url, headers=headers)
+                    print(f"  {label}: {response.num_bytes_downloaded} bytes on the wire")
+                    print_latency(f"  {label} 200", await time_calls(lambda: client.get(url, headers=headers), iterations))
+
+                etag = response.headers.get("etag")
+                if etag is None:
+                    print("  no ETag (is migration 0013 applied?)")
+                    continue
+                revalidate = {"Accept-Encoding": "gzip", "If-None-Match": etag}
+                response = await client.get(url, headers=revalidate)
+                print(f"  revalidate: {response.status_code}, {response.num_bytes_downloaded} bytes on the wire")
+                print_latency("  revalidate", await time_calls(lambda: client.get(url, headers=revalidate), iterations))
+
+        for name, route in http_cache.stats()["routes"].items():
+            print(f"{name}: {route}")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(args[0] if args else "Biology", int(args[1]) if len(args) > 1 else 50))
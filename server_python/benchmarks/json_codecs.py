@@ -0,0 +1,99 @@
+"""
+JSON decoding and response serialization for the largest endpoints.
+
+    python -m benchmarks.json_codecs [iterations]
+
+Decoding: report bodies fetched as text and parsed with json.loads (no codecs) vs the
+binary orjson jsonb codec (app.db.codecs), and vs ::text passthrough (never decoded).
+Serialization: each endpoint's payload rendered the FastAPI default way (jsonable_encoder +
+JSONResponse) vs ORJSONResponse directly. The endpoints are then timed end to end through the app.
+"""
+import asyncio
+import json
+import sys
+import httpx
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.core.database import db
+from app.core.responses import ORJSONResponse
+from app.db.codecs import register_json_codecs
+from app.main import app
+from benchmarks.common import print_latency, time_calls
+
+REPORT_BODIES_SQL = "SELECT report_json FROM reports ORDER BY report_id DESC LIMIT $1"
+REPORT_BODIES_TEXT_SQL = "SELECT report_json::text FROM reports ORDER BY report_id DESC LIMIT $1"
+
+# The student with the most reports makes the largest teacher student-detail payload
+BUSIEST_STUDENT_SQL = """
+    SELECT s.student_id, u.firebase_uid
+    FROM students s
+    JOIN users u ON s.user_id = u.user_id
+    JOIN reports r ON r.user_id = s.user_id
+    GROUP BY s.student_id, u.firebase_uid
+    ORDER BY COUNT(*) DESC
+    LIMIT 1
+"""
+
+
+async def bench_decoding(iterations: int, rows: int):
+    async with db.acquire() as conn:
+        # A pool connection without the codecs, as before they were registered
+        await conn.reset_type_codec("jsonb", schema="pg_catalog")
+
+        async def stdlib():
+            for r in await conn.fetch(REPORT_BODIES_SQL, rows):
+                json.loads(r[0])
+
+        print_latency(f"  {rows} reports, json.loads", await time_calls(stdlib, iterations))
+        await register_json_codecs(conn)
+        print_latency(f"  {rows} reports, orjson codec", await time_calls(
+            lambda: conn.fetch(REPORT_BODIES_SQL, rows), iterations
+        ))
+        print_latency(f"  {rows} reports, ::text passthrough", await time_calls(
+            lambda: conn.fetch(REPORT_BODIES_TEXT_SQL, rows), iterations
+        ))
+
+
+async def bench_serialization(label: str, payload, iterations: int):
+    async def default():
+        JSONResponse(jsonable_encoder(payload))
+
+    async def direct():
+        ORJSONResponse(payload)
+
+    print(f"-- {label}: {len(ORJSONResponse(payload).body)} bytes")
+    print_latency("  jsonable_encoder + JSONResponse", await time_calls(default, iterations))
+    print_latency("  ORJSONResponse", await time_calls(direct, iterations))
+
+
+async def main(iterations: int):
+    await db.connect()
+    try:
+        print("-- decoding")
+        await bench_decoding(iterations, 500)
+
+        async with db.acquire() as conn:
+            busiest = await conn.fetchrow(BUSIEST_STUDENT_SQL)
+
+        endpoints = [("admin students", "/api/dashboard/admin/students?limit=500")]
+        if busiest:
+            endpoints.append((
+                "teacher student detail",
+                f"/api/dashboard/teacher/student-detail?uid=bench&studentUid={busiest['firebase_uid']}"
+                f"&childId={busiest['student_id']}",
+            ))
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for label, url in endpoints:
+                response = await client.get(url)
+                response.raise_for_status()
+                await bench_serialization(label, response.json(), iterations)
+                print_latency("  end to end", await time_calls(lambda: client.get(url), iterations))
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 50))
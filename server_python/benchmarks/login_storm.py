@@ -0,0 +1,67 @@
+"""
+Latency of an unrelated endpoint during a burst of password checks.
+
+    python -m benchmarks.login_storm [logins] [rounds]
+
+Fires `logins` concurrent bcrypt verifications (the work login does per request) while
+probing GET /api/system/metrics in-process, once with verification inline on the event
+loop (the old login path) and once through app.core.passwords.hasher. No database needed.
+"""
+import asyncio
+import sys
+import time
+import httpx
+from app.core.passwords import PasswordHasher
+from app.core.config import settings
+from app.main import app
+from benchmarks.common import print_latency
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/api/system/metrics")
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.005)
+
+
+async def storm(label: str, verify, logins: int, hashed: str):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        stop = asyncio.Event()
+        samples = []
+        prober = asyncio.create_task(probe(client, stop, samples))
+        await asyncio.sleep(0.05)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(verify("correct horse", hashed) for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        await prober
+    print(f"{label}: {logins} logins in {elapsed:.2f}s")
+    print_latency("  /api/system/metrics during storm", samples)
+
+
+async def main(logins: int, rounds: int):
+    hasher = PasswordHasher(
+        rounds=rounds,
+        max_workers=settings.PASSWORD_HASH_WORKERS,
+        max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    )
+    hashed = hasher.context.hash("correct horse")
+
+    async def inline_verify(password, hashed_password):
+        return hasher.context.verify(password, hashed_password)
+
+    await storm("inline bcrypt (event loop)", inline_verify, logins, hashed)
+    await storm("hashing executor", hasher.verify, logins, hashed)
+    print(f"executor stats: {hasher.stats()}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(
+        int(args[0]) if len(args) > 0 else 50,
+        int(args[1]) if len(args) > 1 else settings.BCRYPT_ROUNDS,
+    ))
@@ -0,0 +1,56 @@
+"""
+Before/after query plans for the NEET subject/topic filters.
+
+    python -m benchmarks.neet_filter_plans Biology Ecology
+
+Runs the legacy LOWER(...) predicates and the subject_key/topic_key predicates
+side by side against the configured database (migration 0001 must be applied).
+"""
+import asyncio
+import sys
+from benchmarks.common import connect, explain
+
+CASES = [
+    (
+        "get_topics",
+        "SELECT topic, sub_topic, question_type FROM neet_questions WHERE LOWER(subject) = LOWER($1) AND topic IS NOT NULL",
+        "SELECT topic, sub_topic, question_type FROM neet_questions WHERE subject_key = LOWER(BTRIM($1)) AND topic_key IS NOT NULL",
+        1,
+    ),
+    (
+        "get_questions (topic filter)",
+        "SELECT id FROM neet_questions WHERE LOWER(subject) = LOWER($1) AND LOWER(topic) = LOWER($2)",
+        "SELECT id FROM neet_questions WHERE subject_key = LOWER(BTRIM($1)) AND topic_key = LOWER(BTRIM($2))",
+        2,
+    ),
+    (
+        "generate_assessment (per type)",
+        "SELECT id FROM neet_questions WHERE LOWER(subject) = LOWER($1) "
+        "AND LOWER(TRIM(topic)) IN (SELECT LOWER(TRIM(unnest(ARRAY[$2]::varchar[])))) "
+        "AND question_type ILIKE 'MCQ' ORDER BY RANDOM() LIMIT 10",
+        "SELECT id FROM neet_questions WHERE subject_key = LOWER(BTRIM($1)) "
+        "AND topic_key = ANY(ARRAY[LOWER(BTRIM($2))]) AND question_type = 'MCQ'",
+        2,
+    ),
+]
+
+async def main(subject: str, topic: str):
+    conn = await connect()
+    try:
+        total = await conn.fetchval("SELECT COUNT(*) FROM neet_questions")
+        print(f"neet_questions rows: {total}\n")
+        for label, before, after, nargs in CASES:
+            args = [subject, topic][:nargs]
+            print(f"=== {label} ===")
+            print("--- before ---")
+            print(await explain(conn, before, *args))
+            print("--- after ---")
+            print(await explain(conn, after, *args))
+            print()
+    finally:
+        await conn.close()
+
+if __name__ == "__main__":
+    subject = sys.argv[1] if len(sys.argv) > 1 else "Biology"
+    topic = sys.argv[2] if len(sys.argv) > 2 else "Ecology"
+    asyncio.run(main(subject, topic))
@@ -0,0 +1,46 @@
+"""
+Reports phone fallback: leading-wildcard LIKE scans vs the phone_last10 index.
+
+    python -m benchmarks.phone_lookup [phone] [iterations]
+
+Prints the plan and latency of the two legacy LIKE lookups (students, then parents) and
+of the single indexed lookup get_reports runs now.
+"""
+import asyncio
+import sys
+from app.core.phone import phone_last10
+from app.db.queries import queries
+from app.features.reports.router import USER_BY_PHONE
+from benchmarks.common import connect, explain, print_latency, time_calls
+
+LEGACY_STUDENTS = "SELECT s.user_id FROM students s WHERE s.phone_number LIKE $1 OR s.phone_number LIKE $2"
+LEGACY_PARENTS = "SELECT p.user_id FROM parents p WHERE p.phone_number LIKE $1 OR p.phone_number LIKE $2"
+
+
+async def main(phone: str, iterations: int):
+    key = phone_last10(phone)
+    conn = await connect()
+    try:
+        async def legacy():
+            user_id = await conn.fetchval(LEGACY_STUDENTS, f"%{key}", f"%{key}%")
+            if not user_id:
+                user_id = await conn.fetchval(LEGACY_PARENTS, f"%{key}", f"%{key}%")
+            return user_id
+
+        async def indexed():
+            return await queries.fetchval(conn, USER_BY_PHONE, key)
+
+        print(await explain(conn, LEGACY_STUDENTS, f"%{key}", f"%{key}%"))
+        print(await explain(conn, queries.statements[USER_BY_PHONE], key))
+        print_latency("legacy LIKE (students, then parents)", await time_calls(legacy, iterations))
+        print_latency("phone_last10 index", await time_calls(indexed, iterations))
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(
+        args[0] if args else "9876543210",
+        int(args[1]) if len(args) > 1 else 500,
+    ))
@@ -0,0 +1,54 @@
+"""
+First-request latency with a lazily created pool vs one warmed at startup, and pool
+saturation under a burst.
+
+    python -m benchmarks.pool_warmup [burst]
+
+The burst runs `burst` concurrent SELECT pg_sleep(0.01) calls against a pool of
+DB_POOL_MAX_SIZE connections and prints the pool stats (Database.stats) afterwards.
+"""
+import asyncio
+import sys
+import time
+from app.core.config import settings
+from app.core.database import Database
+
+
+async def first_query_ms(database: Database, warm: bool) -> float:
+    if warm:
+        await database.connect()
+    start = time.perf_counter()
+    if not database.pool:
+        await database.connect()
+    async with database.acquire() as conn:
+        await conn.fetchval("SELECT 1")
+    return (time.perf_counter() - start) * 1000
+
+
+async def main(burst: int):
+    for label, warm in (("lazy pool (old)", False), ("pool warmed at startup", True)):
+        database = Database()
+        try:
+            print(f"{label}: first query {await first_query_ms(database, warm):.1f}ms")
+        finally:
+            await database.disconnect()
+
+    database = Database()
+    await database.connect()
+    try:
+        async def one():
+            async with database.acquire() as conn:
+                await conn.execute("SELECT pg_sleep(0.01)")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(burst)))
+        print(f"burst of {burst} on max_size={settings.DB_POOL_MAX_SIZE}: "
+              f"{(time.perf_counter() - start) * 1000:.1f}ms")
+        print(f"pool stats: {database.stats()}")
+    finally:
+        await database.disconnect()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 200))
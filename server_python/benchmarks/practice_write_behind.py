@@ -0,0 +1,62 @@
+"""
+POST /api/skill-practice/log-practice latency with and without the write-behind buffer.
+
+    python -m benchmarks.practice_write_behind <firebase_uid> [requests] [concurrency]
+
+Writes real sessions for the given user (use a test account). Requests are sent in-process,
+`concurrency` at a time, first with synchronous writes and then through the buffer, whose
+stats are printed after the final flush.
+"""
+import asyncio
+import sys
+import time
+import httpx
+from app.core.database import db
+from app.features.skill_practice.write_behind import practice_writer
+from app.main import app
+from benchmarks.common import print_latency
+
+
+async def run(label: str, uid: str, requests: int, concurrency: int):
+    body = {"uid": uid, "data": {
+        "report_id": 1, "day_number": 1, "category": "Benchmark",
+        "questions_attempted": 10, "correct_answers": 7, "time_taken_seconds": 60,
+    }}
+    samples = []
+    slots = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with slots:
+                start = time.perf_counter()
+                response = await client.post("/api/skill-practice/log-practice", json=body)
+                samples.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+    print_latency(f"{label} ({requests / elapsed:.0f} req/s)", samples)
+
+
+async def main(uid: str, requests: int, concurrency: int):
+    await db.connect()
+    try:
+        await run("synchronous writes", uid, requests, concurrency)
+
+        practice_writer.enabled = True
+        practice_writer.start()
+        await run("write-behind", uid, requests, concurrency)
+        await practice_writer.stop()
+        print(f"write-behind stats: {practice_writer.stats()}")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(
+        args[0],
+        int(args[1]) if len(args) > 1 else 2000,
+        int(args[2]) if len(args) > 2 else 50,
+    ))
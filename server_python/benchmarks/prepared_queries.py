@@ -0,0 +1,71 @@
+"""
+Registered (fixed SQL text, cached per connection) vs ad-hoc SQL for the hot router queries.
+
+    python -m benchmarks.prepared_queries [iterations]
+
+"ad-hoc, no statement cache" is what f-string built queries cost: every distinct text is
+parsed and planned again. "ad-hoc, statement cache" is conn.fetch with a repeated text.
+"registry" runs the same statements by name through the app pool, with a checkout per call,
+so the statements are reused across pool releases as they are in the routers.
+"""
+import asyncio
+import sys
+import asyncpg
+from app.core.config import settings
+from app.core.identity import USER_BY_UID
+from app.core.database import db
+from app.db.queries import queries
+from app.features.neet.listing import build_list_query
+from app.features.skill_practice.router import SESSION_HISTORY
+from benchmarks.common import print_latency, time_calls
+
+
+async def connect(**kwargs) -> asyncpg.Connection:
+    return await asyncpg.connect(
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        database=settings.DB_NAME,
+        **kwargs
+    )
+
+
+async def main(iterations: int):
+    uid = "bench-missing-uid"
+    list_name, list_params = build_list_query("Biology", "Ecology", None, None, 50)
+    calls = [
+        ("identity user by uid", USER_BY_UID, (uid,)),
+        ("neet topic page", list_name, tuple(list_params)),
+        ("skill practice history", SESSION_HISTORY, (1, 1, None, None, 50)),
+    ]
+
+    uncached = await connect(statement_cache_size=0)
+    cached = await connect()
+    await db.connect()
+
+    async def registry_call(name, args):
+        async with db.acquire() as conn:
+            return await queries.fetch(conn, name, *args)
+
+    try:
+        for label, name, args in calls:
+            sql = queries.statements[name]
+            print_latency(f"{label}: ad-hoc, no statement cache", await time_calls(
+                lambda: uncached.fetch(sql, *args), iterations
+            ))
+            print_latency(f"{label}: ad-hoc, statement cache", await time_calls(
+                lambda: cached.fetch(sql, *args), iterations
+            ))
+            print_latency(f"{label}: registry", await time_calls(
+                lambda: registry_call(name, args), iterations
+            ))
+    finally:
+        for conn in (uncached, cached):
+            await conn.close()
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 1000))
@@ -0,0 +1,45 @@
+"""
+Admin dashboard aggregates over report_json vs the typed report columns (migration 0012).
+
+    python -m benchmarks.report_columns [iterations]
+"""
+import asyncio
+import sys
+from benchmarks.common import connect, explain, print_latency, time_calls
+
+PAIRS = [
+    (
+        "average score",
+        """SELECT AVG(CAST(report_json->'summary'->>'accuracyPercent' AS NUMERIC)) FROM reports
+           WHERE report_json->'summary'->>'accuracyPercent' IS NOT NULL""",
+        "SELECT AVG(accuracy_percent) FROM reports WHERE accuracy_percent IS NOT NULL",
+    ),
+    (
+        "perfect scores",
+        """SELECT COUNT(*) FROM reports
+           WHERE CAST(report_json->'summary'->>'accuracyPercent' AS NUMERIC) = 100""",
+        "SELECT COUNT(*) FROM reports WHERE accuracy_percent = 100",
+    ),
+    (
+        "reports of a child",
+        "SELECT report_id FROM reports WHERE report_json->>'childId' = '1'",
+        "SELECT report_id FROM reports WHERE child_id = '1'",
+    ),
+]
+
+
+async def main(iterations: int):
+    conn = await connect()
+    try:
+        for label, json_query, column_query in PAIRS:
+            print(f"-- {label}")
+            print(await explain(conn, column_query))
+            print_latency("  report_json", await time_calls(lambda: conn.fetchval(json_query), iterations))
+            print_latency("  typed column", await time_calls(lambda: conn.fetchval(column_query), iterations))
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 50))
@@ -0,0 +1,44 @@
+"""
+Per-request cost of the skill practice table setup.
+
+    python -m benchmarks.skill_practice_ddl [iterations]
+
+Compares the old per-request CREATE TABLE/INDEX IF NOT EXISTS batch (six round trips
+and catalog locks on every call) with ensure_tables_exist after its first call.
+"""
+import asyncio
+import sys
+from app.db.migrate import list_migrations
+from app.features.skill_practice import router as skill_practice
+from benchmarks.common import connect, print_latency, time_calls
+
+
+def migration_statements():
+    path = dict(list_migrations())["0010_skill_practice_tables"]
+    with open(path) as f:
+        sql = "\n".join(line for line in f if not line.startswith("--"))
+    return [statement.strip() for statement in sql.split(";") if statement.strip()]
+
+
+async def main(iterations: int):
+    conn = await connect()
+    try:
+        statements = migration_statements()
+
+        async def per_request_ddl():
+            for statement in statements:
+                await conn.execute(statement)
+
+        await skill_practice.ensure_tables_exist(conn)
+
+        print_latency("per-request DDL", await time_calls(per_request_ddl, iterations))
+        print_latency("ensure_tables_exist (ready)", await time_calls(
+            lambda: skill_practice.ensure_tables_exist(conn), iterations
+        ))
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 500))
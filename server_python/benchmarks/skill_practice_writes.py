@@ -0,0 +1,58 @@
+"""
+Practice session logging: one request per session vs one batch.
+
+    python -m benchmarks.skill_practice_writes <firebase_uid> [sessions] [report_id]
+
+Writes real rows for the given user (use a test account): `sessions` practice sessions
+logged one statement each, the way /log-practice does it, then the same number flushed
+through /log-practice/batch's single statement. Runs in a transaction that is rolled back.
+"""
+import asyncio
+import sys
+import time
+from app.features.skill_practice.schemas import PracticeSessionCreate
+from app.features.skill_practice.writes import log_practice_sessions
+from benchmarks.common import connect, print_latency
+
+
+async def main(uid: str, count: int, report_id: int):
+    sessions = [
+        PracticeSessionCreate(
+            report_id=report_id, day_number=i % 6 + 1, category="Benchmark",
+            questions_attempted=10, correct_answers=7, time_taken_seconds=60
+        )
+        for i in range(count)
+    ]
+
+    conn = await connect()
+    try:
+        tr = conn.transaction()
+        await tr.start()
+        try:
+            samples = []
+            for session in sessions:
+                start = time.perf_counter()
+                user_id, _ = await log_practice_sessions(conn, uid, [session])
+                samples.append((time.perf_counter() - start) * 1000)
+            if user_id is None:
+                print(f"Unknown uid {uid}")
+                return
+            print_latency("one statement per session", samples)
+            print(f"  total {sum(samples):.1f}ms for {count} sessions")
+
+            start = time.perf_counter()
+            _, ids = await log_practice_sessions(conn, uid, sessions)
+            print(f"batch: {len(ids)} sessions in {(time.perf_counter() - start) * 1000:.1f}ms")
+        finally:
+            await tr.rollback()
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(
+        args[0],
+        int(args[1]) if len(args) > 1 else 200,
+        int(args[2]) if len(args) > 2 else 1,
+    ))
@@ -0,0 +1,70 @@
+"""
+Round trips and latency of GET /api/teachers/.
+
+    python -m benchmarks.teacher_list_queries [iterations]
+
+Counts the statements each implementation sends for the teachers in the configured
+database: the legacy per-teacher loop grows as 1 + 3 * N, fetch_teacher_list stays at 1.
+"""
+import asyncio
+import sys
+from app.features.teachers.router import GRADE_COLUMN_MAP, fetch_teacher_list
+from benchmarks.common import connect, print_latency, time_calls
+
+
+class CountingConnection:
+    """Forwards to an asyncpg connection and counts the statements sent."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.queries = 0
+
+    async def fetch(self, *args, **kwargs):
+        self.queries += 1
+        return await self._conn.fetch(*args, **kwargs)
+
+    async def fetchrow(self, *args, **kwargs):
+        self.queries += 1
+        return await self._conn.fetchrow(*args, **kwargs)
+
+    async def fetchval(self, *args, **kwargs):
+        self.queries += 1
+        return await self._conn.fetchval(*args, **kwargs)
+
+
+async def legacy_teacher_list(conn):
+    teachers = await conn.fetch("""
+        SELECT t.teacher_id, u.user_id
+        FROM teachers t
+        JOIN users u ON t.user_id = u.user_id
+    """)
+    for t in teachers:
+        await conn.fetchval("SELECT COUNT(*) FROM mentorship WHERE mentor_id = $1", t['teacher_id'])
+        teaching_profile = await conn.fetchrow("SELECT * FROM teaching WHERE teacher_id = $1", t['teacher_id'])
+        if teaching_profile:
+            [g for g, col in GRADE_COLUMN_MAP.items() if teaching_profile.get(col)]
+        await conn.fetchval("SELECT username FROM credentials WHERE user_id = $1", t['user_id'])
+    return teachers
+
+
+async def main(iterations: int):
+    conn = await connect()
+    try:
+        counting = CountingConnection(conn)
+        teachers = await legacy_teacher_list(counting)
+        print(f"teachers: {len(teachers)}")
+        print(f"legacy loop: {counting.queries} queries")
+
+        counting.queries = 0
+        await fetch_teacher_list(counting)
+        print(f"fetch_teacher_list: {counting.queries} queries")
+
+        print_latency("legacy loop", await time_calls(lambda: legacy_teacher_list(conn), iterations))
+        print_latency("fetch_teacher_list", await time_calls(lambda: fetch_teacher_list(conn), iterations))
+        print_latency("fetch_teacher_list (limit 50)", await time_calls(lambda: fetch_teacher_list(conn, limit=50), iterations))
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
@@ -0,0 +1,36 @@
+"""
+Cold vs warm bearer-token authentication.
+
+    python -m benchmarks.token_verify [iterations]
+
+Cold: every call verifies a fresh token's signature (python-jose), as a route without
+the cache would. Warm: the same token again, served from the verified-claims cache.
+The subject is primed in the identity cache so neither path touches the database.
+"""
+import asyncio
+import sys
+from datetime import timedelta
+from app.core.auth import authenticate
+from app.core.identity import identity
+from app.core.security import create_access_token, token_verifier
+from benchmarks.common import print_latency, time_calls
+
+
+async def main(iterations: int):
+    identity.remember_user("bench-uid", 1, "student")
+
+    # Distinct tokens need distinct payloads; vary the expiry by a second each
+    tokens = iter([
+        create_access_token("bench-uid", expires_delta=timedelta(minutes=30, seconds=i))
+        for i in range(iterations)
+    ])
+    print_latency("cold (signature check)", await time_calls(lambda: authenticate(next(tokens)), iterations))
+
+    token = create_access_token("bench-uid")
+    await authenticate(token)
+    print_latency("warm (cached claims)", await time_calls(lambda: authenticate(token), iterations))
+    print(f"token cache: {token_verifier.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
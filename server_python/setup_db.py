@@ -1,7 +1,7 @@
 import asyncio
 import asyncpg
-import os
 from app.core.config import settings
+from app.db.migrate import apply_migrations
 
 async def setup_database():
     print(f"Connecting to database {settings.DB_NAME} at {settings.DB_HOST}...")
@@ -17,26 +17,9 @@ async def setup_database():
         )
         print("Connected successfully.")
 
-        # Read SQL files
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        schema_path = os.path.join(base_dir, "app", "db", "schema.sql")
-        missing_tables_path = os.path.join(base_dir, "app", "db", "missing_tables.sql")
-
-        with open(schema_path, "r") as f:
-            schema_sql = f.read()
-        
-        with open(missing_tables_path, "r") as f:
-            missing_tables_sql = f.read()
-
-        # Execute Schema
-        print("Applying base schema...")
-        await conn.execute(schema_sql)
-        print("Base schema applied.")
-
-        # Execute Missing Tables
-        print("Applying missing tables...")
-        await conn.execute(missing_tables_sql)
-        print("Missing tables applied.")
+        # Base schema + versioned migrations, tracked in schema_migrations (see app/db/migrate.py)
+        applied = await apply_migrations(conn)
+        print(f"{len(applied)} migrations applied.")
 
         await conn.close()
         print("Database setup complete.")
@@ -0,0 +1,40 @@
+import asyncio
+import time
+from datetime import timedelta
+import pytest
+from fastapi import HTTPException
+from app.core.auth import authenticate
+from app.core.identity import identity
+from app.core.security import TokenVerifier, create_access_token
+
+
+def run_async(coro):
+    return asyncio.run(coro)
+
+
+def test_token_verifier_caches_until_exp():
+    verifier = TokenVerifier(max_entries=10, ttl_seconds=900)
+    token = create_access_token("uid-1", expires_delta=timedelta(minutes=5))
+
+    assert verifier.verify(token)["sub"] == "uid-1"
+    assert verifier.verify(token)["sub"] == "uid-1"
+    assert verifier.verifications == 1
+
+    # Bounded by exp, not by the cache TTL
+    key = next(iter(verifier.cache._data))
+    _, expires_at = verifier.cache._data[key]
+    assert expires_at - time.monotonic() <= 300
+
+
+def test_authenticate_resolves_cached_user_without_db():
+    identity.clear()
+    identity.remember_user("uid-2", 42, "teacher")
+    token = create_access_token("uid-2")
+
+    principal = run_async(authenticate(token))
+    assert (principal.uid, principal.user_id, principal.role) == ("uid-2", 42, "teacher")
+
+    with pytest.raises(HTTPException) as exc:
+        run_async(authenticate(token + "x"))
+    assert exc.value.status_code == 401
+    identity.clear()
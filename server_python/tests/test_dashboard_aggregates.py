@@ -0,0 +1,55 @@
+import asyncio
+import time
+from app.features.dashboard.aggregates import DashboardAggregates
+
+
+def run_async(coro):
+    return asyncio.run(coro)
+
+
+def loaded_aggregates() -> DashboardAggregates:
+    """Aggregates as a reconcile would leave them: 2 students, 3 reports (one unscored)."""
+    aggregates = DashboardAggregates(refresh_seconds=30, max_staleness_seconds=60)
+    aggregates.students = 2
+    aggregates.reports = 3
+    aggregates.scored = 2
+    aggregates.score_sum = 150
+    aggregates.perfect = 1
+    aggregates.grades = {"5": [150, 2]}
+    aggregates.growth = {"2025-01": 2}
+    aggregates.loaded_at = time.monotonic()
+    return aggregates
+
+
+def test_incremental_updates_are_served_without_reconciling():
+    async def _test():
+        aggregates = loaded_aggregates()
+        aggregates.note_report(100, "6")
+        aggregates.note_report(None, "5")
+        aggregates.note_users(2, students=1)
+
+        stats = await aggregates.admin_stats()
+        assert stats == {
+            "totalStudents": 3,
+            "totalReports": 5,
+            "totalPassed": "83%",
+            "totalPerfectScores": 2,
+        }
+
+        charts = await aggregates.admin_charts()
+        assert charts["marksByGrade"] == [{"name": "5", "avg": 75}, {"name": "6", "avg": 100}]
+        assert charts["studentGrowth"][0] == {"name": "2025-01", "students": 2}
+        assert charts["studentGrowth"][-1]["students"] == 4
+        assert aggregates.reconciles == 0
+
+    run_async(_test())
+
+
+def test_updates_before_the_first_load_are_ignored():
+    aggregates = DashboardAggregates(refresh_seconds=30, max_staleness_seconds=60)
+    aggregates.note_report(90, "5")
+    aggregates.note_users(1, students=1)
+    # The first read reconciles from the database, which already includes these rows
+    assert aggregates.reports == 0
+    assert aggregates.students == 0
+    assert aggregates.age() is None
@@ -0,0 +1,39 @@
+import asyncio
+import asyncpg
+import pytest
+from app.core.database import Database
+
+
+def run_async(coro):
+    return asyncio.run(coro)
+
+
+def test_failed_acquire_is_counted_and_releases_waiter():
+    async def _test():
+        database = Database()
+        # min_size=0: nothing is opened until the first acquire, which is refused
+        database.pool = await asyncpg.create_pool(
+            host="127.0.0.1",
+            port=1,
+            min_size=0,
+            max_size=1,
+            max_inactive_connection_lifetime=0,
+        )
+        try:
+            with pytest.raises(OSError):
+                async with database.acquire():
+                    pass
+            stats = database.stats()
+            assert stats["acquires"] == 1
+            assert stats["waiters"] == 0
+            assert stats["maxWaiters"] == 1
+            assert stats["size"] == 0
+            assert stats["maxSize"] == 1
+        finally:
+            database.pool.terminate()
+
+    run_async(_test())
+
+
+def test_stats_are_empty_before_connecting():
+    assert Database().stats() is None
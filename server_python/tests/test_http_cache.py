@@ -0,0 +1,144 @@
+import asyncio
+import gzip
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from app.core.http_cache import HttpCache, HttpCacheMiddleware, etag_matches
+
+run_async = asyncio.run
+
+BIG = [{"id": i, "question": "What is the unit of force?"} for i in range(200)]
+
+
+class FakeVersions(HttpCache):
+    """Versions held in memory instead of data_versions."""
+
+    def __init__(self):
+        super().__init__(min_compress_bytes=1024, compress_level=6)
+        self.versions = {"neet_questions": 1}
+        self.lookups = 0
+
+    async def table_versions(self, tables):
+        self.lookups += 1
+        return {t: self.versions[t] for t in tables if t in self.versions}
+
+
+def make_app(cache: HttpCache):
+    app = FastAPI()
+    app.add_middleware(HttpCacheMiddleware, cache=cache)
+    calls = {"questions": 0}
+
+    @app.get("/questions", dependencies=[cache.versioned("questions", tables=["neet_questions"])])
+    async def questions():
+        calls["questions"] += 1
+        return BIG
+
+    @app.get("/small", dependencies=[cache.versioned("small", tables=["neet_questions"])])
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream", dependencies=[cache.versioned("stream", tables=["neet_questions"])])
+    async def stream():
+        async def rows():
+            for row in ('{"id": %d}\n' % i for i in range(3)):
+                yield row
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    @app.get("/plain")
+    async def plain():
+        return BIG
+
+    return app, calls
+
+
+def client_for(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_if_none_match_is_answered_before_the_endpoint_runs():
+    async def _test():
+        cache = FakeVersions()
+        app, calls = make_app(cache)
+        async with client_for(app) as client:
+            first = await client.get("/questions")
+            etag = first.headers["etag"]
+            assert first.status_code == 200 and first.json() == BIG
+            assert first.headers["cache-control"] == "private, no-cache"
+
+            again = await client.get("/questions", headers={"If-None-Match": etag})
+            assert again.status_code == 304 and again.content == b""
+            assert again.headers["etag"] == etag
+            assert calls["questions"] == 1
+
+            # A write to the table changes the version, hence the ETag
+            cache.versions["neet_questions"] = 2
+            changed = await client.get("/questions", headers={"If-None-Match": etag})
+            assert changed.status_code == 200 and changed.headers["etag"] != etag
+            assert calls["questions"] == 2
+
+            other = await client.get("/questions?limit=5")
+            assert other.headers["etag"] != changed.headers["etag"]
+
+        route = cache.stats()["routes"]["questions"]
+        assert route["requests"] == 4 and route["notModified"] == 1
+
+    run_async(_test())
+
+
+def test_large_bodies_are_gzipped_and_small_ones_are_not():
+    async def _test():
+        cache = FakeVersions()
+        app, _ = make_app(cache)
+        async with client_for(app) as client:
+            big = await client.get("/questions", headers={"Accept-Encoding": "gzip"})
+            assert big.headers["content-encoding"] == "gzip"
+            assert big.json() == BIG
+            assert int(big.headers["content-length"]) < len(big.content)
+
+            small = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+            assert "content-encoding" not in small.headers
+            assert small.json() == {"ok": True}
+
+            identity = await client.get("/questions", headers={"Accept-Encoding": "identity"})
+            assert "content-encoding" not in identity.headers
+
+        route = cache.stats()["routes"]["questions"]
+        assert route["compressed"] == 1
+        assert route["sentBytes"] < route["bodyBytes"]
+
+    run_async(_test())
+
+
+def test_streamed_bodies_are_compressed_as_one_gzip_stream():
+    async def _test():
+        cache = FakeVersions()
+        app, _ = make_app(cache)
+        async with client_for(app) as client:
+            async with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+                raw = b"".join([chunk async for chunk in response.aiter_raw()])
+            assert response.headers["content-encoding"] == "gzip"
+            assert gzip.decompress(raw) == b'{"id": 0}\n{"id": 1}\n{"id": 2}\n'
+
+    run_async(_test())
+
+
+def test_routes_without_versions_are_untouched():
+    async def _test():
+        cache = FakeVersions()
+        app, _ = make_app(cache)
+        async with client_for(app) as client:
+            response = await client.get("/plain", headers={"Accept-Encoding": "gzip"})
+        assert "etag" not in response.headers
+        assert "content-encoding" not in response.headers
+        assert cache.lookups == 0
+
+    run_async(_test())
+
+
+def test_etag_matching_is_weak():
+    assert etag_matches('W/"abc"', 'W/"abc"')
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('W/"x", W/"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches('W/"abd"', 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
@@ -0,0 +1,81 @@
+import asyncio
+from app.core.identity import IdentityResolver
+
+
+class FakeConn:
+    """Answers the resolver's lookups from a dict and counts round trips."""
+
+    def __init__(self, users):
+        self.users = users
+        self.queries = 0
+
+    async def fetchrow(self, query, uid):
+        self.queries += 1
+        return self.users.get(uid)
+
+    async def fetchval(self, query, user_id):
+        self.queries += 1
+        return user_id * 10
+
+
+def run_async(coro):
+    return asyncio.run(coro)
+
+
+def test_uid_lookup_is_cached():
+    async def _test():
+        resolver = IdentityResolver(max_entries=10, ttl_seconds=60)
+        conn = FakeConn({"uid-1": {"user_id": 1, "role": "student"}})
+
+        assert await resolver.get_user_id(conn, "uid-1") == 1
+        assert await resolver.get_user_id(conn, "uid-1") == 1
+        assert conn.queries == 1
+        assert resolver.users.hits == 1
+        assert resolver.users.misses == 1
+
+        # Unknown users are not cached, so a later registration is seen immediately
+        assert await resolver.get_user_id(conn, "missing") is None
+        assert await resolver.get_user_id(conn, "missing") is None
+        assert conn.queries == 3
+
+    run_async(_test())
+
+
+def test_invalidate_by_user_id_drops_related_entries():
+    async def _test():
+        resolver = IdentityResolver(max_entries=10, ttl_seconds=60)
+        conn = FakeConn({"uid-1": {"user_id": 1, "role": "parent"}})
+
+        await resolver.get_user_id(conn, "uid-1")
+        assert await resolver.get_parent_id(conn, 1) == 10
+        queries = conn.queries
+
+        resolver.invalidate(user_id=1)
+        await resolver.get_user_id(conn, "uid-1")
+        await resolver.get_parent_id(conn, 1)
+        assert conn.queries == queries + 2
+
+    run_async(_test())
+
+
+def test_lru_eviction():
+    resolver = IdentityResolver(max_entries=2, ttl_seconds=60)
+    resolver.remember_user("a", 1, "student")
+    resolver.remember_user("b", 2, "student")
+    resolver.users.get("a")
+    resolver.remember_user("c", 3, "student")
+
+    assert resolver.users.get("b") is None
+    assert resolver.users.get("a") == {"user_id": 1, "role": "student"}
+    assert resolver.users.evictions == 1
+
+
+def test_invalidate_does_not_count_as_a_lookup():
+    resolver = IdentityResolver(max_entries=10, ttl_seconds=60)
+    resolver.remember_user("uid-1", 1, "student")
+    resolver.students.set(1, 10)
+
+    resolver.invalidate(uid="uid-1")
+    assert resolver.users.get("uid-1") is None and resolver.students.get(1) is None
+    assert resolver.users.hits == 0 and resolver.users.misses == 1
+    assert resolver.students.misses == 1
@@ -0,0 +1,48 @@
+import asyncio
+import pytest
+from app.core.responses import ORJSONResponse, RawJSONResponse
+from app.db.codecs import decode_jsonb, encode_json, encode_jsonb, register_json_codecs
+
+run_async = asyncio.run
+
+
+class FakeConnection:
+    def __init__(self):
+        self.codecs = {}
+
+    async def set_type_codec(self, typename, *, schema, encoder, decoder, format):
+        self.codecs[typename] = (schema, encoder, decoder, format)
+
+
+def test_jsonb_round_trip_uses_version_byte():
+    value = {"summary": {"accuracyPercent": 80}, "answers": [1, "b", None, True]}
+    encoded = encode_jsonb(value)
+    assert encoded[:1] == b"\x01"
+    assert encoded[1:] == encode_json(value)
+    assert decode_jsonb(encoded) == value
+
+
+def test_jsonb_rejects_unknown_version():
+    with pytest.raises(ValueError):
+        decode_jsonb(b"\x02{}")
+
+
+def test_codecs_registered_in_binary_format():
+    conn = FakeConnection()
+    run_async(register_json_codecs(conn))
+    assert set(conn.codecs) == {"json", "jsonb"}
+    assert all(schema == "pg_catalog" and fmt == "binary" for schema, _, _, fmt in conn.codecs.values())
+
+
+def test_orjson_response_accepts_non_str_keys():
+    response = ORJSONResponse({"studentCounts": {5: 2}})
+    assert response.body == b'{"studentCounts":{"5":2}}'
+    assert response.media_type == "application/json"
+
+
+def test_raw_json_array_is_passed_through():
+    response = RawJSONResponse.array(['{"id":1}', '{"id":2}'], headers={"X-Next-Cursor": "c"})
+    assert response.body == b'[{"id":1},{"id":2}]'
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["x-next-cursor"] == "c"
+    assert RawJSONResponse.array([]).body == b"[]"
@@ -0,0 +1,33 @@
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from app.db.queries import queries
+from app.features.neet.listing import FIRST_PAGE_KEY, LIST_QUERIES, build_list_query, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 3, 1, 9, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def test_list_query_continues_after_cursor():
+    created_at = datetime(2025, 3, 1, 9, 30, 15)
+    name, params = build_list_query("Biology", "Ecology", None, encode_cursor(created_at, 7), 201)
+
+    assert name == LIST_QUERIES[(True, False)]
+    assert params == ["Biology", "Ecology", None, created_at, 7, 201]
+
+
+def test_list_queries_are_canonical():
+    first_page, _ = build_list_query("Biology", "Ecology", None, None, 200)
+    streamed, params = build_list_query("Biology", "Genetics", "", None, None)
+
+    # Cursor and limit are bound, not spliced in, so both requests share one prepared statement
+    assert first_page == streamed
+    assert params[3:] == [*FIRST_PAGE_KEY, None]
+    assert "(created_at, id) < ($4, $5)" in queries.statements[first_page]
+    assert len(set(LIST_QUERIES.values())) == 4
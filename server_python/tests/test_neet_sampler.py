@@ -0,0 +1,56 @@
+import asyncio
+from app.features.neet.sampler import QuestionSampler
+
+
+class FakeConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def fetch(self, query, subject):
+        self.queries += 1
+        return self.rows
+
+
+ROWS = (
+    [{"id": i, "topic_key": "ecology", "sub_topic_key": "food chains", "question_type": "MCQ"} for i in range(1, 21)]
+    + [{"id": i, "topic_key": "ecology", "sub_topic_key": None, "question_type": "STATEMENT_BASED"} for i in range(21, 31)]
+    + [{"id": i, "topic_key": "genetics", "sub_topic_key": None, "question_type": "MCQ"} for i in range(31, 41)]
+)
+
+
+def run_async(coro):
+    return asyncio.run(coro)
+
+
+def test_distribution_draws_each_type_from_matching_topics():
+    async def _test():
+        sampler = QuestionSampler(ttl_seconds=60)
+        conn = FakeConn(ROWS)
+        ids = await sampler.sample(
+            conn, "Biology", ["ECOLOGY"], None,
+            [{"type": "MCQ", "count": 5}, {"type": "Statement", "count": 20}], None
+        )
+
+        assert len(ids) == 15
+        assert len(set(ids)) == 15
+        assert all(1 <= i <= 20 for i in ids[:5])
+        assert sorted(ids[5:]) == list(range(21, 31))
+
+        # Index is reused until invalidated
+        await sampler.sample(conn, "biology", ["Ecology"], None, None, 3)
+        assert conn.queries == 1
+        sampler.invalidate("Biology")
+        await sampler.sample(conn, "Biology", ["Ecology"], None, None, 3)
+        assert conn.queries == 2
+
+    run_async(_test())
+
+
+def test_fallback_respects_sub_topics_and_limit():
+    async def _test():
+        sampler = QuestionSampler(ttl_seconds=60)
+        ids = await sampler.sample(FakeConn(ROWS), "Biology", ["Ecology"], ["food chains"], None, 50)
+        assert sorted(ids) == list(range(1, 21))
+
+    run_async(_test())
@@ -0,0 +1,99 @@
+import io
+import json
+import openpyxl
+import pytest
+from fastapi import HTTPException
+from app.features.neet import service
+from app.features.neet.service import NeetService
+
+QUESTIONS = [
+    {"question": 'Say "hi"\\n to the [cell]', "options": ["a, b", "{c}", "é ü", "☃"], "correctAnswer": "B"},
+    {"question": "Nested", "pairs": [["x", [1, 2, {"y": []}]], {"z": {"w": [3.25e-3]}}]},
+    {"question": "Escapes \\\" \\\\ \\u00e9", "explanation": ""},
+]
+
+
+def parse_json(text: str):
+    return list(NeetService._iter_json_rows(io.BytesIO(text.encode("utf-8"))))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64 * 1024])
+def test_chunk_boundaries_inside_strings_and_escapes(monkeypatch, chunk_size):
+    # Every chunk size cuts strings, escapes, multi-byte characters and numbers somewhere
+    monkeypatch.setattr(service, "JSON_READ_CHUNK_SIZE", chunk_size)
+    text = "\ufeff \n" + json.dumps(QUESTIONS, ensure_ascii=False, indent=2) + "\n"
+    assert parse_json(text) == QUESTIONS
+
+
+def test_numbers_are_not_cut_at_a_chunk_boundary(monkeypatch):
+    monkeypatch.setattr(service, "JSON_READ_CHUNK_SIZE", 2)
+    assert parse_json("[12345, -0.5e10]") == [12345, -0.5e10]
+
+
+def test_empty_arrays():
+    assert parse_json("[]") == []
+    assert parse_json("  [ \n ]  ") == []
+
+
+def test_non_object_elements_are_yielded_for_validation():
+    rows = parse_json('[1, "two", null, [3], {"question": "q"}]')
+    assert rows == [1, "two", None, [3], {"question": "q"}]
+    assert [NeetService.validate_question(r) for r in rows[:4]] == ["Question must be an object"] * 4
+    assert NeetService.validate_question(rows[4]) is None
+
+
+@pytest.mark.parametrize("text", [
+    "[1] garbage",
+    "[1]]",
+    "[] []",
+    "[1, 2",
+    "[1,]",
+    "[1 2]",
+    '["unterminated]',
+])
+def test_malformed_documents_are_rejected(text):
+    with pytest.raises(HTTPException) as exc:
+        parse_json(text)
+    assert exc.value.status_code == 400
+
+
+def test_top_level_must_be_an_array():
+    with pytest.raises(HTTPException) as exc:
+        parse_json('{"question": "q"}')
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "JSON upload must be an array of questions"
+
+
+def test_xlsx_is_read_in_read_only_mode():
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["Question", "Option A", "Option B", "Option C", "Option D", "Correct Answer", "Explanation"])
+    sheet.append(["What is 2 + 2?", 3, 4, 5, 6, " b ", "Arithmetic"])
+    sheet.append([None, None, None, None, None, None, None])
+    sheet.append(["Unit of force?", "N", "J", "W", "Pa", None, None])
+    data = io.BytesIO()
+    workbook.save(data)
+
+    rows = list(NeetService._iter_upload_rows(data, "questions.xlsx"))
+    assert rows == [
+        {
+            "question": "What is 2 + 2?", "options": ["3", "4", "5", "6"], "correctAnswer": "B",
+            "explanation": "Arithmetic", "question_type": None,
+        },
+        {
+            "question": "Unit of force?", "options": ["N", "J", "W", "Pa"], "correctAnswer": "A",
+            "explanation": "", "question_type": None,
+        },
+    ]
+
+
+def test_xlsx_missing_columns_are_reported():
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["Question", "Option A"])
+    data = io.BytesIO()
+    workbook.save(data)
+
+    with pytest.raises(HTTPException) as exc:
+        list(NeetService._iter_upload_rows(data, "questions.xlsx"))
+    assert exc.value.status_code == 400
+    assert "correct_answer" in exc.value.detail
@@ -0,0 +1,74 @@
+import asyncio
+from fastapi import HTTPException
+from app.core.passwords import PasswordHasher
+
+
+def run_async(coro):
+    return asyncio.run(coro)
+
+
+def test_verify_and_update_rehashes_on_cost_change():
+    async def _test():
+        old = PasswordHasher(rounds=4, max_workers=2, max_pending=4)
+        stored = await old.hash("secret")
+        assert await old.verify("secret", stored)
+        assert await old.verify_and_update("secret", stored) == (True, None)
+
+        new = PasswordHasher(rounds=5, max_workers=2, max_pending=4)
+        assert await new.verify_and_update("wrong", stored) == (False, None)
+        valid, upgraded = await new.verify_and_update("secret", stored)
+        assert valid
+        assert upgraded.startswith("$2b$05$")
+        assert await new.verify_and_update("secret", upgraded) == (True, None)
+        assert new.stats()["rehashed"] == 1
+
+    run_async(_test())
+
+
+def test_pending_calls_are_bounded():
+    async def _test():
+        hasher = PasswordHasher(rounds=4, max_workers=1, max_pending=4)
+        hasher.start()
+        stored = hasher.context.hash("secret")
+        results = await asyncio.gather(*(hasher.verify("secret", stored) for _ in range(5)))
+        assert all(results)
+
+        stats = hasher.stats()
+        assert stats["completed"] == 5
+        assert stats["maxWaiting"] == 4
+        assert stats["rejected"] == 0
+        assert stats["waiting"] == 0 and stats["inFlight"] == 0
+
+    run_async(_test())
+
+
+def test_callers_beyond_max_pending_are_rejected():
+    async def _test():
+        hasher = PasswordHasher(rounds=4, max_workers=1, max_pending=2)
+        hasher.start()
+        stored = hasher.context.hash("secret")
+        results = await asyncio.gather(
+            *(hasher.verify("secret", stored) for _ in range(5)), return_exceptions=True
+        )
+
+        # One running, two waiting, the other two turned away
+        rejected = [r for r in results if isinstance(r, HTTPException)]
+        assert [r.status_code for r in rejected] == [503, 503]
+        assert results.count(True) == 3
+        assert hasher.stats()["rejected"] == 2
+
+        # The queue drained: later callers get through again
+        assert await hasher.verify("secret", stored)
+
+    run_async(_test())
+
+
+def test_calls_before_start_are_not_bounded():
+    async def _test():
+        hasher = PasswordHasher(rounds=4, max_workers=1, max_pending=1)
+        stored = hasher.context.hash("secret")
+        results = await asyncio.gather(*(hasher.verify("secret", stored) for _ in range(4)))
+        assert all(results)
+        assert hasher.stats()["rejected"] == 0
+
+    run_async(_test())
@@ -0,0 +1,14 @@
+from app.core.phone import phone_last10
+
+
+def test_phone_key_ignores_formatting_and_country_code():
+    assert phone_last10("+91 98765-43210") == "9876543210"
+    assert phone_last10("(0) 9876543210") == "9876543210"
+    assert phone_last10("98765 43210") == phone_last10("919876543210")
+    assert phone_last10("12345") == "12345"
+
+
+def test_phone_key_is_none_without_digits():
+    assert phone_last10(None) is None
+    assert phone_last10("") is None
+    assert phone_last10("not-a-phone") is None
@@ -0,0 +1,104 @@
+import asyncio
+import asyncpg
+from app.features.skill_practice.schemas import PracticeSessionCreate
+from app.features.skill_practice.write_behind import PracticeEvent, PracticeWriteBehind, merge_progress
+
+
+class RecordingWriter(PracticeWriteBehind):
+    """Records flushed batches instead of writing them; fails while `failure` is set."""
+
+    def __init__(self, **kwargs):
+        super().__init__(enabled=True, **kwargs)
+        self.batches = []
+        self.failure = None
+
+    async def _write(self, batch):
+        if self.failure is not None:
+            raise self.failure
+        self.batches.append(batch)
+
+
+def session(day: int, questions: int = 10, category: str = "Fractions") -> PracticeSessionCreate:
+    return PracticeSessionCreate(
+        report_id=1, day_number=day, category=category,
+        questions_attempted=questions, correct_answers=questions // 2, time_taken_seconds=30
+    )
+
+
+def run_async(coro):
+    return asyncio.run(coro)
+
+
+def test_progress_increments_are_merged_per_day():
+    events = [
+        (7, session(1, 10)), (7, session(1, 4, "Other")), (7, session(2, 6)), (8, session(1, 2)),
+    ]
+    totals = merge_progress([PracticeEvent(user_id, s, None) for user_id, s in events])
+
+    assert totals == {
+        (7, 1, 1): ["Fractions", 2, 14, 7, 60],
+        (7, 1, 2): ["Fractions", 1, 6, 3, 30],
+        (8, 1, 1): ["Fractions", 1, 2, 1, 30],
+    }
+
+
+def test_flushes_on_size_and_on_stop():
+    async def _test():
+        writer = RecordingWriter(flush_interval_ms=60_000, flush_max_events=3, max_pending=5)
+        assert not writer.offer(1, session(1))  # not started: caller writes synchronously
+
+        writer.start()
+        for day in (1, 2, 3):
+            assert writer.offer(1, session(day))
+        await asyncio.sleep(0.01)
+        assert [len(b) for b in writer.batches] == [3]
+
+        assert writer.offer(1, session(4))
+        await writer.stop()
+        assert [len(b) for b in writer.batches] == [3, 1]
+        assert writer.stats()["written"] == 4
+        assert writer.stats()["depth"] == 0
+
+    run_async(_test())
+
+
+def test_unreachable_database_keeps_the_batch():
+    async def _test():
+        writer = RecordingWriter(flush_interval_ms=60_000, flush_max_events=10, max_pending=2)
+        writer.start()
+        writer.failure = OSError("connection refused")
+        assert writer.offer(1, session(1))
+        assert writer.offer(1, session(2))
+        assert not writer.offer(1, session(3))  # full
+
+        await writer.stop()
+        assert writer.stats()["depth"] == 2
+        assert writer.stats()["failedFlushes"] == 1
+
+        writer.failure = None
+        await writer.flush()
+        assert [e.session.day_number for e in writer.batches[0]] == [1, 2]
+
+    run_async(_test())
+
+
+def test_rejected_batch_is_written_one_by_one():
+    class RejectingWriter(RecordingWriter):
+        async def _write(self, batch):
+            if any(e.user_id == 99 for e in batch):
+                raise asyncpg.ForeignKeyViolationError("user 99 does not exist")
+            self.batches.append(batch)
+
+    async def _test():
+        writer = RejectingWriter(flush_interval_ms=60_000, flush_max_events=10, max_pending=10)
+        writer.start()
+        writer.offer(1, session(1))
+        writer.offer(99, session(1))
+        writer.offer(2, session(1))
+        await writer.stop()
+
+        assert [[e.user_id for e in b] for b in writer.batches] == [[1], [2]]
+        assert writer.stats()["dropped"] == 1
+        assert writer.stats()["written"] == 2
+
+    run_async(_test())
@@ -0,0 +1,149 @@
+import asyncio
+import json
+from app.core.identity import identity
+from app.features.puzzles import router as puzzles_router
+from app.features.puzzles.assignments import (
+    ASSIGN_SQL, COMPLETE_SQL, TODAY_ASSIGNMENT_SQL, assign_daily_puzzle, get_assignment, mark_completed,
+)
+
+
+class FakeConn:
+    """Today's daily_puzzle_assignments in a dict, following the statements' SQL semantics."""
+
+    def __init__(self, puzzles):
+        self.puzzles = puzzles      # puzzle_id -> grade (all active)
+        self.completions = set()    # (user_id, puzzle_id)
+        self.assignments = {}       # user_id -> {"grade", "puzzle_id", "completed_at"}
+        self.assigns = 0
+
+    async def fetchrow(self, query, user_id):
+        assert query == TODAY_ASSIGNMENT_SQL
+        a = self.assignments.get(user_id)
+        if a is None:
+            return None
+        payload = json.dumps({"id": a["puzzle_id"], "grade": self.puzzles[a["puzzle_id"]]})
+        return {"grade": a["grade"], "completed_at": a["completed_at"], "payload": payload}
+
+    async def execute(self, query, *args):
+        if query == ASSIGN_SQL:
+            self.assigns += 1
+            user_id, grade = args
+            picked = [p for p, g in sorted(self.puzzles.items()) if g == grade and (user_id, p) not in self.completions]
+            current = self.assignments.get(user_id)
+            if not picked or (current and (current["completed_at"] or current["grade"] == grade)):
+                return
+            self.assignments[user_id] = {"grade": grade, "puzzle_id": picked[0], "completed_at": None}
+        elif query == COMPLETE_SQL:
+            user_id, puzzle_id = args
+            current = self.assignments.setdefault(
+                user_id, {"grade": self.puzzles[puzzle_id], "puzzle_id": puzzle_id, "completed_at": None}
+            )
+            current["completed_at"] = current["completed_at"] or "now"
+        else:
+            raise AssertionError(query)
+
+    async def fetchval(self, query, *args):
+        raise AssertionError("user lookups are served from the identity cache")
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def run_async(coro):
+    return asyncio.run(coro)
+
+
+def test_first_call_of_the_day_assigns_a_puzzle():
+    async def _test():
+        conn = FakeConn({1: 5, 2: 5, 3: 6})
+        assert await get_assignment(conn, 7) is None
+
+        assignment = await assign_daily_puzzle(conn, 7, 5)
+        assert assignment["grade"] == 5 and assignment["completed_at"] is None
+        assert json.loads(assignment["payload"]) == {"id": 1, "grade": 5}
+        assert await get_assignment(conn, 7) == assignment
+
+    run_async(_test())
+
+
+def test_switching_grade_replaces_an_unsolved_assignment():
+    async def _test():
+        conn = FakeConn({1: 5, 3: 6})
+        await assign_daily_puzzle(conn, 7, 5)
+
+        switched = await assign_daily_puzzle(conn, 7, 6)
+        assert switched["grade"] == 6
+        assert json.loads(switched["payload"])["id"] == 3
+
+    run_async(_test())
+
+
+def test_switching_to_a_grade_without_puzzles_assigns_nothing():
+    async def _test():
+        conn = FakeConn({1: 5})
+        await assign_daily_puzzle(conn, 7, 5)
+
+        # The grade 5 puzzle stays assigned, but it is not the grade 8 puzzle of the day
+        assert await assign_daily_puzzle(conn, 7, 8) is None
+        assert (await get_assignment(conn, 7))["grade"] == 5
+
+    run_async(_test())
+
+
+def test_completion_closes_the_day():
+    async def _test():
+        conn = FakeConn({1: 5, 3: 6})
+        await assign_daily_puzzle(conn, 7, 5)
+        await mark_completed(conn, 7, 1)
+        done = await get_assignment(conn, 7)
+        assert done["completed_at"] is not None
+
+        # A solved day is not reassigned, whatever the grade asked for
+        assert (await assign_daily_puzzle(conn, 7, 6))["completed_at"] is not None
+
+        # Completing a puzzle served without an assignment records one
+        await mark_completed(conn, 8, 3)
+        assert (await get_assignment(conn, 8))["grade"] == 6
+
+    run_async(_test())
+
+
+def test_daily_endpoint(monkeypatch):
+    async def _test():
+        conn = FakeConn({1: 5})
+        pool = FakePool(conn)
+
+        async def get_db_pool():
+            return pool
+
+        monkeypatch.setattr(puzzles_router, "get_db_pool", get_db_pool)
+        identity.clear()
+        identity.remember_user("uid-7", 7, "student")
+
+        first = await puzzles_router.get_daily_puzzle("uid-7", 5)
+        assert json.loads(first.body) == {"completed": False, "puzzle": {"id": 1, "grade": 5}}
+
+        # Same grade again: served from the assignment without assigning
+        await puzzles_router.get_daily_puzzle("uid-7", 5)
+        assert conn.assigns == 1
+
+        # No puzzles for the new grade: the other grade's puzzle is not served instead
+        assert await puzzles_router.get_daily_puzzle("uid-7", 8) == {
+            "completed": False, "puzzle": None, "message": "No puzzles available for this grade."
+        }
+
+        await mark_completed(conn, 7, 1)
+        assert (await puzzles_router.get_daily_puzzle("uid-7", 8))["completed"] is True
+
+    run_async(_test())
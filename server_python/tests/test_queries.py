@@ -0,0 +1,104 @@
+import asyncio
+import asyncpg
+import pytest
+from app.db.queries import QueryRegistry
+
+
+class FakeConn:
+    """
+    Mimics the asyncpg behaviour the registry relies on: statements run by SQL text are
+    prepared once and kept in a per-connection cache that outlives pool checkouts, while
+    an explicitly prepared statement is unusable once the connection has been released.
+    """
+
+    def __init__(self):
+        self.release_ctr = 0
+        self.statement_cache = set()
+        self.parses = 0
+        self.runs = []
+
+    def release(self):
+        self.release_ctr += 1
+
+    async def prepare(self, sql):
+        prepared_at = self.release_ctr
+
+        async def fetchval(*args):
+            if self.release_ctr != prepared_at:
+                raise asyncpg.InterfaceError("the underlying connection has been released back to the pool")
+            return args[0]
+        return fetchval
+
+    async def fetchval(self, sql, *args):
+        if sql not in self.statement_cache:
+            self.statement_cache.add(sql)
+            self.parses += 1
+        self.runs.append((sql, args))
+        return args[0]
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def checkout(self, fn):
+        try:
+            return await fn(self.conn)
+        finally:
+            self.conn.release()
+
+
+def run_async(coro):
+    return asyncio.run(coro)
+
+
+def test_register_is_idempotent_per_name():
+    registry = QueryRegistry()
+    by_id = registry.register("users.by_id", "SELECT $1::int")
+    assert registry.register("users.by_id", "SELECT $1::int") == by_id
+    with pytest.raises(ValueError):
+        registry.register("users.by_id", "SELECT 2")
+
+
+def test_statements_survive_releasing_the_connection():
+    async def _test():
+        registry = QueryRegistry()
+        by_id = registry.register("users.by_id", "SELECT $1::int")
+        conn = FakeConn()
+        pool = FakePool(conn)
+
+        assert await pool.checkout(lambda c: registry.fetchval(c, by_id, 5)) == 5
+        # Second checkout of the same connection: still served, from the connection's cache
+        assert await pool.checkout(lambda c: registry.fetchval(c, by_id, 6)) == 6
+        assert conn.release_ctr == 2
+        assert conn.parses == 1
+        assert conn.runs == [("SELECT $1::int", (5,)), ("SELECT $1::int", (6,))]
+
+        # What a statement held across checkouts would do
+        statement = await conn.prepare("SELECT $1::int")
+        conn.release()
+        with pytest.raises(asyncpg.InterfaceError):
+            await statement(7)
+
+        stats = registry.stats()["statements"]
+        assert stats[by_id]["calls"] == 2
+        assert stats[by_id]["errors"] == 0
+
+    run_async(_test())
+
+
+def test_errors_are_counted():
+    async def _test():
+        registry = QueryRegistry()
+        name = registry.register("reports.by_id", "SELECT $1::int")
+
+        class FailingConn:
+            async def fetchrow(self, sql, *args):
+                raise asyncpg.UndefinedTableError("relation does not exist")
+
+        with pytest.raises(asyncpg.UndefinedTableError):
+            await registry.fetchrow(FailingConn(), name, 1)
+        stats = registry.stats()["statements"][name]
+        assert stats["calls"] == 1 and stats["errors"] == 1
+
+    run_async(_test())
@@ -0,0 +1,30 @@
+import asyncio
+import asyncpg
+import pytest
+from app.core.config import settings
+from app.db.plan_check import run_checks
+
+
+def run_async(coro):
+    return asyncio.run(coro)
+
+
+def test_hot_queries_use_indexes():
+    # Needs the configured database with all migrations applied (python -m app.db.migrate)
+    async def _test():
+        try:
+            conn = await asyncpg.connect(
+                user=settings.DB_USER,
+                password=settings.DB_PASSWORD,
+                host=settings.DB_HOST,
+                port=settings.DB_PORT,
+                database=settings.DB_NAME
+            )
+        except OSError as exc:
+            pytest.skip(f"database unreachable: {exc}")
+        try:
+            assert await run_checks(conn) == []
+        finally:
+            await conn.close()
+
+    run_async(_test())
@@ -0,0 +1,101 @@
+import asyncio
+from app.core.identity import STUDENT_OF_USER, identity
+from app.db.queries import queries
+from app.features.reports.summary import (
+    RECORD_REPORT_SQL, REBUILD_STUDENTS_SQL, rebuild_student_summaries, record_report, resolve_report_student,
+)
+
+
+class FakeConn:
+    """Students by user_id and parents' children by (childId, parent user_id); records writes."""
+
+    def __init__(self, students=None, children=None):
+        self.students = students or {}
+        self.children = children or {}
+        self.lookups = 0
+        self.executed = []
+
+    async def fetchval(self, query, *args):
+        self.lookups += 1
+        if query == queries.statements[STUDENT_OF_USER]:
+            return self.students.get(args[0])
+        child_id, user_id = args
+        return self.children.get((child_id, user_id))
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+
+    def transaction(self):
+        return FakeTransaction()
+
+
+class FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def run_async(coro):
+    identity.clear()
+    return asyncio.run(coro)
+
+
+def test_report_of_a_student_is_their_own():
+    async def _test():
+        conn = FakeConn(students={7: 70}, children={("71", 7): 71})
+        # The saving user's own profile wins over the childId
+        assert await resolve_report_student(conn, 7, "71") == 70
+        assert await resolve_report_student(conn, 7, None) == 70
+
+    run_async(_test())
+
+
+def test_report_saved_by_a_parent_goes_to_their_child():
+    async def _test():
+        conn = FakeConn(children={("71", 8): 71})
+        assert await resolve_report_student(conn, 8, "71") == 71
+        assert await resolve_report_student(conn, 8, 71) == 71
+        # Another parent's child, no child or a non-numeric childId: nobody
+        assert await resolve_report_student(conn, 9, "71") is None
+        assert await resolve_report_student(conn, 8, None) is None
+        lookups = conn.lookups
+        assert await resolve_report_student(conn, 8, "default") is None
+        assert conn.lookups == lookups + 1  # only the own-profile lookup
+
+    run_async(_test())
+
+
+def test_record_report_folds_into_the_resolved_student():
+    async def _test():
+        conn = FakeConn(students={7: 70}, children={("71", 8): 71})
+        await record_report(conn, 1001, 7, None)
+        await record_report(conn, 1002, 8, "71")
+        assert conn.executed == [(RECORD_REPORT_SQL, (1001, 70)), (RECORD_REPORT_SQL, (1002, 71))]
+
+    run_async(_test())
+
+
+def test_record_report_skips_reports_of_nobody():
+    async def _test():
+        conn = FakeConn()
+        await record_report(conn, 1003, 9, "default")
+        await record_report(conn, 1004, 9, "71")
+        assert conn.executed == []
+
+    run_async(_test())
+
+
+def test_rebuild_student_summaries_replaces_only_their_rows():
+    async def _test():
+        conn = FakeConn()
+        await rebuild_student_summaries(conn, [])
+        assert conn.executed == []
+
+        await rebuild_student_summaries(conn, [71, 72])
+        (delete, delete_args), (rebuild, rebuild_args) = conn.executed
+        assert delete.startswith("DELETE FROM student_report_summary") and delete_args == ([71, 72],)
+        assert rebuild == REBUILD_STUDENTS_SQL and rebuild_args == ([71, 72],)
+
+    run_async(_test())
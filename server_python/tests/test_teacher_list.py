@@ -0,0 +1,96 @@
+import asyncio
+from datetime import datetime
+from fastapi import Response
+from app.features.teachers import router as teachers_router
+from app.features.teachers.router import TEACHER_COUNT_SQL, get_all_teachers
+
+
+def teacher_row(i, total):
+    return {
+        "teacher_id": i, "school": f"School {i}", "user_id": 100 + i, "firebase_uid": f"uid-{i}",
+        "name": f"Teacher {i}", "created_at": datetime(2025, 1, i), "teacher_email": None,
+        "teacher_phone": None, "student_count": i, "ticket_code": None,
+        "assigned_grades": ["Grade 5"], "total_count": total,
+    }
+
+
+class FakeConn:
+    """Serves `teachers` (the full sorted list) with LIMIT/OFFSET applied; records the statements."""
+
+    def __init__(self, teachers):
+        self.teachers = teachers
+        self.fetches = []
+        self.counts = 0
+
+    async def fetch(self, query, limit, offset):
+        self.fetches.append((query, limit, offset))
+        rows = self.teachers[offset:None if limit is None else offset + limit]
+        return [teacher_row(i, len(self.teachers)) for i in rows]
+
+    async def fetchval(self, query):
+        assert query == TEACHER_COUNT_SQL
+        self.counts += 1
+        return len(self.teachers)
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def list_teachers(monkeypatch, conn, **params):
+    async def get_db_pool():
+        return FakePool(conn)
+
+    monkeypatch.setattr(teachers_router, "get_db_pool", get_db_pool)
+    response = Response()
+    params = {"sort": "createdAt", "order": "desc", "limit": None, "offset": 0, **params}
+    body = asyncio.run(get_all_teachers(response, **params))
+    return body, response.headers["X-Total-Count"]
+
+
+def test_sort_order_and_paging_reach_the_query(monkeypatch):
+    conn = FakeConn([1, 2, 3, 4, 5])
+    body, total = list_teachers(monkeypatch, conn, sort="totalStudents", order="asc", limit=2, offset=1)
+
+    query, limit, offset = conn.fetches[0]
+    assert "ORDER BY student_count ASC NULLS LAST, t.teacher_id ASC" in query
+    assert (limit, offset) == (2, 1)
+    assert [t["uid"] for t in body] == ["uid-2", "uid-3"]
+    assert body[0]["assignedGradesCount"] == 1
+    assert total == "5"
+    assert conn.counts == 0
+
+
+def test_whole_list_without_limit(monkeypatch):
+    conn = FakeConn([1, 2, 3])
+    body, total = list_teachers(monkeypatch, conn, sort="name")
+
+    query, limit, offset = conn.fetches[0]
+    assert "ORDER BY u.name DESC NULLS LAST" in query
+    assert (limit, offset) == (None, 0)
+    assert len(body) == 3 and total == "3"
+
+
+def test_offset_past_the_end_still_reports_the_total(monkeypatch):
+    conn = FakeConn([1, 2, 3])
+    body, total = list_teachers(monkeypatch, conn, limit=10, offset=50)
+    assert body == []
+    assert total == "3"
+    assert conn.counts == 1
+
+
+def test_no_teachers(monkeypatch):
+    conn = FakeConn([])
+    body, total = list_teachers(monkeypatch, conn)
+    assert body == [] and total == "0"
+    assert conn.counts == 0